@@ -0,0 +1,14 @@
+import time
+from typing import Callable
+
+
+def best_of(repeat: int, function: Callable[[], object], number: int = 1) -> float:
+    """Fastest of `repeat` timings, each the mean seconds per call over `number` calls."""
+    timings: list[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        timings.append((time.perf_counter() - start) / number)
+
+    return min(timings)
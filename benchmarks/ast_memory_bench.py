@@ -0,0 +1,40 @@
+import gc
+import sys
+import tracemalloc
+from typing import Callable, TypeVar
+
+from slow.ast.flat import FlatAst
+from slow.ast.program import ProgramNode
+from slow.frontend.parser import Parser
+from slow.programs import generate_program
+
+
+T = TypeVar("T")
+
+def retained_bytes(build: Callable[[], T]) -> tuple[T, int]:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def main(statements: int = 20_000) -> None:
+    source = generate_program(statements)
+
+    program, object_bytes = retained_bytes(lambda: Parser().parse(source))
+    assert isinstance(program, ProgramNode)
+    ast, flat_bytes = retained_bytes(lambda: FlatAst.from_node(program))
+    nodes = len(ast)
+
+    print(f"nodes               : {nodes}")
+    print(f"object AST          : {object_bytes / nodes:8.1f} bytes/node ({object_bytes / 2 ** 20:.1f} MiB)")
+    print(f"flat AST            : {flat_bytes / nodes:8.1f} bytes/node ({flat_bytes / 2 ** 20:.1f} MiB)")
+    print(f"ratio               : {object_bytes / flat_bytes:8.1f}x")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,36 @@
+import random
+import sys
+
+from slow.ast.program import ProgramNode
+from slow.frontend.parser import Parser
+from slow.backend.batch import BatchEvaluator, numpy
+from slow.programs import generate_program
+from ._timing import best_of
+
+
+def main(rows: int = 10_000, statements: int = 200, repeat: int = 3, sample: int = 200) -> None:
+    program = Parser().parse(generate_program(statements, inputs=2))
+    assert isinstance(program, ProgramNode)
+
+    rng = random.Random(0)
+    inputs = {name: [rng.randint(-100, 100) for _ in range(rows)] for name in ("x0", "x1")}
+    evaluators = [BatchEvaluator(use_numpy=False)] + ([BatchEvaluator(use_numpy=True)] if numpy is not None else [])
+
+    # NOTE: Row at a time evaluation through the same visitor, timed over `sample` rows
+    scalar = BatchEvaluator(use_numpy=False)
+    per_row = best_of(repeat, lambda: [scalar.run(program, {name: values[row : row + 1] for name, values in inputs.items()}) for row in range(sample)]) / sample
+
+    print(f"statements          : {statements}")
+    print(f"rows                : {rows}")
+    print(f"row at a time       : {per_row * rows * 1e3:10.2f} ms (extrapolated from {sample} rows)")
+    for evaluator in evaluators:
+        results = evaluator.run(program, inputs)
+        first = scalar.run(program, {name: values[:1] for name, values in inputs.items()})
+        assert {name: int(column[0]) for name, column in results.items()} == {name: column[0] for name, column in first.items()}
+
+        batch = best_of(repeat, lambda: evaluator.run(program, inputs))
+        print(f"{evaluator.kernels.name + ' batch':<20}: {batch * 1e3:10.2f} ms ({per_row * rows / batch:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,37 @@
+import sys
+import tempfile
+import time
+
+from slow.cache import CompileCache
+from slow.programs import generate_program
+
+
+def build(cache: CompileCache, sources: list[str]) -> float:
+    start = time.perf_counter()
+    for source in sources:
+        cache.parse(source)
+        cache.ir(source)
+        cache.asm(source)
+    return time.perf_counter() - start
+
+
+def main(files: int = 50, statements: int = 200) -> None:
+    sources = [generate_program(statements, seed=seed) for seed in range(files)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        cold_cache = CompileCache(directory)
+        cold = build(cold_cache, sources)
+        # NOTE: A new instance, like the next build process
+        warm_cache = CompileCache(directory)
+        warm = build(warm_cache, sources)
+        size = warm_cache.size()
+
+    print(f"sources             : {files} x {statements} statements")
+    print(f"cache size          : {size / 1024:8.1f} KiB")
+    print(f"cold build          : {cold * 1e3:8.2f} ms ({cold_cache.stats})")
+    print(f"warm build          : {warm * 1e3:8.2f} ms ({warm_cache.stats})")
+    print(f"speedup             : {cold / warm:8.1f}x")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,38 @@
+import sys
+
+from slow.frontend.parser import Parser
+from ._timing import best_of
+
+
+def nested_expression(depth: int) -> str:
+    """`depth` nested groupings followed by a right leaning chain of `depth` operators."""
+    return "(" * depth + "1" + " + 1)" * depth + " - " + "2 - " * depth + "3"
+
+
+def recursive_parse(source: str) -> str:
+    try:
+        return str(Parser(expression_mode=True).parse(source))
+    except RecursionError:
+        return "RecursionError"
+
+
+def main(repeat: int = 3) -> None:
+    for depth in (100, 1_000, 10_000, 100_000):
+        source = nested_expression(depth)
+        parser = Parser(expression_mode=True, iterative=True)
+        node = parser.parse(source)
+
+        parse = best_of(repeat, lambda: parser.parse(source))
+        render = best_of(repeat, lambda: str(node))
+
+        outcome = "ok" if recursive_parse(source) == str(node) else "RecursionError"
+        print(f"depth {depth:>7} : iterative parse {parse * 1e3:9.2f} ms, str {render * 1e3:8.2f} ms, recursive parse: {outcome}")
+
+    source = nested_expression(100)
+    recursive = best_of(repeat * 10, lambda: Parser(expression_mode=True).parse(source))
+    iterative = best_of(repeat * 10, lambda: Parser(expression_mode=True, iterative=True).parse(source))
+    print(f"shallow (depth 100) : recursive {recursive * 1e3:.2f} ms, iterative {iterative * 1e3:.2f} ms ({recursive / iterative:.2f}x)")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
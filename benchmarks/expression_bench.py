@@ -0,0 +1,39 @@
+import random
+import sys
+
+from slow.frontend.parser import Parser
+from slow.backend.interpreter import AstInterpreter
+from slow.backend.pycode import ExpressionEvaluator
+from slow.programs import generate_expression
+from ._timing import best_of
+
+
+def interpret(source: str) -> int:
+    node = Parser(test_mode=True, expression_mode=True).parse(source)
+    assert node is not None
+    interpreter = AstInterpreter()
+    node.accept(interpreter)
+    return interpreter.value_stack.pop()
+
+
+def main(evaluations: int = 100_000, distinct: int = 500, repeat: int = 5, max_size: int = 1024) -> None:
+    rng = random.Random(0)
+    expressions = [generate_expression(rng, [], 4) for _ in range(distinct)]
+    sources = [rng.choice(expressions) for _ in range(evaluations)]
+
+    evaluator = ExpressionEvaluator(max_size)
+    assert evaluator.evaluate_many(sources[:1000]) == [interpret(source) for source in sources[:1000]]
+
+    sample = sources[:1000]
+    uncached = best_of(repeat, lambda: [interpret(source) for source in sample]) / len(sample)
+    evaluator.clear()
+    cached = best_of(repeat, lambda: evaluator.evaluate_many(sources)) / len(sources)
+
+    print(f"evaluations         : {evaluations} ({distinct} distinct expressions)")
+    print(f"parse and interpret : {uncached * 1e6:8.2f} us per expression")
+    print(f"cached evaluate     : {cached * 1e6:8.2f} us per expression ({uncached / cached:.0f}x)")
+    print(f"hits/misses/evicted : {evaluator.hits}/{evaluator.misses}/{evaluator.evictions}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,54 @@
+import sys
+import tempfile
+from pathlib import Path
+
+from slow.ast.program import ProgramNode
+from slow.frontend.parser import Parser
+from slow.backend.bytecode import Bytecode, BytecodeCompiler
+from slow.backend.image import CompiledImage, write_image
+from slow.backend.vm import VirtualMachine
+from slow.programs import generate_program
+from ._timing import best_of
+
+
+def recompile(source: str) -> Bytecode:
+    parser = Parser()
+    program = parser.parse(source)
+    assert isinstance(program, ProgramNode)
+    return BytecodeCompiler(parser.symbols).compile(program)
+
+
+def load(path: Path) -> object:
+    with CompiledImage.open(path) as image:
+        return image.slots
+
+
+def main(statements: int = 20_000, repeat: int = 5) -> None:
+    source = generate_program(statements)
+    bytecode = recompile(source)
+    vm = VirtualMachine()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "program.slwi"
+        write_image(bytecode, path)
+
+        with CompiledImage.open(path) as image:
+            assert image.run() == vm.run(bytecode)
+            execute_image = best_of(repeat, image.execute)
+
+        compile_time = best_of(repeat, lambda: recompile(source))
+        load_time = best_of(repeat, lambda: load(path))
+        size = path.stat().st_size
+
+    execute = best_of(repeat, lambda: vm.execute(bytecode))
+
+    print(f"statements          : {statements}")
+    print(f"image size          : {size / 1024:8.1f} KiB")
+    print(f"parse and compile   : {compile_time * 1e3:8.2f} ms")
+    print(f"load image          : {load_time * 1e3:8.4f} ms ({compile_time / load_time:.0f}x)")
+    print(f"vm execute          : {execute * 1e3:8.2f} ms")
+    print(f"vm execute (mapped) : {execute_image * 1e3:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
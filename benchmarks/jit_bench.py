@@ -0,0 +1,43 @@
+import sys
+
+from slow.ast.program import ProgramNode
+from slow.frontend.parser import Parser
+from slow.backend.bytecode import BytecodeCompiler
+from slow.backend.interpreter import AstInterpreter
+from slow.backend.jit import JitCompiler
+from slow.backend.vm import VirtualMachine
+from slow.programs import generate_program
+from ._timing import best_of
+
+
+def main(statements: int = 2_000, repeat: int = 5, small: int = 10) -> None:
+    for size in (small, statements):
+        parser = Parser()
+        program = parser.parse(generate_program(size))
+        assert isinstance(program, ProgramNode)
+
+        compiler = JitCompiler(parser.symbols)
+        function = compiler.compile(program)
+        results = function.buffer()
+        interpreter = AstInterpreter()
+        bytecode = BytecodeCompiler().compile(program)
+        vm = VirtualMachine()
+        # NOTE: Values overflowing int64 wrap natively, pick a program size that does not overflow
+        assert function.run() == interpreter.run(program), "jit results differ from the interpreter"
+
+        number = max(1, 20_000 // size)
+        compile_time = best_of(repeat, lambda: compiler.compile(program), number)
+        execute = best_of(repeat, lambda: function.execute(results), number * 10)
+        tree_walk = best_of(repeat, lambda: interpreter.run(program), number)
+        vm_execute = best_of(repeat, lambda: vm.execute(bytecode), number)
+
+        print(f"statements          : {size}")
+        print(f"machine code        : {function.size} bytes")
+        print(f"jit compile         : {compile_time * 1e6:10.2f} us")
+        print(f"jit execute         : {execute * 1e6:10.2f} us ({tree_walk / execute:.0f}x)")
+        print(f"tree walk           : {tree_walk * 1e6:10.2f} us")
+        print(f"vm execute          : {vm_execute * 1e6:10.2f} us ({tree_walk / vm_execute:.2f}x)")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
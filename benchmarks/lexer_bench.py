@@ -0,0 +1,49 @@
+import sys
+import time
+from typing import Callable, Iterable
+
+from slow.frontend.lexer import Lexer
+from slow.frontend.fast_lexer import FastLexer
+from slow.frontend.lexeme import Token, TokenKind
+from slow.frontend.stream import stream_tokens
+from slow.programs import generate_program
+
+
+def lex_all(lexer: Lexer | FastLexer) -> list[Token]:
+    tokens = [lexer.next()]
+    while tokens[-1].kind != TokenKind.EOF:
+        tokens.append(lexer.next())
+    return tokens
+
+
+def tokens_per_second(repeat: int, function: Callable[[], Iterable[object]]) -> float:
+    best = float("inf")
+    count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = sum(1 for _ in function())
+        best = min(best, time.perf_counter() - start)
+
+    return count / best
+
+
+def main(statements: int = 2_000, repeat: int = 15) -> None:
+    source = generate_program(statements)
+    encoded = source.encode()
+    assert lex_all(FastLexer(source)) == lex_all(Lexer(source))
+
+    baseline = tokens_per_second(repeat, lambda: lex_all(Lexer(source)))
+    results = {
+        "Lexer.next": baseline,
+        "FastLexer.next": tokens_per_second(repeat, lambda: lex_all(FastLexer(source))),
+        "FastLexer.tokenize": tokens_per_second(repeat, lambda: FastLexer(source).tokenize()),
+        "stream_tokens": tokens_per_second(repeat, lambda: stream_tokens(encoded)),
+    }
+
+    print(f"source              : {len(source)} characters")
+    for name, rate in results.items():
+        print(f"{name:<20}: {rate / 1e3:8.0f}k tokens/s ({rate / baseline:.2f}x)")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
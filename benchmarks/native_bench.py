@@ -0,0 +1,57 @@
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from slow.ast.program import ProgramNode
+from slow.frontend.parser import Parser
+from slow.backend.bytecode import BytecodeCompiler
+from slow.backend.interpreter import AstInterpreter
+from slow.backend.native import NativeBuilder, NativeProgram
+from slow.backend.vm import VirtualMachine
+from slow.programs import generate_program
+from ._timing import best_of
+
+
+def process_time(repeat: int, native: NativeProgram) -> float:
+    return best_of(repeat, lambda: subprocess.run([str(native.path)], stdout=subprocess.DEVNULL, check=True))
+
+
+def main(statements: int = 2_000, repeat: int = 5, calls: int = 1_000) -> None:
+    parser = Parser()
+    program = parser.parse(generate_program(statements))
+    assert isinstance(program, ProgramNode)
+
+    bytecode = BytecodeCompiler().compile(program)
+    interpreter = AstInterpreter()
+    vm = VirtualMachine()
+
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        once = NativeBuilder(parser.symbols).build(program, Path(directory) / "once")
+        build_time = time.perf_counter() - start
+        many = NativeBuilder(parser.symbols, repeat=calls).build(program, Path(directory) / "many")
+
+        # NOTE: Values overflowing int64 wrap natively, pick a program size that does not overflow
+        expected = interpreter.run(program)
+        assert once.run() == expected and many.run() == expected, "native results differ from the interpreter"
+
+        once_time = process_time(repeat, once)
+        many_time = process_time(repeat, many)
+
+    # NOTE: The process start up is common to both executables and cancels out
+    native = max(many_time - once_time, 0.0) / (calls - 1)
+    tree_walk = best_of(repeat, lambda: interpreter.run(program))
+    execute = best_of(repeat, lambda: vm.execute(bytecode))
+
+    print(f"statements          : {statements}")
+    print(f"native build        : {build_time * 1e3:8.2f} ms")
+    print(f"native process      : {once_time * 1e3:8.2f} ms")
+    print(f"tree walk           : {tree_walk * 1e3:8.2f} ms")
+    print(f"vm execute          : {execute * 1e3:8.2f} ms ({tree_walk / execute:.2f}x)")
+    print(f"native execute      : {native * 1e3:8.4f} ms ({tree_walk / native if native else float('inf'):.0f}x)")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
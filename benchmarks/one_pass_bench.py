@@ -0,0 +1,40 @@
+import sys
+
+from slow.frontend.fast_lexer import FastLexer
+from slow.frontend.parser import Parser
+from slow.frontend.one_pass import OnePassCompiler
+from slow.backend.ir_visitor import IRVisitor
+from slow.ir.program import IRProgram
+from slow.programs import generate_program
+from ._timing import best_of
+
+
+def two_phase(source: str) -> IRProgram:
+    parser = Parser()
+    program = parser.parse_tokens(FastLexer(source, symbols=parser.symbols))
+    assert program is not None
+    return IRVisitor(parser.symbols).build(program)
+
+
+def one_pass(source: str) -> IRProgram:
+    compiler = OnePassCompiler()
+    program = compiler.compile_tokens(FastLexer(source, symbols=compiler.symbols))
+    assert program is not None
+    return program
+
+
+def main(statements: int = 20_000, repeat: int = 5) -> None:
+    source = generate_program(statements)
+    assert one_pass(source) == two_phase(source)
+
+    lines = source.count("\n") + 1
+    # NOTE: Both read FastLexer tokens, so that lexing does not drown out the difference
+    print(f"statements : {statements} ({len(source) / 1024:.0f} KiB)")
+    timings = {name: best_of(repeat, lambda: function(source)) for name, function in (("two phase", two_phase), ("one pass", one_pass))}
+    baseline = timings["two phase"]
+    for name, elapsed in timings.items():
+        print(f"{name:<11}: {elapsed * 1e3:8.1f} ms, {lines / elapsed:10.0f} statements/s ({baseline / elapsed:.2f}x)")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,29 @@
+import sys
+
+from slow.ast.program import ProgramNode
+from slow.frontend.parser import Parser
+from slow.backend.ir_visitor import IRVisitor
+from slow.ir.optimizer import CopyPropagation, DeadCodeElimination, ValueNumbering
+from slow.passes.constant_folding import ConstantFolder
+from slow.passes.manager import PassManager
+from slow.programs import generate_program
+
+
+def main(statements: int = 20_000, trace_memory: int = 1) -> None:
+    parser = Parser()
+    program = parser.parse(generate_program(statements))
+    assert isinstance(program, ProgramNode)
+
+    manager = PassManager(trace_memory=bool(trace_memory))
+    manager.add(ConstantFolder(parser.symbols))
+    manager.add(IRVisitor(parser.symbols))
+    manager.add(CopyPropagation())
+    manager.add(ValueNumbering())
+    manager.add(DeadCodeElimination())
+    manager.run(program)
+
+    print(manager.report())
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
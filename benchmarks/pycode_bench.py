@@ -0,0 +1,44 @@
+import sys
+
+from slow.ast.program import ProgramNode
+from slow.frontend.parser import Parser
+from slow.backend.bytecode import BytecodeCompiler
+from slow.backend.interpreter import AstInterpreter
+from slow.backend.pycode import CodeCache, PythonCompiler
+from slow.backend.vm import VirtualMachine
+from slow.programs import generate_program
+from ._timing import best_of
+
+
+def main(statements: int = 20_000, repeat: int = 5) -> None:
+    source = generate_program(statements)
+    parser = Parser()
+    program = parser.parse(source)
+    assert isinstance(program, ProgramNode)
+
+    interpreter = AstInterpreter()
+    bytecode = BytecodeCompiler().compile(program)
+    vm = VirtualMachine()
+    compiled = PythonCompiler(parser.symbols).compile(program)
+    assert compiled.run() == interpreter.run(program)
+
+    cache = CodeCache()
+    cold = best_of(1, lambda: cache.get(source))
+    warm = best_of(repeat, lambda: cache.get(source))
+
+    tree_walk = best_of(repeat, lambda: interpreter.run(program))
+    execute = best_of(repeat, lambda: vm.execute(bytecode))
+    compile_time = best_of(repeat, lambda: PythonCompiler(parser.symbols).compile(program))
+    call = best_of(repeat, compiled.run)
+
+    print(f"statements          : {statements}")
+    print(f"tree walk           : {tree_walk * 1e3:8.2f} ms")
+    print(f"vm execute          : {execute * 1e3:8.2f} ms ({tree_walk / execute:.2f}x)")
+    print(f"python compile      : {compile_time * 1e3:8.2f} ms")
+    print(f"python execute      : {call * 1e3:8.2f} ms ({tree_walk / call:.2f}x)")
+    print(f"cache miss          : {cold * 1e3:8.2f} ms (parse and compile)")
+    print(f"cache hit           : {warm * 1e6:8.2f} us")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,63 @@
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+from slow.frontend.lexer import Lexer
+from slow.frontend.parser import Parser
+from slow.frontend.stream import StreamSource, stream_file
+from slow.backend.ir_visitor import IRVisitor
+from slow.backend.sink import FileSink
+from slow.programs import generate_program
+
+
+def whole(path: Path) -> None:
+    parser = Parser()
+    program = parser.parse(path.read_text())
+    assert program is not None
+    with FileSink(os.devnull) as sink:
+        IRVisitor(parser.symbols, sink).walk(program)
+
+
+def streamed(path: Path) -> None:
+    parser = Parser()
+    with FileSink(os.devnull) as sink:
+        IRVisitor(parser.symbols, sink).stream(parser.parse_statements(Lexer(path.read_text(), symbols=parser.symbols)))
+
+
+def streamed_mapped(path: Path) -> None:
+    parser = Parser()
+    with FileSink(os.devnull) as sink:
+        IRVisitor(parser.symbols, sink).stream(parser.parse_statements(StreamSource(stream_file(path), parser.symbols)))
+
+
+def measure(function: Callable[[Path], None], path: Path) -> tuple[float, int]:
+    # NOTE: Timed apart from the memory measurement, tracemalloc slows allocations down several times
+    start = time.perf_counter()
+    function(path)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    function(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main(statements: int = 20_000) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        for size in (statements, 4 * statements):
+            path = Path(directory) / f"program{size}.slow"
+            path.write_text(generate_program(size))
+
+            print(f"statements {size} ({path.stat().st_size / 1024:.0f} KiB)")
+            for name, function in (("whole program", whole), ("streamed", streamed), ("streamed, mmap", streamed_mapped)):
+                elapsed, peak = measure(function, path)
+                print(f"  {name:<14}: {elapsed * 1e3:8.1f} ms, peak {peak / 1024:8.1f} KiB")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,33 @@
+import sys
+
+from slow.ast.program import ProgramNode
+from slow.frontend.parser import Parser
+from slow.backend.bytecode import BytecodeCompiler
+from slow.backend.interpreter import AstInterpreter
+from slow.backend.vm import VirtualMachine
+from slow.programs import generate_program
+from ._timing import best_of
+
+
+def main(statements: int = 20_000, repeat: int = 5) -> None:
+    program = Parser().parse(generate_program(statements))
+    assert isinstance(program, ProgramNode)
+
+    bytecode = BytecodeCompiler().compile(program)
+    interpreter = AstInterpreter()
+    vm = VirtualMachine()
+    assert interpreter.run(program) == vm.run(bytecode)
+
+    tree_walk = best_of(repeat, lambda: interpreter.run(program))
+    compile_time = best_of(repeat, lambda: BytecodeCompiler().compile(program))
+    execute = best_of(repeat, lambda: vm.execute(bytecode))
+
+    print(f"statements          : {statements}")
+    print(f"bytecode words      : {len(bytecode.code)}")
+    print(f"tree walk           : {tree_walk * 1e3:8.2f} ms")
+    print(f"bytecode compile    : {compile_time * 1e3:8.2f} ms")
+    print(f"vm execute          : {execute * 1e3:8.2f} ms ({tree_walk / execute:.2f}x)")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -1 +1,3 @@
-# TODO: Add IDs - Declarations - Assignments - Declarations/Assignments - If branch
\ No newline at end of file
+# TODO: Add IDs - Declarations - Assignments - Declarations/Assignments - If branch
+
+__version__ = "0.1.0"
@@ -3,3 +3,9 @@ class LexerError(Exception):
 
 class ParserError(Exception):
     """Raised when a parser encounters an error."""
+
+class NativeBuildError(Exception):
+    """Raised when assembling or linking a native program fails."""
+
+class ImageError(Exception):
+    """Raised when a compiled image is malformed or has an unsupported version."""
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 
-from ..node import StatementNode, ExpressionNode, NodeVisitor
+from ..node import Node, StatementNode, ExpressionNode, NodeVisitor
 from .identifier import IdentifierNode
 
 
@@ -8,6 +8,10 @@ from .identifier import IdentifierNode
 class AssignNode(StatementNode):
     identifier: IdentifierNode
     expression: ExpressionNode
+    visit_name = "assign"
+
+    def children(self) -> tuple[Node, ...]:
+        return (self.expression,)
 
     def accept(self, visitor: NodeVisitor) -> None:
         visitor.visit_assign(self)
@@ -1,9 +1,16 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum, auto
+from typing import Optional
 
 from slow.node import Node, ExpressionNode, NodeVisitor
 
 
+def truncating_div(lhs: int, rhs: int) -> int:
+    # NOTE: Division truncates towards zero (like x86 idiv), not towards -inf like //
+    quotient = abs(lhs) // abs(rhs)
+    return quotient if (lhs < 0) == (rhs < 0) else -quotient
+
+
 class BinaryOperator(Enum):
     ADD = auto()
     SUB = auto()
@@ -23,6 +30,19 @@ class BinaryOperator(Enum):
             case _:
                 raise ValueError(f"Binary operator {self} is not supported")
 
+    def apply(self, lhs: int, rhs: int) -> int:
+        match self:
+            case BinaryOperator.ADD:
+                return lhs + rhs
+            case BinaryOperator.SUB:
+                return lhs - rhs
+            case BinaryOperator.MUL:
+                return lhs * rhs
+            case BinaryOperator.DIV:
+                return truncating_div(lhs, rhs)
+            case _:
+                raise ValueError(f"Binary operator {self} is not supported")
+
     def __str__(self) -> str:
         match self:
             case BinaryOperator.ADD:
@@ -42,12 +62,63 @@ class BinaryNode(ExpressionNode):
     lhs: Node
     rhs: Node
     op: BinaryOperator
+    # NOTE: Nodes are never mutated once built, the structural hash is computed once
+    _hash: Optional[int] = field(default=None, init=False, repr=False, compare=False)
+    visit_name = "binary"
+
+    def children(self) -> tuple[Node, ...]:
+        return (self.lhs, self.rhs)
 
     def accept(self, visitor: NodeVisitor) -> None:
         visitor.visit_binary(self)
 
+    # NOTE: The methods below walk the tree with explicit stacks, parse trees can be deeper than the recursion limit
+
     def __str__(self) -> str:
-        return f"({self.lhs} {self.op} {self.rhs})"
+        parts: list[str] = []
+        pending: list[Node | str] = [self]
+        while pending:
+            current = pending.pop()
+            if isinstance(current, str):
+                parts.append(current)
+            elif isinstance(current, BinaryNode):
+                pending.extend((")", current.rhs, f" {current.op} ", current.lhs))
+                parts.append("(")
+            else:
+                parts.append(str(current))
+        return "".join(parts)
 
     def __hash__(self) -> int:
-        return hash((self.lhs, self.rhs, self.op))
+        if self._hash is None:
+            # NOTE: Hash the uncached subtrees bottom up, so each hash((lhs, rhs, op)) only sees cached children
+            order: list[BinaryNode] = []
+            pending: list[BinaryNode] = [self]
+            while pending:
+                current = pending.pop()
+                order.append(current)
+                for child in (current.lhs, current.rhs):
+                    if isinstance(child, BinaryNode) and child._hash is None:
+                        pending.append(child)
+
+            for current in reversed(order):
+                if current._hash is None:
+                    current._hash = hash((current.lhs, current.rhs, current.op))
+        assert self._hash is not None
+        return self._hash
+
+    def __eq__(self, other: object) -> bool:
+        pending: list[tuple[object, object]] = [(self, other)]
+        while pending:
+            lhs, rhs = pending.pop()
+            if lhs is rhs:
+                continue
+            if not isinstance(lhs, BinaryNode):
+                if lhs != rhs:
+                    return False
+                continue
+            # NOTE: Cached hashes tell most unequal trees apart without walking them
+            if not isinstance(rhs, BinaryNode) or hash(lhs) != hash(rhs) or lhs.op != rhs.op:
+                return False
+            pending.append((lhs.rhs, rhs.rhs))
+            pending.append((lhs.lhs, rhs.lhs))
+        return True
@@ -0,0 +1,65 @@
+from slow.node import Node
+from slow.symbols import NO_SYMBOL
+from .binary import BinaryNode, BinaryOperator
+from .identifier import IdentifierNode
+from .literal import LiteralIntegerNode
+
+
+class NodeFactory:
+    def literal_integer(self, value: int, line: int) -> LiteralIntegerNode:
+        return LiteralIntegerNode(value, line)
+
+    def identifier(self, name: str, symbol: int = NO_SYMBOL) -> IdentifierNode:
+        return IdentifierNode(name, symbol)
+
+    def binary(self, lhs: Node, rhs: Node, op: BinaryOperator) -> BinaryNode:
+        return BinaryNode(lhs, rhs, op)
+
+
+class HashConsingNodeFactory(NodeFactory):
+    """Interns structurally identical expressions, so equal subtrees are the same object (a DAG).
+
+    Children are interned before their parents, which lets binary nodes be looked up by the
+    identity of their operands in O(1) instead of hashing whole subtrees. Literals are interned
+    by value and line, so every node keeps the line it was parsed on and sharing stops at line
+    boundaries.
+    """
+    def __init__(self) -> None:
+        self.literals: dict[tuple[int, int], LiteralIntegerNode] = {}
+        self.identifiers: dict[int | str, IdentifierNode] = {}
+        self.binaries: dict[tuple[int, int, BinaryOperator], BinaryNode] = {}
+        self.shared_count = 0
+
+    def __len__(self) -> int:
+        return len(self.literals) + len(self.identifiers) + len(self.binaries)
+
+    def literal_integer(self, value: int, line: int) -> LiteralIntegerNode:
+        key = (value, line)
+        node = self.literals.get(key)
+        if node is None:
+            node = self.literals[key] = LiteralIntegerNode(value, line)
+        else:
+            self.shared_count += 1
+        return node
+
+    def identifier(self, name: str, symbol: int = NO_SYMBOL) -> IdentifierNode:
+        # NOTE: Keyed by symbol when there is one, which avoids hashing the name
+        key = name if symbol == NO_SYMBOL else symbol
+        node = self.identifiers.get(key)
+        if node is None:
+            node = self.identifiers[key] = IdentifierNode(name, symbol)
+        else:
+            self.shared_count += 1
+        return node
+
+    def binary(self, lhs: Node, rhs: Node, op: BinaryOperator) -> BinaryNode:
+        # NOTE: The interned node keeps its operands alive, so their ids cannot be reused
+        key = (id(lhs), id(rhs), op)
+        node = self.binaries.get(key)
+        if node is None:
+            node = self.binaries[key] = BinaryNode(lhs, rhs, op)
+            # NOTE: Children hashes are already cached, computing this one is O(1)
+            hash(node)
+        else:
+            self.shared_count += 1
+        return node
@@ -0,0 +1,381 @@
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass, field
+from enum import IntEnum
+
+from slow.node import Node, ExpressionNode, StatementNode, NodeVisitor
+from slow.symbols import NO_SYMBOL
+from .assign import AssignNode
+from .binary import BinaryNode, BinaryOperator
+from .identifier import IdentifierNode
+from .let import LetAssignmentNode, LetDeclarationNode
+from .literal import LiteralIntegerNode
+from .program import ProgramNode
+
+
+class FlatNodeKind(IntEnum):
+    LITERAL_INTEGER = 0
+    IDENTIFIER      = 1
+    BINARY          = 2
+    LET_DECLARATION = 3
+    LET_ASSIGNMENT  = 4
+    ASSIGN          = 5
+
+
+_NO_CHILD = -1
+_INT64_MIN = -(2 ** 63)
+_INT64_MAX = 2 ** 63 - 1
+
+
+@dataclass(slots=True)
+class FlatAst:
+    """Array backed AST: one row per node, children referenced by row index.
+
+    Column meaning depends on the node kind:
+        - literal:    `values` holds the value, `lines` the line
+        - identifier: `values` holds the index of the name in `names`, `lhs` the symbol id
+        - binary:     `ops` holds the operator, `lhs`/`rhs` the operands
+        - statements: `lhs` holds the identifier, `rhs` the expression (if any)
+    """
+    kinds: array[int] = field(default_factory=lambda: array("B"))
+    ops: array[int] = field(default_factory=lambda: array("B"))
+    lhs: array[int] = field(default_factory=lambda: array("i"))
+    rhs: array[int] = field(default_factory=lambda: array("i"))
+    values: array[int] = field(default_factory=lambda: array("q"))
+    lines: array[int] = field(default_factory=lambda: array("I"))
+    names: list[str] = field(default_factory=list)
+    statements: array[int] = field(default_factory=lambda: array("i"))
+    root: int = _NO_CHILD # NOTE: Only set for expressions, programs are the `statements` rows
+    _name_index: dict[str, int] = field(init=False, default_factory=dict, repr=False)
+    # NOTE: Literals that do not fit a 64 bit column, keyed by row
+    _big_values: dict[int, int] = field(init=False, default_factory=dict, repr=False)
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def _add(self, kind: FlatNodeKind, op: int = 0, lhs: int = _NO_CHILD, rhs: int = _NO_CHILD, value: int = 0, line: int = 0) -> int:
+        self.kinds.append(kind)
+        self.ops.append(op)
+        self.lhs.append(lhs)
+        self.rhs.append(rhs)
+        self.values.append(value)
+        self.lines.append(line)
+        return len(self.kinds) - 1
+
+    def literal_integer(self, value: int, line: int) -> int:
+        if _INT64_MIN <= value <= _INT64_MAX:
+            return self._add(FlatNodeKind.LITERAL_INTEGER, value=value, line=line)
+
+        index = self._add(FlatNodeKind.LITERAL_INTEGER, line=line)
+        self._big_values[index] = value
+        return index
+
+    def identifier(self, name: str, symbol: int = NO_SYMBOL) -> int:
+        name_index = self._name_index.get(name)
+        if name_index is None:
+            name_index = self._name_index[name] = len(self.names)
+            self.names.append(name)
+
+        return self._add(FlatNodeKind.IDENTIFIER, lhs=symbol, value=name_index)
+
+    def binary(self, lhs: int, rhs: int, op: BinaryOperator) -> int:
+        return self._add(FlatNodeKind.BINARY, op=op.value, lhs=lhs, rhs=rhs)
+
+    def let_declaration(self, identifier: int) -> int:
+        return self._add(FlatNodeKind.LET_DECLARATION, lhs=identifier)
+
+    def let_assignment(self, identifier: int, expression: int) -> int:
+        return self._add(FlatNodeKind.LET_ASSIGNMENT, lhs=identifier, rhs=expression)
+
+    def assign(self, identifier: int, expression: int) -> int:
+        return self._add(FlatNodeKind.ASSIGN, lhs=identifier, rhs=expression)
+
+    def value(self, index: int) -> int:
+        return self._big_values.get(index, self.values[index])
+
+    @staticmethod
+    def from_node(node: Node) -> FlatAst:
+        ast = FlatAst()
+        if isinstance(node, ProgramNode):
+            for statement in node.statements:
+                ast.statements.append(ast._convert(statement))
+        else:
+            ast.root = ast._convert(node)
+
+        return ast
+
+    def _convert(self, node: Node) -> int:
+        # NOTE: Explicit post order walk, deep trees must not hit the recursion limit.
+        # Rows are memoised by object identity so shared subtrees are stored once.
+        rows: dict[int, int] = {}
+        pending: list[tuple[Node, bool]] = [(node, False)]
+        while pending:
+            current, expanded = pending.pop()
+            if id(current) in rows:
+                continue
+
+            children = _children(current)
+            if children and not expanded:
+                pending.append((current, True))
+                pending.extend((child, False) for child in reversed(children))
+                continue
+
+            rows[id(current)] = self._add_node(current, [rows[id(child)] for child in children])
+
+        return rows[id(node)]
+
+    def _add_node(self, node: Node, children: list[int]) -> int:
+        match node:
+            case LiteralIntegerNode():
+                return self.literal_integer(node.value, node.line)
+            case IdentifierNode():
+                return self.identifier(node.name, node.symbol)
+            case BinaryNode():
+                return self.binary(children[0], children[1], node.op)
+            case LetDeclarationNode():
+                return self.let_declaration(children[0])
+            case LetAssignmentNode():
+                return self.let_assignment(children[0], children[1])
+            case AssignNode():
+                return self.assign(children[0], children[1])
+            case _:
+                raise ValueError(f"Node {node!r} cannot be flattened")
+
+    def to_node(self) -> Node:
+        """Rebuilds the object tree (shared rows become shared nodes)."""
+        # NOTE: Rows are appended in post order, children always come before their parents
+        nodes: list[Node] = []
+        for index, kind in enumerate(self.kinds):
+            lhs, rhs = self.lhs[index], self.rhs[index]
+            match kind:
+                case FlatNodeKind.LITERAL_INTEGER:
+                    nodes.append(LiteralIntegerNode(self.value(index), self.lines[index]))
+                case FlatNodeKind.IDENTIFIER:
+                    nodes.append(IdentifierNode(self.names[self.values[index]], lhs))
+                case FlatNodeKind.BINARY:
+                    nodes.append(BinaryNode(nodes[lhs], nodes[rhs], BinaryOperator(self.ops[index])))
+                case FlatNodeKind.LET_DECLARATION:
+                    nodes.append(LetDeclarationNode(_identifier(nodes[lhs])))
+                case FlatNodeKind.LET_ASSIGNMENT:
+                    nodes.append(LetAssignmentNode(_identifier(nodes[lhs]), _expression(nodes[rhs])))
+                case FlatNodeKind.ASSIGN:
+                    nodes.append(AssignNode(_identifier(nodes[lhs]), _expression(nodes[rhs])))
+                case _:
+                    raise ValueError(f"Unknown node kind {kind}")
+
+        if self.root != _NO_CHILD:
+            return nodes[self.root]
+        statements: list[StatementNode] = []
+        for index in self.statements:
+            statement = nodes[index]
+            assert isinstance(statement, StatementNode)
+            statements.append(statement)
+        return ProgramNode(statements)
+
+    def view(self, index: int) -> Node:
+        return _VIEW_CLASSES[self.kinds[index]](self, index)
+
+    def statement_view(self, index: int) -> FlatStatementView:
+        view = self.view(index)
+        assert isinstance(view, FlatStatementView)
+        return view
+
+    def program(self) -> FlatProgramView:
+        return FlatProgramView(self)
+
+    def root_view(self) -> Node:
+        return self.program() if self.root == _NO_CHILD else self.view(self.root)
+
+
+def _children(node: Node) -> tuple[Node, ...]:
+    match node:
+        case BinaryNode():
+            return (node.lhs, node.rhs)
+        case LetDeclarationNode():
+            return (node.identifier,)
+        case LetAssignmentNode() | AssignNode():
+            return (node.identifier, node.expression)
+        case _:
+            return ()
+
+
+def _identifier(node: Node) -> IdentifierNode:
+    assert isinstance(node, IdentifierNode)
+    return node
+
+
+def _expression(node: Node) -> ExpressionNode:
+    assert isinstance(node, ExpressionNode)
+    return node
+
+
+class FlatExpressionView(ExpressionNode):
+    __slots__ = ("ast", "index")
+
+    def __init__(self, ast: FlatAst, index: int) -> None:
+        self.ast = ast
+        self.index = index
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, FlatExpressionView) and other.ast is self.ast and other.index == self.index
+
+    def __hash__(self) -> int:
+        return hash((id(self.ast), self.index))
+
+
+class FlatLiteralIntegerView(FlatExpressionView):
+    __slots__ = ()
+    visit_name = "literal_integer"
+
+    @property
+    def value(self) -> int:
+        return self.ast.value(self.index)
+
+    @property
+    def line(self) -> int:
+        return self.ast.lines[self.index]
+
+    def accept(self, visitor: NodeVisitor) -> None:
+        visitor.visit_literal_integer(self) # type: ignore[arg-type]
+
+    def __str__(self) -> str:
+        return f"{self.value}"
+
+
+class FlatIdentifierView(FlatExpressionView):
+    __slots__ = ()
+    visit_name = "identifier"
+
+    @property
+    def name(self) -> str:
+        return self.ast.names[self.ast.values[self.index]]
+
+    @property
+    def symbol(self) -> int:
+        return self.ast.lhs[self.index]
+
+    def accept(self, visitor: NodeVisitor) -> None:
+        visitor.visit_identifier(self) # type: ignore[arg-type]
+
+    def __str__(self) -> str:
+        return self.name
+
+    # NOTE: Identifiers compare by name, like IdentifierNode
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, (FlatIdentifierView, IdentifierNode)) and other.name == self.name
+
+    def __hash__(self) -> int:
+        return hash(self.name)
+
+
+class FlatBinaryView(FlatExpressionView):
+    __slots__ = ()
+    visit_name = "binary"
+
+    def children(self) -> tuple[Node, ...]:
+        return (self.lhs, self.rhs)
+
+    @property
+    def lhs(self) -> Node:
+        return self.ast.view(self.ast.lhs[self.index])
+
+    @property
+    def rhs(self) -> Node:
+        return self.ast.view(self.ast.rhs[self.index])
+
+    @property
+    def op(self) -> BinaryOperator:
+        return BinaryOperator(self.ast.ops[self.index])
+
+    def accept(self, visitor: NodeVisitor) -> None:
+        visitor.visit_binary(self) # type: ignore[arg-type]
+
+    def __str__(self) -> str:
+        return f"({self.lhs} {self.op} {self.rhs})"
+
+
+class FlatStatementView(StatementNode):
+    __slots__ = ("ast", "index")
+
+    def __init__(self, ast: FlatAst, index: int) -> None:
+        self.ast = ast
+        self.index = index
+
+    @property
+    def identifier(self) -> FlatIdentifierView:
+        return FlatIdentifierView(self.ast, self.ast.lhs[self.index])
+
+    @property
+    def expression(self) -> ExpressionNode:
+        assert self.ast.rhs[self.index] != _NO_CHILD # NOTE: Declarations have no expression
+        view = self.ast.view(self.ast.rhs[self.index])
+        assert isinstance(view, ExpressionNode)
+        return view
+
+    def children(self) -> tuple[Node, ...]:
+        return () if self.ast.rhs[self.index] == _NO_CHILD else (self.expression,)
+
+
+class FlatLetDeclarationView(FlatStatementView):
+    __slots__ = ()
+    visit_name = "let_declaration"
+
+    def accept(self, visitor: NodeVisitor) -> None:
+        visitor.visit_let_declaration(self) # type: ignore[arg-type]
+
+    def __str__(self) -> str:
+        return f"let {self.identifier};"
+
+
+class FlatLetAssignmentView(FlatStatementView):
+    __slots__ = ()
+    visit_name = "let_assignment"
+
+    def accept(self, visitor: NodeVisitor) -> None:
+        visitor.visit_let_assignment(self) # type: ignore[arg-type]
+
+    def __str__(self) -> str:
+        return f"let {self.identifier} = {self.expression};"
+
+
+class FlatAssignView(FlatStatementView):
+    __slots__ = ()
+    visit_name = "assign"
+
+    def accept(self, visitor: NodeVisitor) -> None:
+        visitor.visit_assign(self) # type: ignore[arg-type]
+
+    def __str__(self) -> str:
+        return f"{self.identifier} = {self.expression};"
+
+
+class FlatProgramView(Node):
+    __slots__ = ("ast",)
+    visit_name = "program"
+
+    def __init__(self, ast: FlatAst) -> None:
+        self.ast = ast
+
+    @property
+    def statements(self) -> list[StatementNode]:
+        return [self.ast.statement_view(index) for index in self.ast.statements]
+
+    def children(self) -> tuple[Node, ...]:
+        return tuple(self.statements)
+
+    def accept(self, visitor: NodeVisitor) -> None:
+        visitor.visit_program(self) # type: ignore[arg-type]
+
+    def __str__(self) -> str:
+        return "\n".join(str(statement) for statement in self.statements)
+
+
+_VIEW_CLASSES: dict[int, type[FlatExpressionView] | type[FlatStatementView]] = {
+    FlatNodeKind.LITERAL_INTEGER: FlatLiteralIntegerView,
+    FlatNodeKind.IDENTIFIER: FlatIdentifierView,
+    FlatNodeKind.BINARY: FlatBinaryView,
+    FlatNodeKind.LET_DECLARATION: FlatLetDeclarationView,
+    FlatNodeKind.LET_ASSIGNMENT: FlatLetAssignmentView,
+    FlatNodeKind.ASSIGN: FlatAssignView,
+}
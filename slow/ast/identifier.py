@@ -1,12 +1,16 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from ..node import ExpressionNode, NodeVisitor
+from ..symbols import NO_SYMBOL
 
 
 @dataclass
 class IdentifierNode(ExpressionNode):
     name: str
+    # NOTE: Dense id assigned by the lexer (see SymbolTable), backends index per-symbol state with it
+    symbol: int = field(default=NO_SYMBOL, compare=False)
     # NOTE: Only supports integer types
+    visit_name = "identifier"
 
     def accept(self, visitor: NodeVisitor) -> None:
         visitor.visit_identifier(self)
@@ -1,12 +1,13 @@
 from dataclasses import dataclass
 
-from ..node import StatementNode, ExpressionNode, NodeVisitor
+from ..node import Node, StatementNode, ExpressionNode, NodeVisitor
 from .identifier import IdentifierNode
 
 
 @dataclass
 class LetDeclarationNode(StatementNode):
     identifier: IdentifierNode
+    visit_name = "let_declaration"
 
     def accept(self, visitor: NodeVisitor) -> None:
         visitor.visit_let_declaration(self)
@@ -19,6 +20,10 @@ class LetDeclarationNode(StatementNode):
 class LetAssignmentNode(StatementNode):
     identifier: IdentifierNode
     expression: ExpressionNode
+    visit_name = "let_assignment"
+
+    def children(self) -> tuple[Node, ...]:
+        return (self.expression,)
 
     def accept(self, visitor: NodeVisitor) -> None:
         visitor.visit_let_assignment(self)
@@ -7,9 +7,13 @@ from ..node import ExpressionNode, NodeVisitor
 class LiteralIntegerNode(ExpressionNode):
     value: int
     line: int
+    visit_name = "literal_integer"
 
     def accept(self, visitor: NodeVisitor) -> None:
         visitor.visit_literal_integer(self)
 
     def __str__(self) -> str:
         return f"{self.value}"
+
+    def __hash__(self) -> int:
+        return hash(self.value)
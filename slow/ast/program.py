@@ -6,6 +6,10 @@ from ..node import Node, StatementNode, NodeVisitor
 @dataclass
 class ProgramNode(Node):
     statements: list[StatementNode]
+    visit_name = "program"
+
+    def children(self) -> tuple[Node, ...]:
+        return tuple(self.statements)
 
     def accept(self, visitor: NodeVisitor) -> None:
         visitor.visit_program(self)
@@ -1,2 +1,15 @@
 from .ast_asm_visitor import AstAsmVisitor
 from .ir_visitor import IRVisitor
+from .interpreter import AstInterpreter
+from .bytecode import Bytecode, BytecodeCompiler, Opcode
+from .vm import VirtualMachine
+from .sink import Sink, StdoutSink, BufferSink, FileSink, CallbackSink
+from .register_allocation import LinearScanAllocator, LiveInterval
+from .x86_64 import X86Codegen
+from .asm import AsmLine, Instruction
+from .peephole import PeepholeOptimizer
+from .native import NativeBuilder, NativeProgram
+from .jit import JitCompiler, JitFunction, jit_compile
+from .pycode import CodeCache, CompiledExpression, CompiledProgram, ExpressionEvaluator, PythonCompiler
+from .batch import BatchEvaluator
+from .image import CompiledImage, SectionKind, image_bytes, write_image
@@ -0,0 +1,114 @@
+import re
+from dataclasses import dataclass
+from typing import Optional, Union
+
+
+# NOTE: Operands are either a register, a memory reference (`QWORD PTR [rbp-8]`) or an immediate
+Operand = Union[str, int]
+
+_MEMORY_REGISTER = re.compile(r"\b(r[a-z0-9]+)\b")
+
+# NOTE: `d = d op s`. mul/div are the stack machine's (AstAsmVisitor) spelling of imul/idiv
+ARITHMETIC_MNEMONICS = frozenset(("add", "sub", "imul", "mul", "div", "and", "or", "xor"))
+# NOTE: SysV: what a caller may still read once `ret` executed
+LIVE_AT_RETURN = frozenset(("rax", "rbx", "rbp", "rsp", "r12", "r13", "r14", "r15"))
+ALL_REGISTERS = frozenset((
+    "rax", "rbx", "rcx", "rdx", "rsi", "rdi", "rbp", "rsp",
+    "r8", "r9", "r10", "r11", "r12", "r13", "r14", "r15",
+))
+
+
+def is_memory(operand: Operand) -> bool:
+    return isinstance(operand, str) and "[" in operand
+
+
+def is_register(operand: Operand) -> bool:
+    return isinstance(operand, str) and "[" not in operand
+
+
+def registers_in(operand: Operand) -> frozenset[str]:
+    """Registers an operand reads: the register itself, or the ones addressing memory."""
+    if isinstance(operand, int):
+        return frozenset()
+    if is_memory(operand):
+        return frozenset(_MEMORY_REGISTER.findall(operand[operand.index("["):]))
+    return frozenset((operand,))
+
+
+@dataclass(slots=True, frozen=True)
+class Instruction:
+    mnemonic: str
+    operands: tuple[Operand, ...] = ()
+
+    def __str__(self) -> str:
+        if not self.operands:
+            return self.mnemonic
+        return f"{self.mnemonic} {', '.join(str(operand) for operand in self.operands)}"
+
+    @staticmethod
+    def parse(line: str) -> "Instruction":
+        mnemonic, _, rest = line.strip().partition(" ")
+        operands: list[Operand] = []
+        for operand in (part.strip() for part in rest.split(",") if part.strip()):
+            operands.append(int(operand) if re.fullmatch(r"-?\d+", operand) else operand)
+        return Instruction(mnemonic, tuple(operands))
+
+
+# NOTE: Labels and directives are kept as text, the optimiser never looks through them
+AsmLine = Union[Instruction, str]
+
+
+@dataclass(slots=True, frozen=True)
+class Effects:
+    reads: frozenset[str]
+    writes: frozenset[str]
+    reads_memory: bool = False
+    writes_memory: bool = False
+
+
+def _written(destination: Operand) -> frozenset[str]:
+    return frozenset((destination,)) if isinstance(destination, str) and is_register(destination) else frozenset()
+
+
+def effects(instruction: Instruction) -> Optional[Effects]:
+    """Registers and memory an instruction reads and writes, None when it is not modelled."""
+    operands = instruction.operands
+    match instruction.mnemonic, len(operands):
+        case ("mov" | "movabs"), 2:
+            destination, source = operands
+            return Effects(
+                registers_in(source) | (registers_in(destination) if is_memory(destination) else frozenset()),
+                _written(destination),
+                is_memory(source),
+                is_memory(destination),
+            )
+        case mnemonic, 2 if mnemonic in ARITHMETIC_MNEMONICS:
+            destination, source = operands
+            return Effects(
+                registers_in(destination) | registers_in(source),
+                _written(destination),
+                is_memory(destination) or is_memory(source),
+                is_memory(destination),
+            )
+        case "imul", 3:
+            destination, source, _ = operands
+            assert isinstance(destination, str)
+            return Effects(registers_in(source), frozenset((destination,)), is_memory(source))
+        case "push", 1:
+            return Effects(registers_in(operands[0]) | {"rsp"}, frozenset(("rsp",)), is_memory(operands[0]), True)
+        case "pop", 1:
+            destination = operands[0]
+            assert isinstance(destination, str)
+            return Effects(frozenset(("rsp",)), frozenset((destination, "rsp")), True)
+        case "cqo", 0:
+            return Effects(frozenset(("rax",)), frozenset(("rdx",)))
+        case "idiv", 1:
+            return Effects(frozenset(("rax", "rdx")) | registers_in(operands[0]), frozenset(("rax", "rdx")), is_memory(operands[0]))
+        case "leave", 0:
+            return Effects(frozenset(("rbp",)), frozenset(("rbp", "rsp")), True)
+        case _:
+            return None
+
+
+def format_asm(lines: list[AsmLine]) -> list[str]:
+    return [f"    {line}" if isinstance(line, Instruction) else line for line in lines]
@@ -1,16 +1,40 @@
-from slow.node import NodeVisitor
+from typing import Optional
+
+from slow.node import Node
+from slow.traversal import TraversalVisitor
 from slow.ast.binary import BinaryNode
 from slow.ast.literal import LiteralIntegerNode
+from .asm import AsmLine, Instruction
+from .peephole import PeepholeOptimizer
+from .sink import Sink, StdoutSink
+
+
+class AstAsmVisitor(TraversalVisitor):
+    """Stack machine code. The result of an expression is left on the stack, so an optimizer
+    for this output should be built with `live_out=frozenset(("rsp",))`."""
+    def __init__(self, sink: Optional[Sink] = None, optimizer: Optional[PeepholeOptimizer] = None) -> None:
+        self.sink: Sink = sink if sink is not None else StdoutSink()
+        self.optimizer = optimizer
+        self.instructions: list[AsmLine] = []
+
+    def walk(self, node: Node) -> None:
+        self.instructions = []
+        super().walk(node)
+        if self.optimizer is not None:
+            self.instructions = self.optimizer.optimize(self.instructions)
 
+        write = self.sink.write
+        for instruction in self.instructions:
+            write(str(instruction))
+        self.sink.flush()
 
-class AstAsmVisitor(NodeVisitor):
-    def visit_literal_integer(self, node: LiteralIntegerNode) -> None:
-        print(f"push {node.value}")
+    def leave_literal_integer(self, node: LiteralIntegerNode) -> None:
+        self.instructions.append(Instruction("push", (node.value,)))
 
-    def visit_binary(self, node: BinaryNode) -> None:
-        node.lhs.accept(self)
-        node.rhs.accept(self)
-        print("pop rdi")
-        print("pop rax")
-        print(f"{node.op.to_asm()} rax, rdi")
-        print("push rax")
+    def leave_binary(self, node: BinaryNode) -> None:
+        self.instructions.extend((
+            Instruction("pop", ("rdi",)),
+            Instruction("pop", ("rax",)),
+            Instruction(node.op.to_asm(), ("rax", "rdi")),
+            Instruction("push", ("rax",)),
+        ))
@@ -0,0 +1,190 @@
+import importlib
+import operator
+from array import array
+from itertools import repeat
+from typing import Any, Callable, Mapping, Optional, Sequence, Union
+
+from slow.node import Node
+from slow.traversal import TraversalVisitor
+from slow.ast.assign import AssignNode
+from slow.ast.binary import BinaryNode, BinaryOperator
+from slow.ast.literal import LiteralIntegerNode
+from slow.ast.identifier import IdentifierNode
+from slow.ast.let import LetAssignmentNode, LetDeclarationNode
+
+
+def _load_numpy() -> Any:
+    try:
+        return importlib.import_module("numpy")
+    except ImportError:
+        return None
+
+
+# NOTE: Optional dependency, the array module is used when it is missing
+numpy: Any = _load_numpy()
+
+# NOTE: One value per binding, a numpy int64 ndarray or an array("q")
+Column = Any
+# NOTE: Values that do not depend on any input stay Python ints until the results are built
+Value = Union[int, Column]
+
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+
+
+class ArrayKernels:
+    """Element-wise operators over array("q") columns, one pass per operator.
+
+    Results must fit in 64 bits, storing an overflowing value raises OverflowError.
+    """
+    name = "array"
+
+    def column(self, values: Sequence[int]) -> Column:
+        return values if isinstance(values, array) and values.typecode == "q" else array("q", values)
+
+    def full(self, size: int, value: int) -> Column:
+        return array("q", [value]) * size
+
+    def fold(self, op: BinaryOperator, lhs: int, rhs: int) -> int:
+        value = op.apply(lhs, rhs)
+        if not _INT64_MIN <= value <= _INT64_MAX:
+            raise OverflowError(f"{lhs} {op} {rhs} does not fit in 64 bits")
+        return value
+
+    def _map(self, function: Callable[[int, int], int], lhs: Value, rhs: Value) -> Column:
+        size = min(len(value) for value in (lhs, rhs) if not isinstance(value, int))
+        lhs_values = repeat(lhs, size) if isinstance(lhs, int) else lhs
+        rhs_values = repeat(rhs, size) if isinstance(rhs, int) else rhs
+        return array("q", map(function, lhs_values, rhs_values))
+
+    def add(self, lhs: Value, rhs: Value) -> Column:
+        return self._map(operator.add, lhs, rhs)
+
+    def sub(self, lhs: Value, rhs: Value) -> Column:
+        return self._map(operator.sub, lhs, rhs)
+
+    def mul(self, lhs: Value, rhs: Value) -> Column:
+        return self._map(operator.mul, lhs, rhs)
+
+    def div(self, lhs: Value, rhs: Value) -> Column:
+        if (rhs == 0) if isinstance(rhs, int) else (0 in rhs):
+            raise ZeroDivisionError("integer division by zero")
+        return self._map(BinaryOperator.DIV.apply, lhs, rhs)
+
+
+class NumpyKernels:
+    """Element-wise operators over int64 ndarrays. Like machine code, overflowing values wrap around."""
+    name = "numpy"
+
+    def column(self, values: Sequence[int]) -> Column:
+        return numpy.asarray(values, dtype=numpy.int64)
+
+    def full(self, size: int, value: int) -> Column:
+        return numpy.full(size, value, dtype=numpy.int64)
+
+    def fold(self, op: BinaryOperator, lhs: int, rhs: int) -> int:
+        # NOTE: Operands are in range already, so wrapping the exact result matches int64 arithmetic
+        return (op.apply(lhs, rhs) - _INT64_MIN) % (1 << 64) + _INT64_MIN
+
+    def add(self, lhs: Value, rhs: Value) -> Column:
+        return numpy.add(lhs, rhs, dtype=numpy.int64)
+
+    def sub(self, lhs: Value, rhs: Value) -> Column:
+        return numpy.subtract(lhs, rhs, dtype=numpy.int64)
+
+    def mul(self, lhs: Value, rhs: Value) -> Column:
+        return numpy.multiply(lhs, rhs, dtype=numpy.int64)
+
+    def div(self, lhs: Value, rhs: Value) -> Column:
+        if numpy.any(numpy.equal(rhs, 0)):
+            raise ZeroDivisionError("integer division by zero")
+        # NOTE: Vectorised truncating_div (see slow.ast.binary), floor_divide rounds
+        # towards -inf, so inexact quotients of operands with different signs are one too low
+        quotient = numpy.floor_divide(lhs, rhs, dtype=numpy.int64)
+        inexact = numpy.remainder(lhs, rhs, dtype=numpy.int64) != 0
+        return quotient + (inexact & (numpy.less(lhs, 0) != numpy.less(rhs, 0)))
+
+
+Kernels = Union[ArrayKernels, NumpyKernels]
+
+
+class BatchEvaluator(TraversalVisitor):
+    """Evaluates a program once for a whole batch of input bindings.
+
+    Identifiers declared without a value (`let x;`) and named in `inputs` are bound to a column
+    instead of 0, every binary operation then runs once over whole columns. Uses NumPy when it is
+    installed (or `use_numpy` is True) and the array module otherwise. Division matches the scalar
+    path: it truncates towards zero and raises ZeroDivisionError.
+    """
+    name = "batch"
+    def __init__(self, use_numpy: Optional[bool] = None) -> None:
+        if use_numpy is None:
+            use_numpy = numpy is not None
+        if use_numpy and numpy is None:
+            raise ImportError("NumPy is not installed")
+
+        self.kernels: Kernels = NumpyKernels() if use_numpy else ArrayKernels()
+        self.environment: dict[str, Value] = {}
+        self.value_stack: list[Value] = []
+        self.inputs: dict[str, Column] = {}
+        self.size = 0
+        self._unbound: set[str] = set()
+
+    def run(self, node: Node, inputs: Mapping[str, Sequence[int]], size: Optional[int] = None) -> dict[str, Column]:
+        """Columns of the final value of every variable, `size` (or the inputs' length) rows each."""
+        self.inputs = {name: self.kernels.column(values) for name, values in inputs.items()}
+        sizes = {len(column) for column in self.inputs.values()} | ({size} if size is not None else set())
+        if len(sizes) > 1:
+            raise ValueError(f"Inputs have different lengths: {sorted(sizes)}")
+        self.size = sizes.pop() if sizes else 1
+        self.environment = {}
+        self.value_stack = []
+        self._unbound = set(self.inputs)
+
+        self.walk(node)
+
+        if self._unbound:
+            raise ValueError(f"Inputs {sorted(self._unbound)} are not declared with `let <name>;`")
+        return {name: self._column(value) for name, value in self.environment.items()}
+
+    def _column(self, value: Value) -> Column:
+        return self.kernels.full(self.size, value) if isinstance(value, int) else value
+
+    def leave_literal_integer(self, node: LiteralIntegerNode) -> None:
+        self.value_stack.append(node.value)
+
+    def leave_identifier(self, node: IdentifierNode) -> None:
+        assert node.name in self.environment # At this stage, all identifiers should be declared (parser responsibility)
+        self.value_stack.append(self.environment[node.name])
+
+    def leave_binary(self, node: BinaryNode) -> None:
+        rhs = self.value_stack.pop()
+        lhs = self.value_stack.pop()
+
+        # NOTE: Constant subexpressions are computed once, with the same overflow behaviour as columns
+        if isinstance(lhs, int) and isinstance(rhs, int):
+            self.value_stack.append(self.kernels.fold(node.op, lhs, rhs))
+            return
+
+        match node.op:
+            case BinaryOperator.ADD:
+                self.value_stack.append(self.kernels.add(lhs, rhs))
+            case BinaryOperator.SUB:
+                self.value_stack.append(self.kernels.sub(lhs, rhs))
+            case BinaryOperator.MUL:
+                self.value_stack.append(self.kernels.mul(lhs, rhs))
+            case BinaryOperator.DIV:
+                self.value_stack.append(self.kernels.div(lhs, rhs))
+            case _:
+                raise ValueError(f"Binary operator {node.op} is not supported")
+
+    def leave_let_declaration(self, node: LetDeclarationNode) -> None:
+        # NOTE: Declared but unassigned identifiers default to 0, unless they are inputs
+        self.environment[node.identifier.name] = self.inputs.get(node.identifier.name, 0)
+        self._unbound.discard(node.identifier.name)
+
+    def leave_let_assignment(self, node: LetAssignmentNode) -> None:
+        self.environment[node.identifier.name] = self.value_stack.pop()
+
+    def leave_assign(self, node: AssignNode) -> None:
+        self.environment[node.identifier.name] = self.value_stack.pop()
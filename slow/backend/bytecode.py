@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Optional
+
+from slow.node import Node
+from slow.symbols import SymbolTable
+from slow.traversal import TraversalVisitor
+from slow.ast.assign import AssignNode
+from slow.ast.binary import BinaryNode, BinaryOperator
+from slow.ast.literal import LiteralIntegerNode
+from slow.ast.identifier import IdentifierNode
+from slow.ast.let import LetAssignmentNode, LetDeclarationNode
+
+
+class Opcode(IntEnum):
+    CONST = 0 # CONST <constant index>
+    LOAD  = 1 # LOAD <slot>
+    STORE = 2 # STORE <slot>
+    ADD   = 3
+    SUB   = 4
+    MUL   = 5
+    DIV   = 6
+
+    @staticmethod
+    def from_binary_operator(op: BinaryOperator) -> Opcode:
+        match op:
+            case BinaryOperator.ADD:
+                return Opcode.ADD
+            case BinaryOperator.SUB:
+                return Opcode.SUB
+            case BinaryOperator.MUL:
+                return Opcode.MUL
+            case BinaryOperator.DIV:
+                return Opcode.DIV
+            case _:
+                raise ValueError(f"Binary operator {op} is not supported")
+
+    def has_operand(self) -> bool:
+        return self in (Opcode.CONST, Opcode.LOAD, Opcode.STORE)
+
+
+@dataclass
+class Bytecode:
+    code: array[int] = field(default_factory=lambda: array("q"))
+    constants: list[int] = field(default_factory=list)
+    slots: list[str] = field(default_factory=list)
+
+    def __str__(self) -> str:
+        lines: list[str] = []
+        pc = 0
+        while pc < len(self.code):
+            opcode = Opcode(self.code[pc])
+            if not opcode.has_operand():
+                lines.append(f"{pc:04} {opcode.name}")
+                pc += 1
+                continue
+
+            operand = self.code[pc + 1]
+            match opcode:
+                case Opcode.CONST:
+                    lines.append(f"{pc:04} {opcode.name:<5} {operand} ({self.constants[operand]})")
+                case _:
+                    lines.append(f"{pc:04} {opcode.name:<5} {operand} ({self.slots[operand]})")
+            pc += 2
+
+        return "\n".join(lines)
+
+
+_NO_SLOT = -1
+
+
+class BytecodeCompiler(TraversalVisitor):
+    def __init__(self, symbols: Optional[SymbolTable] = None) -> None:
+        self.symbols = symbols if symbols is not None else SymbolTable(by_name=True)
+        self.bytecode = Bytecode()
+        self.constant_table: dict[int, int] = {}
+        # NOTE: Slot of every identifier, indexed by symbol id
+        self.slot_table: list[int] = []
+
+    def compile(self, node: Node) -> Bytecode:
+        self.bytecode = Bytecode()
+        self.constant_table = {}
+        self.slot_table = []
+
+        self.walk(node)
+        return self.bytecode
+
+    def _emit(self, opcode: Opcode, operand: int | None = None) -> None:
+        self.bytecode.code.append(opcode)
+        if operand is not None:
+            self.bytecode.code.append(operand)
+
+    def _constant(self, value: int) -> int:
+        if value not in self.constant_table:
+            self.constant_table[value] = len(self.bytecode.constants)
+            self.bytecode.constants.append(value)
+
+        return self.constant_table[value]
+
+    def _slot(self, identifier: IdentifierNode) -> int:
+        symbol = self.symbols.resolve(identifier)
+        if symbol >= len(self.slot_table):
+            self.slot_table.extend([_NO_SLOT] * (symbol + 1 - len(self.slot_table)))
+
+        if self.slot_table[symbol] == _NO_SLOT:
+            self.slot_table[symbol] = len(self.bytecode.slots)
+            self.bytecode.slots.append(identifier.name)
+
+        return self.slot_table[symbol]
+
+    def leave_literal_integer(self, node: LiteralIntegerNode) -> None:
+        self._emit(Opcode.CONST, self._constant(node.value))
+
+    def leave_identifier(self, node: IdentifierNode) -> None:
+        symbol = self.symbols.resolve(node)
+        assert symbol < len(self.slot_table) and self.slot_table[symbol] != _NO_SLOT # At this stage, all identifiers should be declared (parser responsibility)
+        self._emit(Opcode.LOAD, self.slot_table[symbol])
+
+    def leave_binary(self, node: BinaryNode) -> None:
+        self._emit(Opcode.from_binary_operator(node.op))
+
+    def leave_let_declaration(self, node: LetDeclarationNode) -> None:
+        # NOTE: Slots start zeroed, reserving one is enough
+        self._slot(node.identifier)
+
+    def leave_let_assignment(self, node: LetAssignmentNode) -> None:
+        self._emit(Opcode.STORE, self._slot(node.identifier))
+
+    def leave_assign(self, node: AssignNode) -> None:
+        self._emit(Opcode.STORE, self._slot(node.identifier))
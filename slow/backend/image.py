@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+from array import array
+from enum import IntEnum
+from typing import Literal, Optional, Union
+
+from slow._exceptions import ImageError
+from .bytecode import Bytecode
+from .vm import VirtualMachine
+
+
+MAGIC = b"SLWI"
+FORMAT_VERSION = 1
+
+# NOTE: magic, format version, reserved, section count, reserved. Sections follow as
+# (kind, reserved, offset, length) entries, offsets and lengths in bytes from the start of the file.
+# Everything is little endian and sections are 8 byte aligned so that they can be cast in place.
+_HEADER = struct.Struct("<4sHHII")
+_SECTION = struct.Struct("<IIQQ")
+_ALIGNMENT = 8
+
+_INT64_MIN = -(2 ** 63)
+_INT64_MAX = 2 ** 63 - 1
+
+
+class SectionKind(IntEnum):
+    CODE      = 1 # int64 bytecode words
+    CONSTANTS = 2 # int64 constant pool
+    SYMBOLS   = 3 # NUL separated UTF-8 slot names
+
+
+_KNOWN_SECTIONS = frozenset(kind.value for kind in SectionKind)
+# NOTE: Cast in place to int64 views, which needs whole, aligned words
+_INT64_SECTIONS = frozenset((SectionKind.CODE, SectionKind.CONSTANTS))
+
+
+def image_bytes(bytecode: Bytecode) -> bytes:
+    """Serialises bytecode (as BytecodeCompiler emits it) into the image format."""
+    for constant in bytecode.constants:
+        if not _INT64_MIN <= constant <= _INT64_MAX:
+            raise ImageError(f"Constant {constant} does not fit in 64 bits")
+
+    sections = [
+        (SectionKind.CODE, array("q", bytecode.code).tobytes()),
+        (SectionKind.CONSTANTS, array("q", bytecode.constants).tobytes()),
+        (SectionKind.SYMBOLS, b"\0".join(name.encode() for name in bytecode.slots)),
+    ]
+
+    offset = _HEADER.size + _SECTION.size * len(sections)
+    table: list[bytes] = []
+    body: list[bytes] = []
+    for kind, data in sections:
+        padding = -offset % _ALIGNMENT
+        body.append(bytes(padding))
+        offset += padding
+        table.append(_SECTION.pack(kind, 0, offset, len(data)))
+        body.append(data)
+        offset += len(data)
+
+    return b"".join([_HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(sections), 0), *table, *body])
+
+
+def write_image(bytecode: Bytecode, path: Union[str, os.PathLike[str]]) -> None:
+    with open(path, "wb") as file:
+        file.write(image_bytes(bytecode))
+
+
+class CompiledImage:
+    """Zero-copy reader of the image format: sections are memoryviews into the file's mapping.
+
+    Close it (or use it as a context manager) once done, views handed out must not be used after.
+    """
+    def __init__(self, buffer: Union[mmap.mmap, bytes]) -> None:
+        self._buffer = buffer
+        self._view = memoryview(buffer)
+        # NOTE: Views handed out, released before the mapping can be closed
+        self._views: dict[tuple[SectionKind, str], memoryview] = {}
+        self._slots: Optional[list[str]] = None
+        self.sections: dict[SectionKind, tuple[int, int]] = {}
+        try:
+            self._read_sections()
+        except ImageError:
+            self.close()
+            raise
+
+    def _read_sections(self) -> None:
+        if len(self._view) < _HEADER.size:
+            raise ImageError("Truncated image header")
+        magic, version, _, count, _ = _HEADER.unpack_from(self._view)
+        if magic != MAGIC:
+            raise ImageError(f"Not a compiled slow image (magic {magic!r})")
+        if version != FORMAT_VERSION:
+            raise ImageError(f"Unsupported image format version {version}, expected {FORMAT_VERSION}")
+        if len(self._view) < _HEADER.size + _SECTION.size * count:
+            raise ImageError("Truncated section table")
+
+        for index in range(count):
+            kind, _, offset, length = _SECTION.unpack_from(self._view, _HEADER.size + _SECTION.size * index)
+            if offset + length > len(self._view):
+                raise ImageError(f"Section {kind} extends past the end of the image")
+            # NOTE: Unknown sections are skipped, newer writers may add some
+            if kind not in _KNOWN_SECTIONS:
+                continue
+            section = SectionKind(kind)
+            if section in self.sections:
+                raise ImageError(f"Duplicate {section.name} section")
+            if section in _INT64_SECTIONS and (offset % _ALIGNMENT or length % _ALIGNMENT):
+                raise ImageError(f"{section.name} section is not made of aligned 64 bit words (offset {offset}, length {length})")
+            self.sections[section] = (offset, length)
+
+        for kind in SectionKind:
+            if kind not in self.sections:
+                raise ImageError(f"Missing {kind.name} section")
+
+    @staticmethod
+    def open(path: Union[str, os.PathLike[str]]) -> CompiledImage:
+        with open(path, "rb") as file:
+            try:
+                buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as error: # NOTE: Empty files cannot be mapped
+                raise ImageError(f"Cannot map {os.fspath(path)!r}: {error}") from error
+        return CompiledImage(buffer)
+
+    def __enter__(self) -> CompiledImage:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        for view in self._views.values():
+            view.release()
+        self._views = {}
+        self._view.release()
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+    def section(self, kind: SectionKind, typecode: Literal["B", "q"] = "B") -> memoryview:
+        view = self._views.get((kind, typecode))
+        if view is None:
+            offset, length = self.sections[kind]
+            view = self._views[(kind, typecode)] = self._view[offset : offset + length].cast(typecode)
+        return view
+
+    @property
+    def code(self) -> memoryview:
+        return self.section(SectionKind.CODE, "q")
+
+    @property
+    def constants(self) -> memoryview:
+        return self.section(SectionKind.CONSTANTS, "q")
+
+    @property
+    def slots(self) -> list[str]:
+        if self._slots is None:
+            data = self.section(SectionKind.SYMBOLS)
+            self._slots = [name.decode() for name in bytes(data).split(b"\0")] if len(data) else []
+        return self._slots
+
+    def execute(self) -> list[int]:
+        return VirtualMachine().execute_code(self.code, self.constants, len(self.slots))
+
+    def run(self) -> dict[str, int]:
+        return dict(zip(self.slots, self.execute()))
+
+    def bytecode(self) -> Bytecode:
+        """A copy of the image as Bytecode, e.g. to print it."""
+        return Bytecode(array("q", self.code), list(self.constants), list(self.slots))
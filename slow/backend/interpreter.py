@@ -0,0 +1,41 @@
+from slow.traversal import TraversalVisitor
+from slow.ast.assign import AssignNode
+from slow.ast.binary import BinaryNode
+from slow.ast.literal import LiteralIntegerNode
+from slow.ast.identifier import IdentifierNode
+from slow.ast.let import LetAssignmentNode, LetDeclarationNode
+from slow.ast.program import ProgramNode
+
+
+class AstInterpreter(TraversalVisitor):
+    def __init__(self) -> None:
+        self.environment: dict[str, int] = {}
+        self.value_stack: list[int] = []
+
+    def leave_literal_integer(self, node: LiteralIntegerNode) -> None:
+        self.value_stack.append(node.value)
+
+    def leave_identifier(self, node: IdentifierNode) -> None:
+        assert node.name in self.environment # At this stage, all identifiers should be declared (parser responsibility)
+        self.value_stack.append(self.environment[node.name])
+
+    def leave_binary(self, node: BinaryNode) -> None:
+        rhs = self.value_stack.pop()
+        lhs = self.value_stack.pop()
+        self.value_stack.append(node.op.apply(lhs, rhs))
+
+    def leave_let_declaration(self, node: LetDeclarationNode) -> None:
+        # NOTE: Declared but unassigned identifiers default to 0
+        self.environment[node.identifier.name] = 0
+
+    def leave_let_assignment(self, node: LetAssignmentNode) -> None:
+        self.environment[node.identifier.name] = self.value_stack.pop()
+
+    def leave_assign(self, node: AssignNode) -> None:
+        self.environment[node.identifier.name] = self.value_stack.pop()
+
+    def run(self, node: ProgramNode) -> dict[str, int]:
+        self.environment = {}
+        self.value_stack = []
+        self.walk(node)
+        return self.environment
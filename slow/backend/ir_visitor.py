@@ -1,69 +1,138 @@
+from typing import Iterable, Optional
+
+from slow.node import Node, StatementNode
 from slow.ast.assign import AssignNode
-from slow.node import NodeVisitor
+from slow.symbols import SymbolTable
+from slow.traversal import TraversalVisitor
 from slow.ast.binary import BinaryNode, BinaryOperator
 from slow.ast.literal import LiteralIntegerNode
 from slow.ast.identifier import IdentifierNode
-from slow.ast.let import LetAssignmentNode, LetDeclarationNode
-from slow.ast.program import ProgramNode
+from slow.ast.let import LetAssignmentNode
+from slow.ir.program import IROpcode, IRProgram
+from slow.ir.printer import format_instructions
+from .sink import Sink, StdoutSink
+
 
+_OPCODES: dict[BinaryOperator, int] = {op: IROpcode.from_binary_operator(op).value for op in BinaryOperator}
 
-class IRVisitor(NodeVisitor):
-    def __init__(self) -> None:
-        self.temporary_counter = 0
-        self.literal_integer_temporary_cache: dict[int, int] = {}
-        self.identifier_counter: dict[IdentifierNode, int] = {}
-        self.binary_temporary_cache: dict[tuple[BinaryOperator, str, str], int] = {}
-        self.temporary_stack: list[str] = []
+
+class IRVisitor(TraversalVisitor):
+    """Lowers trees to an IRProgram. The visit_* entry points also print the new instructions to the sink."""
+    name = "ir-lowering"
+    def __init__(self, symbols: Optional[SymbolTable] = None, sink: Optional[Sink] = None) -> None:
+        # NOTE: Pass the parser's table when visiting parsed trees together with hand built nodes
+        self.symbols = symbols if symbols is not None else SymbolTable(by_name=True)
+        self.sink: Sink = sink if sink is not None else StdoutSink()
+        self.ir = IRProgram()
+        # NOTE: Current SSA version of every identifier, indexed by symbol id
+        self.identifier_counter: list[int] = []
+        self.binary_temporary_cache: dict[tuple[int, int, int], int] = {}
+        # NOTE: Value numbers of the evaluated operands
+        self.temporary_stack: list[int] = []
 
     def _clear(self) -> None:
-        self.temporary_counter = 1
-        self.literal_integer_temporary_cache = {}
-        self.identifier_counter = {}
+        self.ir = IRProgram()
+        self.identifier_counter = []
         self.binary_temporary_cache = {}
         self.temporary_stack = []
 
-    def visit_literal_integer(self, node: LiteralIntegerNode) -> None:
-        self.temporary_stack.append(f"{node.value}")
+    def build(self, node: Node) -> IRProgram:
+        """Lowers `node` into a fresh IRProgram without printing it."""
+        self._clear()
+        super().walk(node)
+        return self.ir
+
+    def stream(self, statements: Iterable[StatementNode], max_values: int = 1 << 16) -> int:
+        """Lowers and prints statements one at a time, e.g. as `Parser.parse_statements` yields them.
+
+        Instructions are dropped once printed, only the SSA versions and the CSE cache persist across
+        statements. Once more than `max_values` values are numbered, the program is compacted to the
+        current variable versions and the CSE cache restarts, which bounds memory on any input as
+        long as the sink writes its lines out (StdoutSink and FileSink do, BufferSink keeps them).
+        Returns the number of instructions printed.
+        """
+        self._clear()
+        write = self.sink.write
+        count = 0
+        for statement in statements:
+            super().walk(statement)
+            for line in format_instructions(self.ir):
+                write(line)
+            count += len(self.ir)
+            self.ir.clear_instructions()
+            if self.ir.value_count > max_values:
+                self._compact()
+
+        self.sink.flush()
+        return count
+
+    def _compact(self) -> None:
+        # NOTE: Text only shows names, versions and temporary numbers, so renumbering the values is invisible
+        ir = IRProgram(names=self.ir.names, temporary_count=self.ir.temporary_count)
+        for symbol, version in enumerate(self.identifier_counter):
+            if version:
+                ir.variable(symbol, version)
+        self.ir = ir
+        self.binary_temporary_cache = {}
 
-    def visit_identifier(self, node: IdentifierNode) -> None:
-        assert node in self.identifier_counter # At this stage, all identifiers should be declared (parser responsibility)
-        self.temporary_stack.append(f"{node.name}{self.identifier_counter[node]}")
+    def run(self, node: Node) -> IRProgram:
+        return self.build(node)
 
-    def visit_binary(self, node: BinaryNode) -> None:
-        node.lhs.accept(self)
-        node.rhs.accept(self)
+    @property
+    def changed_count(self) -> int:
+        return len(self.ir)
 
+    def _symbol(self, identifier: IdentifierNode) -> int:
+        symbol = self.symbols.resolve(identifier)
+        if symbol >= len(self.identifier_counter):
+            self.identifier_counter.extend([0] * (symbol + 1 - len(self.identifier_counter)))
+        if symbol >= len(self.ir.names):
+            self.ir.names.extend([""] * (symbol + 1 - len(self.ir.names)))
+        # NOTE: Symbols may come from the parser's table, the program keeps the names it needs
+        self.ir.names[symbol] = identifier.name
+        return symbol
+
+    def walk(self, node: Node) -> None:
+        start = len(self.ir)
+        super().walk(node)
+
+        write = self.sink.write
+        for line in format_instructions(self.ir, start):
+            write(line)
+        self.sink.flush()
+
+    def leave_literal_integer(self, node: LiteralIntegerNode) -> None:
+        self.temporary_stack.append(self.ir.constant(node.value))
+
+    def leave_identifier(self, node: IdentifierNode) -> None:
+        symbol = self._symbol(node)
+        assert self.identifier_counter[symbol] > 0 # At this stage, all identifiers should be declared (parser responsibility)
+        self.temporary_stack.append(self.ir.variable(symbol, self.identifier_counter[symbol]))
+
+    def leave_binary(self, node: BinaryNode) -> None:
         rhs = self.temporary_stack.pop()
         lhs = self.temporary_stack.pop()
 
-        key = (node.op, lhs, rhs)
+        opcode = _OPCODES[node.op]
+        key = (opcode, lhs, rhs)
         if key in self.binary_temporary_cache:
-            self.temporary_stack.append(f"t{self.binary_temporary_cache[key]}")
+            self.temporary_stack.append(self.binary_temporary_cache[key])
         else:
-            print(f"t{self.temporary_counter} = {lhs} {node.op} {rhs}")
-            self.binary_temporary_cache[key] = self.temporary_counter
-            self.temporary_stack.append(f"t{self.temporary_counter}")
-            self.temporary_counter += 1
-
-    def visit_let_declaration(self, node: LetDeclarationNode) -> None:
-        # TODO: How to handle let declarations in SSA form?
-        return
-
-    def visit_let_assignment(self, node: LetAssignmentNode) -> None:
-        id_counter = self.identifier_counter.get(node.identifier, 0)
-        self.identifier_counter[node.identifier] = id_counter + 1
+            target = self.ir.temporary()
+            self.ir.emit(opcode, target, lhs, rhs)
+            self.binary_temporary_cache[key] = target
+            self.temporary_stack.append(target)
 
-        node.expression.accept(self)
-        expression = self.temporary_stack.pop()
-        print(f"{node.identifier.name}{id_counter + 1} = {expression}")
+    # TODO: How to handle let declarations in SSA form?
 
-    def visit_assign(self, node: AssignNode) -> None:
-        node.expression.accept(self)
-        expression = self.temporary_stack.pop()
+    def leave_let_assignment(self, node: LetAssignmentNode) -> None:
+        # NOTE: The new version is only defined once the expression has been evaluated, `let x = x + 1` reads the previous one
+        self._define(node.identifier, self.temporary_stack.pop())
 
-        self.identifier_counter[node.identifier] += 1
-        print(f"{node.identifier.name}{self.identifier_counter[node.identifier]} = {expression}")
+    def leave_assign(self, node: AssignNode) -> None:
+        self._define(node.identifier, self.temporary_stack.pop())
 
-    def visit_program(self, node: ProgramNode) -> None:
-        for statement in node.statements:
-            statement.accept(self)
+    def _define(self, identifier: IdentifierNode, expression: int) -> None:
+        symbol = self._symbol(identifier)
+        self.identifier_counter[symbol] += 1
+        self.ir.emit(IROpcode.COPY, self.ir.variable(symbol, self.identifier_counter[symbol]), expression)
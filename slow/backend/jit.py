@@ -0,0 +1,239 @@
+import ctypes
+import mmap
+import os
+import struct
+from typing import Optional
+
+from slow.node import Node
+from slow.symbols import SymbolTable
+from slow.traversal import TraversalVisitor
+from slow.ast.assign import AssignNode
+from slow.ast.binary import BinaryNode, BinaryOperator
+from slow.ast.literal import LiteralIntegerNode
+from slow.ast.identifier import IdentifierNode
+from slow.ast.let import LetAssignmentNode, LetDeclarationNode
+from .x86_64 import to_int64
+
+
+_INT32_MIN = -(2 ** 31)
+_INT32_MAX = 2 ** 31 - 1
+
+# NOTE: A leaf operand not loaded yet: an immediate or the results slot of a variable
+_Leaf = tuple[bool, int]
+
+_PROLOGUE = bytes((
+    0x55,             # push rbp
+    0x48, 0x89, 0xE5, # mov rbp, rsp
+))
+_EPILOGUE = bytes((
+    0x48, 0x89, 0xEC, # mov rsp, rbp
+    0x5D,             # pop rbp
+    0xC3,             # ret
+))
+_SUCCESS = b"\x31\xC0"             # xor eax, eax
+_FAILURE = b"\xB8\x01\x00\x00\x00" # mov eax, 1
+
+# NOTE: `op rax, rcx`, `op rax, [rdi+disp32]` and `op rax, imm32` (no immediate for division)
+_REGISTER_FORMS = {
+    BinaryOperator.ADD: b"\x48\x01\xC8",
+    BinaryOperator.SUB: b"\x48\x29\xC8",
+    BinaryOperator.MUL: b"\x48\x0F\xAF\xC1",
+}
+_MEMORY_FORMS = {
+    BinaryOperator.ADD: b"\x48\x03\x87",
+    BinaryOperator.SUB: b"\x48\x2B\x87",
+    BinaryOperator.MUL: b"\x48\x0F\xAF\x87",
+}
+_IMMEDIATE_FORMS = {
+    BinaryOperator.ADD: b"\x48\x05",
+    BinaryOperator.SUB: b"\x48\x2D",
+    BinaryOperator.MUL: b"\x48\x69\xC0",
+}
+
+# NOTE: rcx == 0 jumps to the failure exit (patched), rcx == -1 negates instead of dividing since
+# INT64_MIN / -1 traps, otherwise `cqo; idiv rcx`
+_DIVISION = bytes((
+    0x48, 0x85, 0xC9,             # test rcx, rcx
+    0x0F, 0x84, 0, 0, 0, 0,       # jz failure
+    0x48, 0x83, 0xF9, 0xFF,       # cmp rcx, -1
+    0x75, 0x05,                   # jne divide
+    0x48, 0xF7, 0xD8,             # neg rax
+    0xEB, 0x05,                   # jmp done
+    0x48, 0x99,                   # divide: cqo
+    0x48, 0xF7, 0xF9,             # idiv rcx
+))
+_DIVISION_JUMP = 5 # NOTE: Offset of the jz rel32 in _DIVISION
+
+_SlowFunction = ctypes.CFUNCTYPE(ctypes.c_int64, ctypes.POINTER(ctypes.c_int64))
+
+_libc = ctypes.CDLL(None, use_errno=True)
+_mprotect = _libc.mprotect
+_mprotect.argtypes = (ctypes.c_void_p, ctypes.c_size_t, ctypes.c_int)
+_mprotect.restype = ctypes.c_int
+
+
+class JitFunction:
+    """Machine code in an executable anonymous mapping, called as `int64_t f(int64_t *results)`.
+
+    The function stores the final value of every variable in `results`, in the order of `slots`,
+    and returns 0, or 1 after a division by zero.
+    """
+    def __init__(self, code: bytes, slots: list[str]) -> None:
+        self.slots = slots
+        self.size = len(code)
+        # NOTE: Written while read-write, then flipped to read-execute: hardened kernels and SELinux
+        # refuse mappings that are writable and executable at once
+        self._memory = mmap.mmap(-1, max(len(code), 1), prot=mmap.PROT_READ | mmap.PROT_WRITE)
+        self._memory.write(code)
+        # NOTE: Holding the exported buffer keeps the mapping alive (and open) as long as the function
+        self._buffer = ctypes.c_char.from_buffer(self._memory)
+        if _mprotect(ctypes.addressof(self._buffer), len(self._memory), mmap.PROT_READ | mmap.PROT_EXEC) != 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"Cannot make the JIT code executable: {os.strerror(errno)}")
+        self._function = _SlowFunction(ctypes.addressof(self._buffer))
+
+    def buffer(self) -> "ctypes.Array[ctypes.c_int64]":
+        return (ctypes.c_int64 * max(len(self.slots), 1))()
+
+    def execute(self, results: "ctypes.Array[ctypes.c_int64]") -> None:
+        """Runs the code into a caller provided buffer (see `buffer`), for repeated evaluations."""
+        if len(results) < len(self.slots):
+            raise ValueError(f"The results buffer needs {len(self.slots)} slots, got {len(results)}")
+        if self._function(results) != 0:
+            raise ZeroDivisionError("integer division by zero")
+
+    def run(self) -> dict[str, int]:
+        results = self.buffer()
+        self.execute(results)
+        return dict(zip(self.slots, results))
+
+
+class JitCompiler(TraversalVisitor):
+    """Encodes trees straight to x86-64 machine code, without an assembler.
+
+    Variables live in the caller's results buffer (rdi). Expressions are evaluated with the top of
+    the stack cached in rax and the rest on the machine stack; leaf operands are folded into the
+    instruction using them as immediates or memory operands.
+    """
+    name = "jit"
+    def __init__(self, symbols: Optional[SymbolTable] = None) -> None:
+        self.symbols = symbols if symbols is not None else SymbolTable(by_name=True)
+        self.code = bytearray()
+        self.slots: list[str] = []
+        # NOTE: Results slot of every symbol, -1 until it is defined
+        self._slot_of: list[int] = []
+        # NOTE: Number of values computed into rax or pushed below it, and the leaf above them
+        self._depth = 0
+        self._pending: Optional[_Leaf] = None
+        self._failure_jumps: list[int] = []
+
+    def compile(self, node: Node) -> JitFunction:
+        self.code = bytearray(_PROLOGUE)
+        self.slots = []
+        self._slot_of = []
+        self._depth = 0
+        self._pending = None
+        self._failure_jumps = []
+
+        self.walk(node)
+        assert self._depth == 0 and self._pending is None
+
+        self.code += _SUCCESS
+        self.code += _EPILOGUE
+        failure = len(self.code)
+        for jump in self._failure_jumps:
+            self.code[jump : jump + 4] = struct.pack("<i", failure - (jump + 4))
+        self.code += _FAILURE
+        self.code += _EPILOGUE
+        return JitFunction(bytes(self.code), list(self.slots))
+
+    def run(self, node: Node) -> JitFunction:
+        return self.compile(node)
+
+    def _slot(self, identifier: IdentifierNode, define: bool = False) -> int:
+        symbol = self.symbols.resolve(identifier)
+        if symbol >= len(self._slot_of):
+            self._slot_of.extend([-1] * (symbol + 1 - len(self._slot_of)))
+        if self._slot_of[symbol] == -1:
+            assert define # At this stage, all identifiers should be declared (parser responsibility)
+            self._slot_of[symbol] = len(self.slots)
+            self.slots.append(identifier.name)
+        return self._slot_of[symbol]
+
+    def _load(self, register: int, leaf: _Leaf) -> None:
+        """mov rax/rcx (0/1), leaf"""
+        is_immediate, value = leaf
+        if not is_immediate:
+            self.code += bytes((0x48, 0x8B, 0x87 | register << 3)) + struct.pack("<i", 8 * value)
+        elif _INT32_MIN <= value <= _INT32_MAX:
+            self.code += bytes((0x48, 0xC7, 0xC0 | register)) + struct.pack("<i", value)
+        else:
+            self.code += bytes((0x48, 0xB8 | register)) + struct.pack("<q", value)
+
+    def _flush(self) -> None:
+        """Moves the pending leaf into rax, pushing what rax held."""
+        if self._pending is None:
+            return
+        if self._depth > 0:
+            self.code.append(0x50) # push rax
+        self._load(0, self._pending)
+        self._pending = None
+        self._depth += 1
+
+    def _leaf(self, leaf: _Leaf) -> None:
+        self._flush()
+        self._pending = leaf
+
+    def leave_literal_integer(self, node: LiteralIntegerNode) -> None:
+        self._leaf((True, to_int64(node.value)))
+
+    def leave_identifier(self, node: IdentifierNode) -> None:
+        self._leaf((False, self._slot(node)))
+
+    def leave_binary(self, node: BinaryNode) -> None:
+        rhs, self._pending = self._pending, None
+        if rhs is None:
+            self.code += b"\x48\x89\xC1\x58" # mov rcx, rax; pop rax
+            self._depth -= 1
+        elif node.op == BinaryOperator.DIV:
+            self._load(1, rhs)
+        elif not rhs[0]:
+            self.code += _MEMORY_FORMS[node.op] + struct.pack("<i", 8 * rhs[1])
+            return
+        elif _INT32_MIN <= rhs[1] <= _INT32_MAX:
+            self.code += _IMMEDIATE_FORMS[node.op] + struct.pack("<i", rhs[1])
+            return
+        else:
+            self._load(1, rhs)
+
+        if node.op == BinaryOperator.DIV:
+            self._failure_jumps.append(len(self.code) + _DIVISION_JUMP)
+            self.code += _DIVISION
+        else:
+            self.code += _REGISTER_FORMS[node.op]
+
+    def _store(self, identifier: IdentifierNode) -> None:
+        displacement = struct.pack("<i", 8 * self._slot(identifier, define=True))
+        leaf, self._pending = self._pending, None
+        if leaf is not None and leaf[0] and _INT32_MIN <= leaf[1] <= _INT32_MAX:
+            self.code += b"\x48\xC7\x87" + displacement + struct.pack("<i", leaf[1]) # mov QWORD PTR [rdi+d], imm32
+            return
+        if leaf is not None:
+            self._load(0, leaf)
+        else:
+            self._depth -= 1
+        self.code += b"\x48\x89\x87" + displacement # mov [rdi+d], rax
+
+    def leave_let_declaration(self, node: LetDeclarationNode) -> None:
+        self._leaf((True, 0))
+        self._store(node.identifier)
+
+    def leave_let_assignment(self, node: LetAssignmentNode) -> None:
+        self._store(node.identifier)
+
+    def leave_assign(self, node: AssignNode) -> None:
+        self._store(node.identifier)
+
+
+def jit_compile(node: Node, symbols: Optional[SymbolTable] = None) -> JitFunction:
+    return JitCompiler(symbols).compile(node)
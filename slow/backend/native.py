@@ -0,0 +1,153 @@
+import os
+import shutil
+import subprocess
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Union
+
+from slow.symbols import SymbolTable
+from slow.ast.program import ProgramNode
+from slow._exceptions import NativeBuildError
+from .peephole import PeepholeOptimizer
+from .x86_64 import X86Codegen
+
+
+# NOTE: Decimal conversion of rdi at the cursor rsi, returns the new cursor in rax. Digits are
+# written backwards in the red zone (leaf function), negatives are printed as '-' and the
+# unsigned magnitude, which also covers INT64_MIN.
+_FORMAT_INT = """\
+slow_format_int:
+    mov rax, rdi
+    lea r9, [rsp-8]
+    mov r8, r9
+    mov rcx, 10
+    test rax, rax
+    jns .Lslow_digit
+    mov BYTE PTR [rsi], 45
+    inc rsi
+    neg rax
+.Lslow_digit:
+    xor edx, edx
+    div rcx
+    add dl, 48
+    dec r8
+    mov BYTE PTR [r8], dl
+    test rax, rax
+    jnz .Lslow_digit
+.Lslow_copy:
+    mov dl, BYTE PTR [r8]
+    mov BYTE PTR [rsi], dl
+    inc rsi
+    inc r8
+    cmp r8, r9
+    jne .Lslow_copy
+    mov rax, rsi
+    ret"""
+
+
+@dataclass(slots=True)
+class NativeProgram:
+    """A linked executable printing `name = value` for every variable, in the order of `slots`."""
+    path: Path
+    slots: list[str]
+
+    def run(self) -> dict[str, int]:
+        completed = subprocess.run([str(self.path)], capture_output=True, text=True, check=True)
+        results: dict[str, int] = {}
+        for line in completed.stdout.splitlines():
+            name, _, value = line.partition(" = ")
+            results[name] = int(value)
+        return results
+
+
+class NativeBuilder:
+    """Builds a static Linux x86-64 executable (no libc) out of a program with GNU as and ld.
+
+    `_start` calls the X86Codegen function `repeat` times (to time it without process start up
+    dominating), prints every variable with a single write(2) and exits with status 0.
+    """
+    def __init__(
+        self,
+        symbols: Optional[SymbolTable] = None,
+        optimizer: Optional[PeepholeOptimizer] = None,
+        repeat: int = 1,
+        assembler: str = "as",
+        linker: str = "ld",
+    ) -> None:
+        assert repeat >= 1
+        self.symbols = symbols if symbols is not None else SymbolTable(by_name=True)
+        self.optimizer = optimizer if optimizer is not None else PeepholeOptimizer()
+        self.repeat = repeat
+        self.assembler = assembler
+        self.linker = linker
+        self.slots: list[str] = []
+
+    def assembly(self, program: ProgramNode) -> list[str]:
+        codegen = X86Codegen(self.symbols, optimizer=self.optimizer)
+        lines = codegen.generate(program)
+        self.slots = codegen.slots
+
+        # NOTE: Worst case per variable: name, " = ", sign and 19 digits, newline
+        output_size = sum(len(name) + 24 for name in self.slots) or 1
+        lines.append("    .text")
+        lines.append("    .globl _start")
+        lines.append("_start:")
+        lines.append(f"    mov r12, {self.repeat}")
+        lines.append(".Lslow_repeat:")
+        lines.append("    lea rdi, [rip+slow_results]")
+        lines.append("    call slow_program")
+        lines.append("    dec r12")
+        lines.append("    jnz .Lslow_repeat")
+        lines.append("    lea rbx, [rip+slow_output]")
+        for index, name in enumerate(self.slots):
+            lines.append(f"    lea rsi, [rip+slow_name_{index}]")
+            lines.append("    mov rdi, rbx")
+            lines.append(f"    mov rcx, {len(name) + 3}")
+            lines.append("    rep movsb")
+            lines.append("    mov rsi, rdi")
+            lines.append(f"    mov rdi, QWORD PTR [rip+slow_results+{8 * index}]")
+            lines.append("    call slow_format_int")
+            lines.append("    mov BYTE PTR [rax], 10")
+            lines.append("    lea rbx, [rax+1]")
+        lines.append("    mov rax, 1") # write(1, slow_output, rbx - slow_output)
+        lines.append("    mov rdi, 1")
+        lines.append("    lea rsi, [rip+slow_output]")
+        lines.append("    mov rdx, rbx")
+        lines.append("    sub rdx, rsi")
+        lines.append("    syscall")
+        lines.append("    mov rax, 60") # exit(0)
+        lines.append("    xor edi, edi")
+        lines.append("    syscall")
+        lines.append(_FORMAT_INT)
+
+        lines.append("    .section .rodata")
+        for index, name in enumerate(self.slots):
+            lines.append(f'slow_name_{index}: .ascii "{name} = "')
+        lines.append("    .bss")
+        lines.append("    .balign 8")
+        lines.append(f"slow_results: .zero {8 * max(len(self.slots), 1)}")
+        lines.append(f"slow_output: .zero {output_size}")
+        return lines
+
+    def build(self, program: ProgramNode, output: Union[str, os.PathLike[str]]) -> NativeProgram:
+        """Writes `<output>.s`, assembles and links it into the executable `output`."""
+        for tool in (self.assembler, self.linker):
+            if shutil.which(tool) is None:
+                raise NativeBuildError(f"'{tool}' was not found")
+
+        path = Path(output)
+        source = path.with_suffix(".s")
+        source.write_text("\n".join(self.assembly(program)) + "\n")
+
+        with tempfile.TemporaryDirectory() as directory:
+            obj = Path(directory) / "program.o"
+            self._invoke([self.assembler, "-o", str(obj), str(source)])
+            self._invoke([self.linker, "-static", "-o", str(path), str(obj)])
+
+        return NativeProgram(path, list(self.slots))
+
+    def _invoke(self, command: list[str]) -> None:
+        completed = subprocess.run(command, capture_output=True, text=True)
+        if completed.returncode != 0:
+            raise NativeBuildError(f"{' '.join(command)} failed: {completed.stderr.strip()}")
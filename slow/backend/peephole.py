@@ -0,0 +1,214 @@
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from .asm import (
+    ALL_REGISTERS, ARITHMETIC_MNEMONICS, LIVE_AT_RETURN,
+    AsmLine, Effects, Instruction, Operand,
+    effects, is_memory, is_register, registers_in,
+)
+
+
+_INT32_MIN = -(2 ** 31)
+_INT32_MAX = 2 ** 31 - 1
+
+# NOTE: Arithmetic that accepts an immediate source (division never does)
+_IMMEDIATE_ARITHMETIC = frozenset(("add", "sub", "and", "or", "xor", "imul", "mul"))
+
+
+# NOTE: A rule looks at the window starting at `index` and returns the end of what it matched
+# together with its replacement, or None
+Rule = Callable[["PeepholeOptimizer", list[AsmLine], int], Optional[tuple[int, list[AsmLine]]]]
+
+
+@dataclass
+class PeepholeOptimizer:
+    """Windowed rewrite rules over an instruction listing, applied until nothing changes.
+
+    `live_out` are the registers still read after the listing (the stack machine leaves its
+    result on the stack, a function's callers only read LIVE_AT_RETURN after `ret`).
+    """
+    window: int = 4
+    live_out: frozenset[str] = ALL_REGISTERS
+    removed: Counter[str] = field(default_factory=Counter)
+    applied: Counter[str] = field(default_factory=Counter)
+    passes: int = 0
+
+    def optimize(self, lines: list[AsmLine]) -> list[AsmLine]:
+        """Optimised copy of `lines`. The statistics describe this call only."""
+        code = list(lines)
+        self.removed = Counter()
+        self.applied = Counter()
+        self.passes = 0
+        changed = True
+        while changed:
+            changed = False
+            self.passes += 1
+            index = 0
+            while index < len(code):
+                for name, rule in RULES:
+                    match = rule(self, code, index)
+                    if match is None:
+                        continue
+
+                    end, replacement = match
+                    self.removed[name] += (end - index) - len(replacement)
+                    self.applied[name] += 1
+                    code[index:end] = replacement
+                    changed = True
+                    break
+                else:
+                    index += 1
+
+        return code
+
+    def report(self) -> str:
+        return "\n".join(f"{name:<20} {self.applied[name]:>8} applied {self.removed[name]:>8} removed" for name, _ in RULES)
+
+    def window_at(self, code: list[AsmLine], index: int) -> list[tuple[int, Instruction, Effects]]:
+        """Modelled instructions from `index` on, up to the window size or the first unmodelled one."""
+        window: list[tuple[int, Instruction, Effects]] = []
+        for position in range(index, min(len(code), index + self.window)):
+            instruction = code[position]
+            if not isinstance(instruction, Instruction):
+                break
+            instruction_effects = effects(instruction)
+            if instruction_effects is None:
+                break
+            window.append((position, instruction, instruction_effects))
+        return window
+
+    def is_dead_after(self, code: list[AsmLine], index: int, register: str) -> bool:
+        """Whether `register` is overwritten (or the listing ends) before it is read again after `index`."""
+        for position in range(index + 1, len(code)):
+            instruction = code[position]
+            if not isinstance(instruction, Instruction):
+                return False
+            if instruction.mnemonic == "ret":
+                return register not in LIVE_AT_RETURN
+            instruction_effects = effects(instruction)
+            if instruction_effects is None or register in instruction_effects.reads:
+                return False
+            if register in instruction_effects.writes:
+                return True
+        return register not in self.live_out
+
+
+def _self_move(optimizer: PeepholeOptimizer, code: list[AsmLine], index: int) -> Optional[tuple[int, list[AsmLine]]]:
+    """mov r, r"""
+    instruction = code[index]
+    if isinstance(instruction, Instruction) and instruction.mnemonic == "mov" and instruction.operands[0] == instruction.operands[1]:
+        return index + 1, []
+    return None
+
+
+def _push_pop(optimizer: PeepholeOptimizer, code: list[AsmLine], index: int) -> Optional[tuple[int, list[AsmLine]]]:
+    """push x; ...; pop y -> ...; mov y, x, as long as nothing in between touches the stack, y or x"""
+    window = optimizer.window_at(code, index)
+    if not window or window[0][1].mnemonic != "push":
+        return None
+
+    source = window[0][1].operands[0]
+    depends = registers_in(source)
+    for position, instruction, instruction_effects in window[1:]:
+        if instruction.mnemonic == "pop":
+            destination = instruction.operands[0]
+            if is_memory(source) and is_memory(destination):
+                return None
+            replacement: list[AsmLine] = list(code[index + 1 : position])
+            if destination != source:
+                replacement.append(Instruction("mov", (destination, source)))
+            return position + 1, replacement
+
+        if "rsp" in instruction_effects.reads | instruction_effects.writes or instruction_effects.writes & depends:
+            return None
+        if isinstance(source, str) and is_memory(source) and instruction_effects.writes_memory:
+            return None
+    return None
+
+
+def _fold_operand(optimizer: PeepholeOptimizer, code: list[AsmLine], index: int) -> Optional[tuple[int, list[AsmLine]]]:
+    """mov r, x; ...; op d, r -> ...; op d, x, when r is dead afterwards"""
+    window = optimizer.window_at(code, index)
+    if not window or window[0][1].mnemonic not in ("mov", "movabs"):
+        return None
+
+    register, source = window[0][1].operands
+    if not is_register(register) or not (isinstance(source, int) or is_register(source) or is_memory(source)):
+        return None
+    assert isinstance(register, str)
+    depends = registers_in(source)
+
+    for position, instruction, instruction_effects in window[1:]:
+        if instruction.mnemonic in ARITHMETIC_MNEMONICS and instruction.operands[1] == register and instruction.operands[0] != register:
+            destination = instruction.operands[0]
+            if not _can_use_operand(instruction.mnemonic, destination, source) or not optimizer.is_dead_after(code, position, register):
+                return None
+            folded = _with_source(instruction, source)
+            return position + 1, [*code[index + 1 : position], folded]
+
+        if register in instruction_effects.reads | instruction_effects.writes or instruction_effects.writes & depends:
+            return None
+        if is_memory(source) and instruction_effects.writes_memory:
+            return None
+    return None
+
+
+def _can_use_operand(mnemonic: str, destination: Operand, source: Operand) -> bool:
+    if isinstance(source, int):
+        return mnemonic in _IMMEDIATE_ARITHMETIC and _INT32_MIN <= source <= _INT32_MAX
+    # NOTE: At most one memory operand, and imul needs a register destination
+    if is_memory(source):
+        return not is_memory(destination) and mnemonic != "mul"
+    return True
+
+
+def _with_source(instruction: Instruction, source: Operand) -> Instruction:
+    destination = instruction.operands[0]
+    if isinstance(source, int) and instruction.mnemonic == "imul":
+        return Instruction("imul", (destination, destination, source))
+    return Instruction(instruction.mnemonic, (destination, source))
+
+
+def _redundant_load(optimizer: PeepholeOptimizer, code: list[AsmLine], index: int) -> Optional[tuple[int, list[AsmLine]]]:
+    """mov r, x; ...; mov r, x (or mov x, r) -> drops the second one when neither changed in between"""
+    window = optimizer.window_at(code, index)
+    if not window or window[0][1].mnemonic != "mov":
+        return None
+
+    destination, source = window[0][1].operands
+    if not is_register(destination):
+        return None
+    depends = registers_in(source) | {destination}
+
+    for position, instruction, instruction_effects in window[1:]:
+        if instruction.mnemonic == "mov" and instruction.operands in ((destination, source), (source, destination)):
+            return position + 1, list(code[index : position])
+        if instruction_effects.writes & depends:
+            return None
+        if is_memory(source) and instruction_effects.writes_memory:
+            return None
+    return None
+
+
+def _dead_move(optimizer: PeepholeOptimizer, code: list[AsmLine], index: int) -> Optional[tuple[int, list[AsmLine]]]:
+    """mov r, x where r is never read before being overwritten"""
+    instruction = code[index]
+    if not isinstance(instruction, Instruction) or instruction.mnemonic not in ("mov", "movabs"):
+        return None
+
+    destination = instruction.operands[0]
+    if not isinstance(destination, str) or not is_register(destination) or destination in ("rsp", "rbp"):
+        return None
+    if optimizer.is_dead_after(code, index, destination):
+        return index + 1, []
+    return None
+
+
+RULES: list[tuple[str, Rule]] = [
+    ("self-move", _self_move),
+    ("push-pop", _push_pop),
+    ("redundant-load", _redundant_load),
+    ("fold-operand", _fold_operand),
+    ("dead-move", _dead_move),
+]
@@ -0,0 +1,228 @@
+import ast
+from dataclasses import dataclass
+from types import CodeType
+from typing import Any, Callable, Generic, Iterable, Optional, TypeVar
+
+from slow.node import Node, ExpressionNode
+from slow.symbols import SymbolTable
+from slow.traversal import TraversalVisitor
+from slow._exceptions import ParserError
+from slow.frontend.parser import Parser
+from slow.ast.assign import AssignNode
+from slow.ast.binary import BinaryNode, BinaryOperator, truncating_div
+from slow.ast.literal import LiteralIntegerNode
+from slow.ast.identifier import IdentifierNode
+from slow.ast.let import LetAssignmentNode, LetDeclarationNode
+from slow.ast.program import ProgramNode
+
+
+FUNCTION_NAME = "slow_program"
+
+_Value = TypeVar("_Value")
+
+# NOTE: CPython's parser limits nesting, deeper subtrees are hoisted into temporaries
+MAX_EXPRESSION_DEPTH = 64
+
+
+def _local(name: str) -> str:
+    # NOTE: Prefixed so that identifiers never clash with Python keywords, builtins or temporaries
+    return f"v_{name}"
+
+
+@dataclass(slots=True)
+class CompiledProgram:
+    """A program compiled to a Python function returning the final value of every variable."""
+    code: CodeType
+    function: Callable[[], dict[str, int]]
+
+    def run(self) -> dict[str, int]:
+        return self.function()
+
+
+@dataclass(slots=True)
+class CompiledExpression:
+    """An expression together with the Python function computing its value."""
+    node: ExpressionNode
+    code: CodeType
+    function: Callable[[], int]
+
+    def evaluate(self) -> int:
+        return self.function()
+
+
+class PythonCompiler(TraversalVisitor):
+    """Lowers programs to the source of one Python function whose locals are the variables.
+
+    Calling the function returns a dict of the final values, in order of first definition, like
+    AstInterpreter.run. Source text is generated rather than `ast` nodes: building and locating
+    hundreds of thousands of (garbage collected) nodes costs more than CPython parsing the text.
+    """
+    name = "python-lowering"
+    def __init__(self, symbols: Optional[SymbolTable] = None, filename: str = "<slow>") -> None:
+        self.symbols = symbols if symbols is not None else SymbolTable(by_name=True)
+        self.filename = filename
+        self.lines: list[str] = []
+        # NOTE: Python name of every defined variable by its name, in order of first definition
+        self.variables: dict[str, str] = {}
+        # NOTE: Lowered operands with the depth of their tree
+        self.expression_stack: list[tuple[str, int]] = []
+        self.temporary_count = 0
+
+    def source(self, node: Node) -> str:
+        """Source of the function, which returns the value of `node` itself when it is an expression."""
+        self.lines = [f"def {FUNCTION_NAME}():"]
+        self.variables = {}
+        self.expression_stack = []
+        self.temporary_count = 0
+
+        self.walk(node)
+
+        if isinstance(node, ExpressionNode):
+            self.lines.append(f"    return {self.expression_stack.pop()[0]}")
+        else:
+            result = ", ".join(f"{name!r}: {local}" for name, local in self.variables.items())
+            self.lines.append(f"    return {{{result}}}")
+        assert not self.expression_stack
+        return "\n".join(self.lines) + "\n"
+
+    def module(self, node: Node) -> ast.Module:
+        return ast.parse(self.source(node), self.filename)
+
+    def _function(self, node: Node) -> tuple[CodeType, Any]:
+        code = compile(self.source(node), self.filename, "exec")
+        namespace: dict[str, Any] = {"truncating_div": truncating_div}
+        exec(code, namespace)
+        return code, namespace[FUNCTION_NAME]
+
+    def compile(self, node: Node) -> CompiledProgram:
+        return CompiledProgram(*self._function(node))
+
+    def compile_expression(self, node: ExpressionNode) -> CompiledExpression:
+        return CompiledExpression(node, *self._function(node))
+
+    def run(self, node: Node) -> CompiledProgram:
+        return self.compile(node)
+
+    def _push(self, expression: str, depth: int) -> None:
+        if depth >= MAX_EXPRESSION_DEPTH:
+            temporary = f"t_{self.temporary_count}"
+            self.temporary_count += 1
+            self.lines.append(f"    {temporary} = {expression}")
+            expression, depth = temporary, 1
+        self.expression_stack.append((expression, depth))
+
+    def leave_literal_integer(self, node: LiteralIntegerNode) -> None:
+        self.expression_stack.append((str(node.value) if node.value >= 0 else f"({node.value})", 1))
+
+    def leave_identifier(self, node: IdentifierNode) -> None:
+        assert node.name in self.variables # At this stage, all identifiers should be declared (parser responsibility)
+        self.expression_stack.append((self.variables[node.name], 1))
+
+    def leave_binary(self, node: BinaryNode) -> None:
+        rhs, rhs_depth = self.expression_stack.pop()
+        lhs, lhs_depth = self.expression_stack.pop()
+
+        if node.op == BinaryOperator.DIV:
+            expression = f"truncating_div({lhs}, {rhs})"
+        else:
+            expression = f"({lhs} {node.op} {rhs})"
+        self._push(expression, max(lhs_depth, rhs_depth) + 1)
+
+    def _define(self, identifier: IdentifierNode, expression: str) -> None:
+        local = self.variables.setdefault(identifier.name, _local(identifier.name))
+        self.lines.append(f"    {local} = {expression}")
+
+    def leave_let_declaration(self, node: LetDeclarationNode) -> None:
+        # NOTE: Declared but unassigned identifiers default to 0
+        self._define(node.identifier, "0")
+
+    def leave_let_assignment(self, node: LetAssignmentNode) -> None:
+        self._define(node.identifier, self.expression_stack.pop()[0])
+
+    def leave_assign(self, node: AssignNode) -> None:
+        self._define(node.identifier, self.expression_stack.pop()[0])
+
+
+class _LruCache(Generic[_Value]):
+    """Values built from source text by `build`, the least recently used one is evicted past `max_size`."""
+    def __init__(self, max_size: int, build: Callable[[str], _Value]) -> None:
+        self.max_size = max_size
+        self.build = build
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._values: dict[str, _Value] = {}
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __contains__(self, source: str) -> bool:
+        return source in self._values
+
+    def _get(self, source: str) -> _Value:
+        values = self._values
+        value = values.pop(source, None)
+        if value is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            value = self.build(source)
+            while values and len(values) >= self.max_size:
+                del values[next(iter(values))]
+                self.evictions += 1
+        # NOTE: Re-inserted to mark it as the most recently used
+        values[source] = value
+        return value
+
+    def clear(self) -> None:
+        self._values.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+class CodeCache(_LruCache[CompiledProgram]):
+    """Compiled programs by source text."""
+    def __init__(self, max_size: int = 128, iterative: bool = False) -> None:
+        super().__init__(max_size, self._build)
+        self.iterative = iterative
+
+    def _build(self, source: str) -> CompiledProgram:
+        parser = Parser(iterative=self.iterative)
+        node = parser.parse(source)
+        assert isinstance(node, ProgramNode)
+        return PythonCompiler(parser.symbols).compile(node)
+
+    def get(self, source: str) -> CompiledProgram:
+        return self._get(source)
+
+    def run(self, source: str) -> dict[str, int]:
+        return self._get(source).run()
+
+
+class ExpressionEvaluator(_LruCache[CompiledExpression]):
+    """Calculator style evaluation of `Parser(expression_mode=True)` sources.
+
+    The parsed and compiled form of the `max_size` most recently used sources is kept, so repeated
+    expressions skip lexing, parsing and compiling.
+    """
+    def __init__(self, max_size: int = 1024) -> None:
+        super().__init__(max_size, self._build)
+
+    def _build(self, source: str) -> CompiledExpression:
+        # NOTE: A parser per miss, a shared one would keep every identifier of every rejected source
+        parser = Parser(test_mode=True, expression_mode=True)
+        node = parser.parse(source)
+        if not isinstance(node, ExpressionNode):
+            raise ParserError(f"Expected an expression, got {source!r}")
+        return PythonCompiler(parser.symbols).compile_expression(node)
+
+    def compile(self, source: str) -> CompiledExpression:
+        return self._get(source)
+
+    def evaluate(self, source: str) -> int:
+        return self._get(source).function()
+
+    def evaluate_many(self, sources: Iterable[str]) -> list[int]:
+        get = self._get
+        return [get(source).function() for source in sources]
@@ -0,0 +1,81 @@
+from bisect import insort
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+DEAD = -1
+
+
+@dataclass(slots=True, eq=False)
+class LiveInterval:
+    """One version of a variable: defined at the end of statement `start`, last read by statement `end`.
+
+    `end` is DEAD for versions that are never read.
+    """
+    symbol: int
+    start: int
+    end: int = -1
+    register: Optional[str] = None
+    slot: int = -1 # NOTE: Stack slot of spilled intervals
+
+    @property
+    def is_dead(self) -> bool:
+        return self.end == DEAD
+
+
+@dataclass
+class LinearScanAllocator:
+    """Linear scan register allocation (Poletto & Sarkar) over live intervals sorted by start.
+
+    At most `len(registers) - reserved` intervals hold a register at any point, the reserved ones
+    are left for evaluating expressions. Under pressure the interval ending last is spilled.
+    Registers are handed out in the order given.
+    """
+    registers: list[str]
+    reserved: int = 2
+    spill_count: int = 0
+    slot_count: int = 0
+    _active: list[LiveInterval] = field(default_factory=list, repr=False)
+
+    def allocate(self, intervals: list[LiveInterval]) -> None:
+        self.spill_count = 0
+        self.slot_count = 0
+        self._active = []
+        limit = len(self.registers) - self.reserved
+        rank = {register: index for index, register in enumerate(self.registers)}
+        free = list(self.registers)
+
+        for interval in intervals:
+            if interval.is_dead:
+                continue
+
+            # NOTE: An interval last read by statement `start` frees its register for the one defined there
+            while self._active and self._active[0].end <= interval.start:
+                expired = self._active.pop(0).register
+                assert expired is not None
+                free.append(expired)
+
+            if len(self._active) < limit:
+                register = min(free, key=rank.__getitem__)
+                free.remove(register)
+                interval.register = register
+                insort(self._active, interval, key=_end)
+                continue
+
+            candidate = self._active[-1] if self._active else None
+            if candidate is not None and candidate.end > interval.end:
+                interval.register, candidate.register = candidate.register, None
+                self._spill(candidate)
+                self._active.pop()
+                insort(self._active, interval, key=_end)
+            else:
+                self._spill(interval)
+
+    def _spill(self, interval: LiveInterval) -> None:
+        interval.slot = self.slot_count
+        self.slot_count += 1
+        self.spill_count += 1
+
+
+def _end(interval: LiveInterval) -> int:
+    return interval.end
@@ -0,0 +1,97 @@
+import os
+import sys
+from types import TracebackType
+from typing import Callable, Optional, Protocol, TextIO, Union
+
+
+class Sink(Protocol):
+    """Destination of the lines emitted by a backend. Lines are given without their newline."""
+    def write(self, line: str) -> None:
+        pass
+
+    def flush(self) -> None:
+        pass
+
+
+class StdoutSink:
+    """Buffers lines and writes them to stdout in chunks of `chunk_lines`, and on flush."""
+    def __init__(self, chunk_lines: int = 1 << 14) -> None:
+        self.chunk_lines = chunk_lines
+        self.lines: list[str] = []
+
+    def write(self, line: str) -> None:
+        self.lines.append(line)
+        # NOTE: Bounds the buffer, streaming backends flush only once at the end
+        if len(self.lines) >= self.chunk_lines:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.lines:
+            # NOTE: Looked up on every flush, so redirections of sys.stdout are honoured
+            sys.stdout.write("\n".join(self.lines) + "\n")
+            self.lines.clear()
+
+
+class BufferSink:
+    """Keeps every line in memory."""
+    def __init__(self) -> None:
+        self.lines: list[str] = []
+
+    def write(self, line: str) -> None:
+        self.lines.append(line)
+
+    def flush(self) -> None:
+        pass
+
+    def getvalue(self) -> str:
+        return "".join(f"{line}\n" for line in self.lines)
+
+
+class FileSink:
+    """Writes lines to a file in large chunks. Opens (and owns) the file when given a path."""
+    def __init__(self, file: Union[str, os.PathLike[str], TextIO], chunk_lines: int = 1 << 14) -> None:
+        if isinstance(file, (str, os.PathLike)):
+            self.file: TextIO = open(file, "w", encoding="utf-8", buffering=1 << 20)
+            self._owned = True
+        else:
+            self.file = file
+            self._owned = False
+        self.chunk_lines = chunk_lines
+        self.lines: list[str] = []
+
+    def write(self, line: str) -> None:
+        self.lines.append(line)
+        if len(self.lines) >= self.chunk_lines:
+            self._write_lines()
+
+    def _write_lines(self) -> None:
+        if self.lines:
+            self.file.write("\n".join(self.lines) + "\n")
+            self.lines.clear()
+
+    def flush(self) -> None:
+        self._write_lines()
+        self.file.flush()
+
+    def close(self) -> None:
+        self.flush()
+        if self._owned:
+            self.file.close()
+
+    def __enter__(self) -> "FileSink":
+        return self
+
+    def __exit__(self, exc_type: Optional[type[BaseException]], exc: Optional[BaseException], traceback: Optional[TracebackType]) -> None:
+        self.close()
+
+
+class CallbackSink:
+    """Hands every line to `callback` as soon as it is emitted."""
+    def __init__(self, callback: Callable[[str], None]) -> None:
+        self.callback = callback
+
+    def write(self, line: str) -> None:
+        self.callback(line)
+
+    def flush(self) -> None:
+        pass
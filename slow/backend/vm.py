@@ -0,0 +1,63 @@
+from typing import Sequence
+
+from slow.ast.binary import truncating_div
+from .bytecode import Bytecode, Opcode
+
+
+# NOTE: Plain ints are much cheaper to compare than IntEnum members inside the dispatch loop
+_CONST = int(Opcode.CONST)
+_LOAD = int(Opcode.LOAD)
+_STORE = int(Opcode.STORE)
+_ADD = int(Opcode.ADD)
+_SUB = int(Opcode.SUB)
+_MUL = int(Opcode.MUL)
+_DIV = int(Opcode.DIV)
+
+
+class VirtualMachine:
+    def execute(self, bytecode: Bytecode) -> list[int]:
+        return self.execute_code(bytecode.code, bytecode.constants, len(bytecode.slots))
+
+    def execute_code(self, code: Sequence[int], constants: Sequence[int], slot_count: int) -> list[int]:
+        """Runs code held in any integer sequence, e.g. memoryviews of a loaded image."""
+        slots = [0] * slot_count
+        stack: list[int] = []
+        push = stack.append
+        pop = stack.pop
+
+        pc = 0
+        end = len(code)
+        while pc < end:
+            opcode = code[pc]
+            if opcode == _LOAD:
+                push(slots[code[pc + 1]])
+                pc += 2
+            elif opcode == _CONST:
+                push(constants[code[pc + 1]])
+                pc += 2
+            elif opcode == _ADD:
+                rhs = pop()
+                stack[-1] += rhs
+                pc += 1
+            elif opcode == _SUB:
+                rhs = pop()
+                stack[-1] -= rhs
+                pc += 1
+            elif opcode == _MUL:
+                rhs = pop()
+                stack[-1] *= rhs
+                pc += 1
+            elif opcode == _STORE:
+                slots[code[pc + 1]] = pop()
+                pc += 2
+            elif opcode == _DIV:
+                rhs = pop()
+                stack[-1] = truncating_div(stack[-1], rhs)
+                pc += 1
+            else:
+                raise ValueError(f"Unknown opcode {opcode} at {pc}")
+
+        return slots
+
+    def run(self, bytecode: Bytecode) -> dict[str, int]:
+        return dict(zip(bytecode.slots, self.execute(bytecode)))
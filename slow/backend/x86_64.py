@@ -0,0 +1,350 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from slow.node import Node, ExpressionNode
+from slow.symbols import SymbolTable
+from slow.ast.assign import AssignNode
+from slow.ast.binary import BinaryNode, BinaryOperator
+from slow.ast.literal import LiteralIntegerNode
+from slow.ast.identifier import IdentifierNode
+from slow.ast.let import LetAssignmentNode, LetDeclarationNode
+from slow.ast.program import ProgramNode
+from .asm import AsmLine, Instruction, Operand, format_asm, is_register
+from .peephole import PeepholeOptimizer
+from .register_allocation import LinearScanAllocator, LiveInterval
+
+
+# NOTE: rax/rdx are clobbered by idiv and r11 holds immediates that cannot be encoded inline,
+# none of them is ever allocated. Caller saved registers come first so small programs save nothing.
+ALLOCATABLE_REGISTERS = ["rcx", "rsi", "rdi", "r8", "r9", "r10", "rbx", "r12", "r13", "r14", "r15"]
+CALLEE_SAVED_REGISTERS = frozenset(("rbx", "r12", "r13", "r14", "r15"))
+SCRATCH_REGISTER = "r11"
+
+_INT32_MIN = -(2 ** 31)
+_INT32_MAX = 2 ** 31 - 1
+
+_INSTRUCTIONS = {
+    BinaryOperator.ADD: "add",
+    BinaryOperator.SUB: "sub",
+    BinaryOperator.MUL: "imul",
+}
+
+
+def to_int64(value: int) -> int:
+    # NOTE: Registers are 64 bits wide, larger literals wrap around like they would at runtime
+    value &= 2 ** 64 - 1
+    return value - 2 ** 64 if value >= 2 ** 63 else value
+
+
+def _is_leaf(node: Node) -> bool:
+    return isinstance(node, (LiteralIntegerNode, IdentifierNode))
+
+
+@dataclass(slots=True)
+class _Statement:
+    target: LiveInterval
+    expression: Optional[ExpressionNode] # NOTE: None for `let x;`, which defines 0
+    reads: dict[int, LiveInterval] # NOTE: Version of every identifier read, by symbol
+
+
+class X86Codegen:
+    """Register allocating x86-64 code generator (GNU as, Intel syntax).
+
+    Variables versions live in registers assigned by linear scan across statements and are only
+    spilled to stack slots under pressure. Expressions are evaluated in Sethi-Ullman order with
+    the registers left free at each statement, using immediates for literals.
+
+    The program is emitted as `void <function_name>(int64_t *results)`, storing the final value
+    of every variable in `results`, in the order of `slots`.
+    """
+    def __init__(self, symbols: Optional[SymbolTable] = None, function_name: str = "slow_program", registers: Optional[list[str]] = None, optimizer: Optional[PeepholeOptimizer] = None) -> None:
+        self.symbols = symbols if symbols is not None else SymbolTable(by_name=True)
+        self.function_name = function_name
+        self.registers = registers if registers is not None else ALLOCATABLE_REGISTERS
+        self.allocator = LinearScanAllocator(self.registers)
+        self.slots: list[str] = []
+        self.optimizer = optimizer
+        self._lines: list[AsmLine] = []
+        self._used_registers: set[str] = set()
+        self._temporary_slots = 0
+        self._variable_slots = 0
+
+    def generate(self, program: ProgramNode) -> list[str]:
+        self._lines = []
+        self._used_registers = set()
+        self._temporary_slots = 0
+
+        statements, intervals, results = self._live_intervals(program)
+        self.allocator.allocate(intervals)
+        self._variable_slots = self.allocator.slot_count
+
+        live: set[LiveInterval] = set()
+        for index, statement in enumerate(statements):
+            live = {interval for interval in live if interval.end >= index}
+            self._statement(statement, live)
+            if not statement.target.is_dead:
+                live.add(statement.target)
+
+        body, self._lines = self._lines, []
+        self._prologue()
+        self._lines.extend(body)
+        self._epilogue(results)
+        return format_asm(self.instructions())
+
+    def instructions(self) -> list[AsmLine]:
+        """The listing of the last `generate`, after the optimizer (if any) ran over it."""
+        return self.optimizer.optimize(self._lines) if self.optimizer is not None else self._lines
+
+    def _live_intervals(self, program: ProgramNode) -> tuple[list[_Statement], list[LiveInterval], list[LiveInterval]]:
+        statements: list[_Statement] = []
+        intervals: list[LiveInterval] = []
+        # NOTE: Current version of every variable, indexed by symbol id
+        current: list[Optional[LiveInterval]] = []
+        slot_of: dict[int, int] = {}
+        self.slots = []
+
+        for index, statement in enumerate(program.statements):
+            match statement:
+                case LetDeclarationNode():
+                    identifier, expression = statement.identifier, None
+                case LetAssignmentNode() | AssignNode():
+                    identifier, expression = statement.identifier, statement.expression
+                case _:
+                    raise ValueError(f"Statement {statement!r} is not supported")
+
+            reads: dict[int, LiveInterval] = {}
+            for read in _identifiers(expression):
+                symbol = self.symbols.resolve(read)
+                version = current[symbol] if symbol < len(current) else None
+                assert version is not None # At this stage, all identifiers should be declared (parser responsibility)
+                reads[symbol] = version
+
+            symbol = self.symbols.resolve(identifier)
+            if symbol >= len(current):
+                current.extend([None] * (symbol + 1 - len(current)))
+            if current[symbol] is None:
+                slot_of[symbol] = len(self.slots)
+                self.slots.append(identifier.name)
+            target = current[symbol] = LiveInterval(symbol, index)
+            intervals.append(target)
+            statements.append(_Statement(target, expression, reads))
+
+        # NOTE: The last version of every variable is a result, it lives until the epilogue
+        results = sorted((interval for interval in current if interval is not None), key=lambda interval: slot_of[interval.symbol])
+        for interval in results:
+            interval.end = len(statements)
+
+        # NOTE: Backwards, so versions only read by dead statements are dead as well
+        for index in range(len(statements) - 1, -1, -1):
+            if statements[index].target.is_dead:
+                continue
+            for version in statements[index].reads.values():
+                if version.is_dead:
+                    version.end = index
+        return statements, intervals, results
+
+    def _location(self, interval: LiveInterval) -> str:
+        if interval.register is not None:
+            return interval.register
+        return self._stack(1 + interval.slot)
+
+    def _stack(self, slot: int) -> str:
+        # NOTE: [rbp-8] holds the results pointer, variable slots follow, then temporaries
+        return f"QWORD PTR [rbp-{8 * (slot + 1)}]"
+
+    def _emit(self, mnemonic: str, *operands: Operand) -> None:
+        self._lines.append(Instruction(mnemonic, operands))
+
+    def _register(self, register: str) -> str:
+        self._used_registers.add(register)
+        return register
+
+    def _operand(self, node: Node, reads: dict[int, LiveInterval]) -> Operand:
+        match node:
+            case LiteralIntegerNode():
+                return to_int64(node.value)
+            case IdentifierNode():
+                return self._location(reads[self.symbols.resolve(node)])
+            case _:
+                raise ValueError(f"Node {node!r} is not a leaf")
+
+    def _move(self, destination: str, source: Operand) -> None:
+        if destination == source:
+            return
+        if isinstance(source, int) and not _INT32_MIN <= source <= _INT32_MAX:
+            if not is_register(destination):
+                self._emit("movabs", SCRATCH_REGISTER, source)
+                self._emit("mov", destination, SCRATCH_REGISTER)
+            else:
+                self._emit("movabs", destination, source)
+        elif not is_register(destination) and not is_register(source) and not isinstance(source, int):
+            # NOTE: No memory to memory moves on x86
+            self._emit("mov", SCRATCH_REGISTER, source)
+            self._emit("mov", destination, SCRATCH_REGISTER)
+        else:
+            self._emit("mov", destination, source)
+
+    def _statement(self, statement: _Statement, live: set[LiveInterval]) -> None:
+        target = statement.target
+        if target.is_dead:
+            # NOTE: Versions that are never read have no observable effect
+            return
+
+        destination = self._location(target)
+        if target.register is not None:
+            self._register(target.register)
+
+        expression = statement.expression
+        if expression is None:
+            self._move(destination, 0)
+            return
+        if _is_leaf(expression):
+            self._move(destination, self._operand(expression, statement.reads))
+            return
+
+        busy = {interval.register for interval in live if interval.register is not None}
+        temporaries = [register for register in self.registers if register not in busy]
+        # NOTE: Evaluate straight into the target register when nothing live still needs it
+        if target.register in temporaries:
+            temporaries.remove(target.register)
+            temporaries.insert(0, target.register)
+
+        self._expression(expression, temporaries, statement.reads)
+        self._move(destination, temporaries[0])
+
+    def _expression(self, root: ExpressionNode, registers: list[str], reads: dict[int, LiveInterval]) -> None:
+        """Evaluates `root` into `registers[0]`, in Sethi-Ullman order, with an explicit work stack."""
+        needs = _register_needs(root)
+        temporary_base = self._variable_slots + 1
+        spilled = 0
+
+        # NOTE: ("eval", node, registers) evaluates a node, ("apply", op, dst, src) combines two values,
+        # ("store", slot, register) spills an intermediate value
+        pending: list[tuple[str, object, object, object]] = [("eval", root, registers, None)]
+        while pending:
+            task, first, second, third = pending.pop()
+            if task == "apply":
+                assert isinstance(first, BinaryOperator) and isinstance(second, str) and isinstance(third, (str, int))
+                self._apply(first, second, third)
+                continue
+            if task == "store":
+                assert isinstance(first, str) and isinstance(second, str)
+                self._emit("mov", first, second)
+                continue
+
+            node, available = first, second
+            assert isinstance(available, list)
+            destination = self._register(available[0])
+            if not isinstance(node, BinaryNode):
+                assert isinstance(node, Node)
+                self._move(destination, self._operand(node, reads))
+                continue
+
+            lhs, rhs = node.lhs, node.rhs
+            # NOTE: Tasks run in reverse order of the pushes
+            if _is_leaf(rhs):
+                pending.append(("apply", node.op, destination, self._operand(rhs, reads)))
+                pending.append(("eval", lhs, available, None))
+            elif len(available) == 1 or min(needs[id(lhs)], needs[id(rhs)]) >= len(available):
+                slot = self._stack(temporary_base + spilled)
+                spilled += 1
+                self._temporary_slots = max(self._temporary_slots, spilled)
+                pending.append(("apply", node.op, destination, slot))
+                pending.append(("eval", lhs, available, None))
+                pending.append(("store", slot, destination, None))
+                pending.append(("eval", rhs, available, None))
+            elif needs[id(lhs)] >= needs[id(rhs)]:
+                pending.append(("apply", node.op, destination, available[1]))
+                pending.append(("eval", rhs, available[1:], None))
+                pending.append(("eval", lhs, available, None))
+            else:
+                pending.append(("apply", node.op, destination, available[1]))
+                pending.append(("eval", lhs, [available[0], *available[2:]], None))
+                pending.append(("eval", rhs, [available[1], available[0], *available[2:]], None))
+
+    def _apply(self, op: BinaryOperator, destination: str, source: Operand) -> None:
+        if isinstance(source, int) and (op == BinaryOperator.DIV or not _INT32_MIN <= source <= _INT32_MAX):
+            # NOTE: idiv has no immediate form
+            self._move(SCRATCH_REGISTER, source)
+            source = SCRATCH_REGISTER
+
+        match op:
+            case BinaryOperator.DIV:
+                self._emit("mov", "rax", destination)
+                self._emit("cqo")
+                self._emit("idiv", source)
+                self._emit("mov", destination, "rax")
+            case BinaryOperator.MUL if isinstance(source, int):
+                self._emit("imul", destination, destination, source)
+            case _:
+                self._emit(_INSTRUCTIONS[op], destination, source)
+
+    def _frame_size(self) -> int:
+        saved = len(self._used_registers & CALLEE_SAVED_REGISTERS)
+        size = 8 * (1 + self._variable_slots + self._temporary_slots + saved)
+        return (size + 15) // 16 * 16
+
+    def _saved_registers(self) -> list[tuple[str, str]]:
+        saved = sorted(self._used_registers & CALLEE_SAVED_REGISTERS)
+        base = 1 + self._variable_slots + self._temporary_slots
+        return [(register, self._stack(base + index)) for index, register in enumerate(saved)]
+
+    def _prologue(self) -> None:
+        self._lines.extend([
+            "    .intel_syntax noprefix",
+            "    .text",
+            f"    .globl {self.function_name}",
+            f"    .type {self.function_name}, @function",
+            f"{self.function_name}:",
+        ])
+        self._emit("push", "rbp")
+        self._emit("mov", "rbp", "rsp")
+        self._emit("sub", "rsp", self._frame_size())
+        self._emit("mov", self._stack(0), "rdi")
+        for register, slot in self._saved_registers():
+            self._emit("mov", slot, register)
+
+    def _epilogue(self, results: list[LiveInterval]) -> None:
+        self._emit("mov", "rax", self._stack(0))
+        for index, interval in enumerate(results):
+            location = self._location(interval)
+            if not is_register(location):
+                self._emit("mov", "rdx", location)
+                location = "rdx"
+            self._emit("mov", f"QWORD PTR [rax+{8 * index}]", location)
+        for register, slot in self._saved_registers():
+            self._emit("mov", register, slot)
+        self._emit("leave")
+        self._emit("ret")
+        self._lines.append(f"    .size {self.function_name}, .-{self.function_name}")
+        self._lines.append('    .section .note.GNU-stack,"",@progbits')
+
+
+def _identifiers(expression: Optional[Node]) -> list[IdentifierNode]:
+    identifiers: list[IdentifierNode] = []
+    pending = [expression] if expression is not None else []
+    while pending:
+        node = pending.pop()
+        if isinstance(node, IdentifierNode):
+            identifiers.append(node)
+        else:
+            pending.extend(node.children())
+    return identifiers
+
+
+def _register_needs(root: Node) -> dict[int, int]:
+    """Sethi-Ullman numbers keyed by node id: registers needed to evaluate a subtree without spilling."""
+    needs: dict[int, int] = {}
+    pending: list[tuple[Node, bool]] = [(root, False)]
+    while pending:
+        node, expanded = pending.pop()
+        if not isinstance(node, BinaryNode):
+            needs[id(node)] = 1
+        elif not expanded:
+            pending.extend(((node, True), (node.rhs, False), (node.lhs, False)))
+        else:
+            lhs = needs[id(node.lhs)]
+            # NOTE: Leaves on the right are used as immediate or memory operands directly
+            rhs = 0 if _is_leaf(node.rhs) else needs[id(node.rhs)]
+            needs[id(node)] = max(lhs, rhs) if lhs != rhs else lhs + 1
+    return needs
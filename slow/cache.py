@@ -0,0 +1,218 @@
+import functools
+import hashlib
+import os
+import pickle
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from slow.symbols import SymbolTable
+from slow.ast.flat import FlatAst
+from slow.ast.program import ProgramNode
+from slow.frontend.parser import Parser
+from slow.ir.program import IRProgram
+from slow.backend.ir_visitor import IRVisitor
+from slow.backend.peephole import PeepholeOptimizer
+from slow.backend.x86_64 import X86Codegen
+
+
+# NOTE: Eviction trims the directory down to this fraction of `max_bytes`, so that a full cache
+# does not rescan its directory on every store
+_LOW_WATER_MARK = 0.9
+
+_PACKAGE_DIRECTORY = Path(__file__).parent
+
+
+@functools.cache
+def compiler_version() -> str:
+    """Digest of every source file of the package.
+
+    Any change to the compiler changes it, including changes to the layouts of the pickled
+    classes (FlatAst, IRProgram), so entries of other builds are never served.
+    """
+    digest = hashlib.sha256()
+    for path in sorted(_PACKAGE_DIRECTORY.rglob("*.py")):
+        digest.update(path.relative_to(_PACKAGE_DIRECTORY).as_posix().encode() + b"\0")
+        digest.update(path.read_bytes() + b"\0")
+    return digest.hexdigest()
+
+
+@dataclass(slots=True)
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __str__(self) -> str:
+        return f"{self.hits} hits, {self.misses} misses ({self.hit_rate:.1%}), {self.stores} stores, {self.evictions} evictions"
+
+
+class CompileCache:
+    """Content addressed on-disk cache of front end and back end artifacts.
+
+    Entries are keyed by the SHA-256 of the compiler version (by default a digest of the package's
+    sources, see `compiler_version`), the artifact kind and the source, and
+    stored as `<directory>/<key[:2]>/<key>`. Files are written to a temporary name and renamed, so
+    concurrent processes only ever see complete entries. Reading an entry refreshes its mtime and,
+    once the directory grows past `max_bytes`, the entries least recently used are deleted.
+
+    Entries are pickles: only point it to directories that are as trusted as the code itself.
+    Entries that cannot be loaded (truncated, or from an incompatible build) count as misses and
+    are deleted.
+    """
+    def __init__(self, directory: Union[str, os.PathLike[str]], max_bytes: int = 256 * 1024 * 1024, version: Optional[str] = None) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.version = version if version is not None else compiler_version()
+        self.stats = CacheStats()
+        # NOTE: Estimate, other processes write to the same directory. Recomputed before evicting.
+        self._size = self.size()
+
+    def key(self, source: str, artifact: str) -> str:
+        digest = hashlib.sha256()
+        digest.update(f"{self.version}\0{artifact}\0".encode())
+        digest.update(source.encode())
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / key
+
+    def load(self, source: str, artifact: str) -> Optional[bytes]:
+        path = self._path(self.key(source, artifact))
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+        except FileNotFoundError: # NOTE: Never stored, or evicted by another process meanwhile
+            self.stats.misses += 1
+            return None
+
+        self.stats.hits += 1
+        return data
+
+    def store(self, source: str, artifact: str, data: bytes) -> None:
+        path = self._path(self.key(source, artifact))
+        path.parent.mkdir(exist_ok=True)
+
+        descriptor, temporary = tempfile.mkstemp(dir=path.parent, prefix=".", suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                file.write(data)
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+        self.stats.stores += 1
+        self._size += len(data)
+        if self._size > self.max_bytes:
+            self.evict(int(self.max_bytes * _LOW_WATER_MARK))
+
+    def _discard(self, source: str, artifact: str) -> None:
+        """Turns the hit of an entry that could not be loaded into a miss, and deletes the entry."""
+        self.stats.hits -= 1
+        self.stats.misses += 1
+        try:
+            os.unlink(self._path(self.key(source, artifact)))
+        except FileNotFoundError:
+            pass
+
+    def _unpickle(self, source: str, artifact: str, expected: type) -> Any:
+        """The entry's object when it loads and is an instance of `expected`, None otherwise."""
+        data = self.load(source, artifact)
+        if data is None:
+            return None
+        try:
+            entry = pickle.loads(data)
+        # NOTE: Truncated or foreign pickles raise about anything (UnpicklingError, EOFError, AttributeError...)
+        except Exception: # pylint: disable=broad-exception-caught
+            entry = None
+
+        if not isinstance(entry, expected):
+            self._discard(source, artifact)
+            return None
+        return entry
+
+    def _entries(self) -> list[tuple[str, os.stat_result]]:
+        entries: list[tuple[str, os.stat_result]] = []
+        for bucket in os.scandir(self.directory):
+            if not bucket.is_dir():
+                continue
+            for entry in os.scandir(bucket.path):
+                # NOTE: Skips temporary files of writes in progress
+                if entry.name.startswith("."):
+                    continue
+                try:
+                    entries.append((entry.path, entry.stat()))
+                except FileNotFoundError:
+                    continue
+        return entries
+
+    def size(self) -> int:
+        return sum(stat.st_size for _, stat in self._entries())
+
+    def evict(self, target_bytes: int) -> None:
+        """Deletes the least recently used entries until at most `target_bytes` remain."""
+        entries = sorted(self._entries(), key=lambda entry: entry[1].st_mtime_ns)
+        size = sum(stat.st_size for _, stat in entries)
+        for path, stat in entries:
+            if size <= target_bytes:
+                break
+            try:
+                os.unlink(path)
+                self.stats.evictions += 1
+            except FileNotFoundError:
+                pass
+            size -= stat.st_size
+        self._size = size
+
+    def clear(self) -> None:
+        self.evict(0)
+
+    def parse(self, source: str) -> tuple[ProgramNode, SymbolTable]:
+        """The parsed program and its symbols, the parser only runs on a miss."""
+        entry = self._unpickle(source, "ast", tuple)
+        if entry is not None:
+            ast, names = entry
+            program = ast.to_node()
+            assert isinstance(program, ProgramNode)
+            return program, SymbolTable(names)
+
+        parser = Parser(test_mode=True)
+        program = parser.parse(source)
+        assert isinstance(program, ProgramNode)
+        # NOTE: Flat arrays pickle without recursing into deep trees
+        self.store(source, "ast", pickle.dumps((FlatAst.from_node(program), parser.symbols.names)))
+        return program, parser.symbols
+
+    def ir(self, source: str) -> IRProgram:
+        entry = self._unpickle(source, "ir", IRProgram)
+        if entry is not None:
+            program: IRProgram = entry
+            return program
+
+        node, symbols = self.parse(source)
+        program = IRVisitor(symbols).build(node)
+        self.store(source, "ir", pickle.dumps(program))
+        return program
+
+    def asm(self, source: str) -> list[str]:
+        """x86-64 listing of X86Codegen with the peephole optimizer, as NativeBuilder emits it."""
+        data = self.load(source, "asm")
+        if data is not None:
+            try:
+                return data.decode().split("\n")
+            except UnicodeDecodeError:
+                self._discard(source, "asm")
+
+        node, symbols = self.parse(source)
+        lines = X86Codegen(symbols, optimizer=PeepholeOptimizer()).generate(node)
+        self.store(source, "asm", "\n".join(lines).encode())
+        return lines
@@ -1,2 +1,3 @@
 from .lexer import Lexer
 from .parser import Parser
+from .one_pass import OnePassCompiler
@@ -0,0 +1,67 @@
+from typing import Iterator
+from dataclasses import dataclass, field
+
+from slow.symbols import NO_SYMBOL, SymbolTable
+from .lexeme import Token, TokenKind
+from .patterns import TOKEN_PATTERN, FIXED_KINDS, NEWLINE_GROUP, INTEGER_GROUP, IDENTIFIER_GROUP, SYMBOL_GROUP
+
+
+def _scan(source: str, symbols: SymbolTable) -> Iterator[Token]:
+    # NOTE: Enum member lookups are comparatively slow, resolve the ones the loop needs once
+    id_kind = TokenKind.ID
+    integer_kind = TokenKind.INTEGER
+    error_kind = TokenKind.ERROR
+    fixed_kinds = FIXED_KINDS
+    intern = symbols.intern
+    no_symbol = NO_SYMBOL
+    line = 1
+
+    for match in TOKEN_PATTERN.finditer(source):
+        group = match.lastindex
+        if group == SYMBOL_GROUP:
+            start, end = match.span()
+            yield Token(fixed_kinds[match.group()], None, line, slice(start, end), no_symbol)
+        elif group == IDENTIFIER_GROUP:
+            text = match.group()
+            start, end = match.span()
+            kind = fixed_kinds.get(text)
+            if kind is None:
+                yield Token(id_kind, text, line, slice(start, end), intern(text))
+            else:
+                yield Token(kind, None, line, slice(start, end), no_symbol)
+        elif group == INTEGER_GROUP:
+            start, end = match.span()
+            yield Token(integer_kind, int(match.group()), line, slice(start, end), no_symbol)
+        elif group == NEWLINE_GROUP:
+            line += 1
+        elif group is not None:
+            start, end = match.span()
+            yield Token(error_kind, f"Unexpected character: {match.group()}", line, slice(start, end), no_symbol)
+
+    eof = Token(TokenKind.EOF, None, line, slice(len(source), len(source)))
+    while True:
+        yield eof
+
+
+@dataclass(slots=True)
+class FastLexer:
+    """Drop-in replacement for `Lexer` that scans with one compiled pattern and a keyword table."""
+    source: str
+    symbols: SymbolTable = field(default_factory=SymbolTable)
+    _tokens: Iterator[Token] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._tokens = _scan(self.source, self.symbols)
+
+    def next(self) -> Token:
+        return next(self._tokens)
+
+    def tokenize(self) -> Iterator[Token]:
+        """Yields every remaining token, EOF included."""
+        for token in self._tokens:
+            yield token
+            if token.kind is TokenKind.EOF:
+                return
+
+    def lexeme_at_token(self, token: Token) -> str:
+        return self.source[token.span]
@@ -1,8 +1,9 @@
 from enum import Enum, auto
-from typing import Union
-from dataclasses import dataclass
+from typing import Protocol, Union
+from dataclasses import dataclass, field
 
 from slow.ast.binary import BinaryOperator
+from slow.symbols import NO_SYMBOL
 
 class TokenKind(Enum):
     # Special
@@ -39,6 +40,8 @@ class Token:
     value: TokenValue
     line: int
     span: slice
+    # NOTE: Only set for identifiers. Derived from the name, so it takes no part in comparisons
+    symbol: int = field(default=NO_SYMBOL, compare=False)
 
     def to_binary_operator(self) -> BinaryOperator:
         match self.kind:
@@ -52,3 +55,11 @@ class Token:
                 return BinaryOperator.DIV
             case _:
                 raise ValueError(f"Token {self} is not a binary operator")
+
+
+class TokenSource(Protocol):
+    def next(self) -> Token:
+        pass
+
+    def lexeme_at_token(self, token: Token) -> str:
+        pass
@@ -2,6 +2,7 @@ from typing import ClassVar
 from dataclasses import dataclass, field
 from string import ascii_letters
 
+from slow.symbols import NO_SYMBOL, SymbolTable
 from .lexeme import Token, TokenKind, TokenValue
 
 
@@ -11,6 +12,7 @@ class Lexer:
     start: int = 0
     current: int = 0
     line: int = 1
+    symbols: SymbolTable = field(default_factory=SymbolTable)
     _head_identifier_chars: ClassVar[set[str]] = field(init=False, default=set(ascii_letters) | {"_"})
     _tail_identifier_chars: ClassVar[set[str]] = field(init=False, default=set(ascii_letters) | set("0123456789") | {"_"})
 
@@ -98,14 +100,14 @@ class Lexer:
                             self._advance()
                     else:
                         self._regress()
-                        return
+                        break
                 case _:
                     break
 
         self._rebase()
 
-    def _make_token(self, kind: TokenKind, value: TokenValue = None) -> Token:
-        return Token(kind, value, self.line, slice(self.start, self.current))
+    def _make_token(self, kind: TokenKind, value: TokenValue = None, symbol: int = NO_SYMBOL) -> Token:
+        return Token(kind, value, self.line, slice(self.start, self.current), symbol)
 
     def _make_error(self, msg: str) -> Token:
         # TODO: Improve reporting (file:line:column lex error: msg)
@@ -130,7 +132,7 @@ class Lexer:
             case "let":
                 return self._make_token(TokenKind.LET)
             case _:
-                return self._make_token(TokenKind.ID, value)
+                return self._make_token(TokenKind.ID, value, self.symbols.intern(value))
 
     def _identifier(self) -> Token:
         while not self._is_at_end() and self._peek() in self._tail_identifier_chars:
@@ -0,0 +1,251 @@
+from dataclasses import dataclass, field
+from typing import NoReturn, Optional
+
+from slow._exceptions import ParserError, LexerError
+from slow.symbols import NO_SYMBOL, SymbolTable
+from slow.ir.program import IROpcode, IRProgram
+from .lexeme import Token, TokenKind, TokenSource
+from .lexer import Lexer
+from .parser import PRECEDENCES, Precedence, SuspendedRule
+
+
+# NOTE: Same binding powers as the Parser, so both accept the same language
+_PRECEDENCES: dict[TokenKind, int] = {kind: precedence.value for kind, precedence in PRECEDENCES.items()}
+_ASSIGNMENT = Precedence.ASSIGNMENT.value
+
+_OPCODES: dict[TokenKind, int] = {
+    TokenKind.ADD: IROpcode.ADD.value,
+    TokenKind.SUB: IROpcode.SUB.value,
+    TokenKind.MUL: IROpcode.MUL.value,
+    TokenKind.DIV: IROpcode.DIV.value,
+}
+
+
+class _Abort(Exception):
+    """Unwinds the compiler after a reported error, there is no tree to return None through."""
+
+
+@dataclass
+class OnePassCompiler:
+    """Compiles source straight to an IRProgram while parsing it, without building a tree.
+
+    The Pratt parser's rules emit IR as they complete instead of returning nodes: literals and
+    reads number their values, operators emit (or reuse, as IRVisitor's CSE does) their instruction
+    and statements emit the COPY into a new SSA version. Values are numbered in the order IRVisitor
+    numbers them when walking the parsed tree, so both produce identical programs.
+
+    Expressions are parsed with an explicit stack (like `Parser(iterative=True)`), any nesting depth
+    compiles.
+    """
+    test_mode: bool = False
+    symbols: SymbolTable = field(default_factory=SymbolTable)
+
+    ir: IRProgram = field(init=False, default_factory=IRProgram)
+    # NOTE: Current SSA version of every identifier, indexed by symbol id
+    identifier_counter: list[int] = field(init=False, default_factory=list)
+    binary_temporary_cache: dict[tuple[int, int, int], int] = field(init=False, default_factory=dict)
+
+    # NOTE: Indexed by symbol id, non-zero once the identifier is declared
+    _declared: bytearray = field(init=False, default_factory=bytearray)
+    _lexer: TokenSource = field(init=False, repr=False)
+    _current: Token = field(init=False, repr=False)
+    _previous: Token = field(init=False, repr=False)
+    _had_error: bool = field(init=False, default=False)
+
+    def compile(self, source: str) -> Optional[IRProgram]:
+        return self.compile_tokens(Lexer(source, symbols=self.symbols))
+
+    def compile_tokens(self, tokens: TokenSource) -> Optional[IRProgram]:
+        """The program of every statement, or None once an error has been reported."""
+        self.ir = IRProgram()
+        self.identifier_counter = []
+        self.binary_temporary_cache = {}
+        self._declared = bytearray()
+        self._lexer = tokens
+        self._current = Token(TokenKind.EOF, None, 0, slice(0, 0))
+        self._had_error = False
+
+        try:
+            self._advance()
+            while self._current.kind != TokenKind.EOF:
+                self._statement()
+        except _Abort:
+            return None
+
+        return None if self._had_error else self.ir
+
+    def _advance(self) -> None:
+        self._previous = self._current
+
+        while True:
+            self._current = self._lexer.next()
+
+            if self._current.kind != TokenKind.ERROR:
+                break
+
+            if self.test_mode:
+                raise LexerError(str(self._current.value))
+            # NOTE: Like the Parser, only the first error is reported but lexing goes on
+            if not self._had_error:
+                print(f"Lexer error: {self._current.value}")
+            self._had_error = True
+
+    def _error(self, message: str) -> NoReturn:
+        if self.test_mode:
+            raise ParserError(message)
+
+        if not self._had_error:
+            print(f"Parser error: {message}")
+        self._had_error = True
+        raise _Abort()
+
+    def _expect(self, kind: TokenKind, message: str) -> None:
+        if self._current.kind != kind:
+            self._error(f"{message} Got '{self._lexer.lexeme_at_token(self._current)}'")
+        self._advance()
+
+    def _symbol(self, token: Token) -> int:
+        assert isinstance(token.value, str)
+
+        symbol = token.symbol if token.symbol != NO_SYMBOL else self.symbols.intern(token.value)
+        if symbol >= len(self.identifier_counter):
+            self.identifier_counter.extend([0] * (symbol + 1 - len(self.identifier_counter)))
+        return symbol
+
+    def _is_declared(self, symbol: int) -> bool:
+        return symbol < len(self._declared) and self._declared[symbol] != 0
+
+    def _name(self, symbol: int, token: Token) -> None:
+        # NOTE: The program keeps the names it uses, as IRVisitor does
+        names = self.ir.names
+        if symbol >= len(names):
+            names.extend([""] * (symbol + 1 - len(names)))
+        assert isinstance(token.value, str)
+        names[symbol] = token.value
+
+    def _statement(self) -> None:
+        kind = self._current.kind
+        if kind == TokenKind.LET:
+            self._advance()
+            self._let()
+        elif kind == TokenKind.ID:
+            self._advance()
+            self._assign()
+        else:
+            self._error(f"Expected statement. Got '{self._lexer.lexeme_at_token(self._current)}'")
+
+        self._expect(TokenKind.SEMICOLON, "Expected ';' after statement.")
+
+    def _let(self) -> None:
+        self._expect(TokenKind.ID, "Expected identifier.")
+
+        # NOTE: Declared only after the expression, which cannot read the new identifier
+        token = self._previous
+        match self._current.kind:
+            case TokenKind.SEMICOLON:
+                self._declare(token)
+            case TokenKind.ASSIGN:
+                value = self._expression()
+                self._define(self._declare(token), token, value)
+            case _:
+                self._error(f"Expected ';' or '=' after identifier in 'let' statement. Got '{self._lexer.lexeme_at_token(self._current)}'")
+
+    def _declare(self, token: Token) -> int:
+        symbol = self._symbol(token)
+        if self._is_declared(symbol):
+            self._error(f"Identifier '{token.value}' already declared")
+
+        if symbol >= len(self._declared):
+            self._declared.extend(bytes(symbol + 1 - len(self._declared)))
+        self._declared[symbol] = 1
+        return symbol
+
+    def _assign(self) -> None:
+        token = self._previous
+        symbol = self._symbol(token)
+        if not self._is_declared(symbol):
+            self._error(f"Undefined identifier '{token.value}'")
+
+        self._expect(TokenKind.ASSIGN, "Expected '=' after identifier.")
+        self._define(symbol, token, self._expression())
+
+    def _define(self, symbol: int, token: Token, value: int) -> None:
+        self._name(symbol, token)
+        self.identifier_counter[symbol] += 1
+        self.ir.emit(IROpcode.COPY, self.ir.variable(symbol, self.identifier_counter[symbol]), value)
+
+    def _expression(self) -> int:
+        return self._parse_precedence(_ASSIGNMENT)
+
+    def _parse_precedence(self, precedence: int) -> int:
+        # NOTE: Same grammar as the recursive Parser. Grouping, `=` and the rhs of a binary operator
+        # push a frame instead of recursing, which is resumed once the value it waits for is emitted.
+        frames: list[tuple[SuspendedRule, int, int, int]] = []
+
+        while True:
+            self._advance()
+
+            token = self._previous
+            match token.kind:
+                case TokenKind.INTEGER:
+                    assert isinstance(token.value, int)
+                    value = self.ir.constant(token.value)
+                case TokenKind.ID:
+                    value = self._read(token)
+                case TokenKind.TRUE:
+                    value = self.ir.constant(1)
+                case TokenKind.FALSE:
+                    value = self.ir.constant(0)
+                case TokenKind.LPAREN:
+                    frames.append((SuspendedRule.GROUPING, precedence, 0, 0))
+                    precedence = _ASSIGNMENT
+                    continue
+                case TokenKind.ASSIGN:
+                    frames.append((SuspendedRule.EXPRESSION, precedence, 0, 0))
+                    precedence = _ASSIGNMENT
+                    continue
+                case _:
+                    self._error(f"Expected expression. Got '{self._lexer.lexeme_at_token(token)}'")
+
+            while True:
+                if precedence <= _PRECEDENCES[self._current.kind]:
+                    self._advance()
+
+                    operator = self._previous
+                    opcode = _OPCODES.get(operator.kind)
+                    if opcode is None:
+                        self._error(f"Expected binary operator. Got '{self._lexer.lexeme_at_token(operator)}'")
+
+                    # NOTE: The rhs binds at the operator's own precedence, as in the Parser
+                    frames.append((SuspendedRule.BINARY, precedence, value, opcode))
+                    precedence = _PRECEDENCES[operator.kind]
+                    break
+
+                if not frames:
+                    return value
+
+                suspended, precedence, lhs, opcode = frames.pop()
+                match suspended:
+                    case SuspendedRule.BINARY:
+                        value = self._binary(opcode, lhs, value)
+                    case SuspendedRule.GROUPING:
+                        self._expect(TokenKind.RPAREN, "Expected ')' after expression.")
+                    case SuspendedRule.EXPRESSION:
+                        pass
+
+    def _read(self, token: Token) -> int:
+        symbol = self._symbol(token)
+        if not self._is_declared(symbol):
+            self._error(f"Undefined identifier '{token.value}'")
+
+        self._name(symbol, token)
+        assert self.identifier_counter[symbol] > 0 # Declared without a value, as IRVisitor assumes
+        return self.ir.variable(symbol, self.identifier_counter[symbol])
+
+    def _binary(self, opcode: int, lhs: int, rhs: int) -> int:
+        key = (opcode, lhs, rhs)
+        target = self.binary_temporary_cache.get(key)
+        if target is None:
+            target = self.binary_temporary_cache[key] = self.ir.temporary()
+            self.ir.emit(opcode, target, lhs, rhs)
+        return target
@@ -1,18 +1,19 @@
 from __future__ import annotations
 
-from typing import Optional, Callable, ClassVar, Dict
+from typing import Optional, Callable, ClassVar, Dict, Iterator
 from dataclasses import dataclass, field
 from enum import Enum, auto
 
 from slow._exceptions import ParserError, LexerError
+from slow.symbols import NO_SYMBOL, SymbolTable
 from slow.node import Node, StatementNode, ExpressionNode
-from slow.ast.literal import LiteralIntegerNode
-from slow.ast.binary import BinaryNode
 from slow.ast.identifier import IdentifierNode
 from slow.ast.let import LetDeclarationNode, LetAssignmentNode
 from slow.ast.program import ProgramNode
-from .lexeme import Token, TokenKind
+from slow.ast.factory import NodeFactory
+from .lexeme import Token, TokenKind, TokenSource
 from .lexer import Lexer
+from .token_buffer import TokenBuffer
 
 class Precedence(Enum):
     NO_PRECEDENCE   = auto() # ;
@@ -41,14 +42,26 @@ class StatementParseRule:
     rule: Callable[[Parser], Optional[StatementNode]]
 
 
+class SuspendedRule(Enum):
+    BINARY      = auto() # lhs and operator wait for the rhs
+    GROUPING    = auto() # '(' waits for the expression and ')'
+    EXPRESSION  = auto() # '=' waits for the expression
+
+
 @dataclass
 class Parser:
     test_mode: bool = False
     expression_mode: bool = False
+    # NOTE: Parse expressions with an explicit stack instead of recursion (see _parse_precedence_iterative)
+    iterative: bool = False
+
+    node_factory: NodeFactory = field(default_factory=NodeFactory)
+    symbols: SymbolTable = field(default_factory=SymbolTable)
 
-    _identifier_table: set[IdentifierNode] = field(default_factory=set)
+    # NOTE: Indexed by symbol id, non-zero once the identifier is declared
+    _declared: bytearray = field(default_factory=bytearray)
 
-    _lexer: Lexer = field(init=False, repr=False)
+    _lexer: TokenSource = field(init=False, repr=False)
     _current: Optional[Token] = field(init=False, default=None)
     _previous: Optional[Token] = field(init=False, default=None)
     _had_error: bool = field(init=False, default=False)
@@ -57,33 +70,15 @@ class Parser:
     _expression_rule_table: ClassVar[Dict[TokenKind, ExpressionParseRule]]
     _statement_rule_table: ClassVar[Dict[TokenKind, StatementParseRule]]
 
-# pylint: disable=C0301
-    def __post_init__(self) -> None:
-        Parser._expression_rule_table = {
-            TokenKind.EOF       : ExpressionParseRule(              None,           None, Precedence.NO_PRECEDENCE),
-            TokenKind.ERROR     : ExpressionParseRule(              None,           None, Precedence.NO_PRECEDENCE),
-            TokenKind.ID        : ExpressionParseRule(        Parser._id,           None, Precedence.NO_PRECEDENCE),
-            TokenKind.SEMICOLON : ExpressionParseRule(              None,           None, Precedence.NO_PRECEDENCE),
-            TokenKind.ASSIGN    : ExpressionParseRule(Parser._expression,           None, Precedence.ASSIGNMENT    ),
-            TokenKind.LPAREN    : ExpressionParseRule(  Parser._grouping,           None, Precedence.NO_PRECEDENCE),
-            TokenKind.RPAREN    : ExpressionParseRule(              None,           None, Precedence.NO_PRECEDENCE),
-            TokenKind.INTEGER   : ExpressionParseRule(   Parser._integer,           None, Precedence.NO_PRECEDENCE),
-            TokenKind.TRUE      : ExpressionParseRule(      Parser._true,           None, Precedence.NO_PRECEDENCE),
-            TokenKind.FALSE     : ExpressionParseRule(     Parser._false,           None, Precedence.NO_PRECEDENCE),
-            TokenKind.ADD       : ExpressionParseRule(              None, Parser._binary, Precedence.TERM         ),
-            TokenKind.SUB       : ExpressionParseRule(              None, Parser._binary, Precedence.TERM         ),
-            TokenKind.MUL       : ExpressionParseRule(              None, Parser._binary, Precedence.FACTOR       ),
-            TokenKind.DIV       : ExpressionParseRule(              None, Parser._binary, Precedence.FACTOR       ),
-        }
-
-        Parser._statement_rule_table = {
-            TokenKind.LET       : StatementParseRule(Parser._let),
-            TokenKind.ID        : StatementParseRule(Parser._assign),
-        }
-# pylint: enable=C0301
-
     def parse(self, source: str) -> Optional[Node]:
-        self._reset(source)
+        return self.parse_tokens(Lexer(source, symbols=self.symbols))
+
+    def parse_buffer(self, buffer: TokenBuffer) -> Optional[Node]:
+        return self.parse_tokens(buffer.cursor(self.symbols))
+
+    def parse_tokens(self, tokens: TokenSource) -> Optional[Node]:
+        """Parses tokens whose identifiers were interned in `self.symbols` (or carry no symbol at all)."""
+        self._reset(tokens)
 
         self._advance()
 
@@ -91,8 +86,26 @@ class Parser:
             return self._expression()
         return self._program()
 
-    def _reset(self, source: str) -> None:
-        self._lexer = Lexer(source)
+    def parse_statements(self, tokens: TokenSource) -> Iterator[StatementNode]:
+        """Yields every statement as soon as it is parsed, so that a backend can lower it and drop it.
+
+        Only the symbol table and the declarations persist across statements. Outside of test mode
+        the generator stops at the first statement in error, the ones yielded before stay valid.
+        """
+        if self.expression_mode:
+            raise ValueError("Statements cannot be streamed in expression mode")
+        self._reset(tokens)
+
+        self._advance()
+
+        while not self._match(TokenKind.EOF):
+            statement = self._statement()
+            if statement is None:
+                return
+            yield statement
+
+    def _reset(self, tokens: TokenSource) -> None:
+        self._lexer = tokens
         self._current = None
         self._previous = None
         self._had_error = False
@@ -148,28 +161,38 @@ class Parser:
     def _true(self) -> Optional[ExpressionNode]:
         assert self._previous is not None
 
-        return LiteralIntegerNode(1, self._previous.line)
+        return self.node_factory.literal_integer(1, self._previous.line)
 
     def _false(self) -> Optional[ExpressionNode]:
         assert self._previous is not None
 
-        return LiteralIntegerNode(0, self._previous.line)
+        return self.node_factory.literal_integer(0, self._previous.line)
 
     def _integer(self) -> Optional[ExpressionNode]:
         assert self._previous is not None
         assert isinstance(self._previous.value, int)
 
-        return LiteralIntegerNode(self._previous.value, self._previous.line)
+        return self.node_factory.literal_integer(self._previous.value, self._previous.line)
+
+    def _symbol(self, token: Token) -> int:
+        assert isinstance(token.value, str)
+
+        if token.symbol != NO_SYMBOL:
+            return token.symbol
+        return self.symbols.intern(token.value)
+
+    def _is_declared(self, symbol: int) -> bool:
+        return symbol < len(self._declared) and self._declared[symbol] != 0
 
     def _id(self) -> Optional[ExpressionNode]:
         assert self._previous is not None
         assert isinstance(self._previous.value, str)
 
-        node = IdentifierNode(self._previous.value)
-        if node in self._identifier_table:
-            return node
+        symbol = self._symbol(self._previous)
+        if self._is_declared(symbol):
+            return self.node_factory.identifier(self._previous.value, symbol)
 
-        self._parser_error(f"Undefined identifier '{node}'")
+        self._parser_error(f"Undefined identifier '{self._previous.value}'")
         return None
 
     def _grouping(self) -> Optional[ExpressionNode]:
@@ -191,11 +214,14 @@ class Parser:
 
         if not self._panic_mode:
             assert rhs is not None
-            return BinaryNode(lhs, rhs, tok_op.to_binary_operator())
+            return self.node_factory.binary(lhs, rhs, tok_op.to_binary_operator())
 
         return None
 
     def _parse_precedence(self, precedence: Precedence) -> Optional[ExpressionNode]:
+        if self.iterative:
+            return self._parse_precedence_iterative(precedence)
+
         self._advance()
 
         assert self._previous is not None
@@ -226,19 +252,80 @@ class Parser:
 
         return lhs
 
+    def _parse_precedence_iterative(self, precedence: Precedence) -> Optional[ExpressionNode]:
+        # NOTE: Same grammar and trees as _parse_precedence. The prefix rules that would recurse
+        # (_grouping, _expression) and the infix rule (_binary) push a frame instead, which is
+        # resumed once the expression they wait for is complete. Any error aborts the whole
+        # expression, which is what the recursive version ends up returning as well.
+        frames: list[tuple[SuspendedRule, Precedence, Optional[Node], Optional[Token]]] = []
+
+        while True:
+            self._advance()
+
+            assert self._previous is not None
+            prefix_rule = Parser._expression_rule_table[self._previous.kind].prefix
+
+            if prefix_rule is None:
+                self._parser_error(f"Expected expression. Got '{self._lexer.lexeme_at_token(self._previous)}'")
+                return None
+            if prefix_rule is Parser._grouping:
+                frames.append((SuspendedRule.GROUPING, precedence, None, None))
+                precedence = Precedence.ASSIGNMENT
+                continue
+            if prefix_rule is Parser._expression:
+                frames.append((SuspendedRule.EXPRESSION, precedence, None, None))
+                precedence = Precedence.ASSIGNMENT
+                continue
+
+            if (lhs := prefix_rule(self)) is None:
+                return None
+
+            while True:
+                assert self._current is not None
+                rule = Parser._expression_rule_table[self._current.kind]
+                if precedence.value <= rule.precedence.value:
+                    self._advance()
+
+                    if rule.infix is None:
+                        self._parser_error(f"Expected binary operator. Got '{self._lexer.lexeme_at_token(self._previous)}'")
+                        return None
+
+                    assert rule.infix is Parser._binary
+                    frames.append((SuspendedRule.BINARY, precedence, lhs, self._previous))
+                    precedence = rule.precedence
+                    break
+
+                if not frames:
+                    return lhs
+
+                suspended, precedence, pending_lhs, tok_op = frames.pop()
+                match suspended:
+                    case SuspendedRule.BINARY:
+                        assert pending_lhs is not None and tok_op is not None
+                        lhs = self.node_factory.binary(pending_lhs, lhs, tok_op.to_binary_operator())
+                    case SuspendedRule.GROUPING:
+                        if not self._match(TokenKind.RPAREN):
+                            assert self._current is not None
+                            self._parser_error(f"Expected ')' after expression. Got '{self._lexer.lexeme_at_token(self._current)}'")
+                            return None
+                    case SuspendedRule.EXPRESSION:
+                        pass
+
     def _expression(self) -> Optional[ExpressionNode]:
         return self._parse_precedence(Precedence.ASSIGNMENT)
 
     def _create_identifier(self, token: Token) -> Optional[IdentifierNode]:
         assert isinstance(token.value, str)
 
-        node = IdentifierNode(token.value)
-        if node in self._identifier_table:
-            self._parser_error(f"Identifier '{node}' already declared")
+        symbol = self._symbol(token)
+        if self._is_declared(symbol):
+            self._parser_error(f"Identifier '{token.value}' already declared")
             return None
 
-        self._identifier_table.add(node)
-        return node
+        if symbol >= len(self._declared):
+            self._declared.extend(bytes(symbol + 1 - len(self._declared)))
+        self._declared[symbol] = 1
+        return self.node_factory.identifier(token.value, symbol)
 
     def _let(self) -> Optional[StatementNode]:
         assert self._previous is not None
@@ -323,3 +410,32 @@ class Parser:
             statements.append(statement)
 
         return ProgramNode(statements)
+
+
+# NOTE: Built once at import time, not per Parser instance
+# pylint: disable=C0301
+Parser._expression_rule_table = {
+    TokenKind.EOF       : ExpressionParseRule(              None,           None, Precedence.NO_PRECEDENCE),
+    TokenKind.ERROR     : ExpressionParseRule(              None,           None, Precedence.NO_PRECEDENCE),
+    TokenKind.ID        : ExpressionParseRule(        Parser._id,           None, Precedence.NO_PRECEDENCE),
+    TokenKind.SEMICOLON : ExpressionParseRule(              None,           None, Precedence.NO_PRECEDENCE),
+    TokenKind.ASSIGN    : ExpressionParseRule(Parser._expression,           None, Precedence.ASSIGNMENT    ),
+    TokenKind.LPAREN    : ExpressionParseRule(  Parser._grouping,           None, Precedence.NO_PRECEDENCE),
+    TokenKind.RPAREN    : ExpressionParseRule(              None,           None, Precedence.NO_PRECEDENCE),
+    TokenKind.INTEGER   : ExpressionParseRule(   Parser._integer,           None, Precedence.NO_PRECEDENCE),
+    TokenKind.TRUE      : ExpressionParseRule(      Parser._true,           None, Precedence.NO_PRECEDENCE),
+    TokenKind.FALSE     : ExpressionParseRule(     Parser._false,           None, Precedence.NO_PRECEDENCE),
+    TokenKind.ADD       : ExpressionParseRule(              None, Parser._binary, Precedence.TERM         ),
+    TokenKind.SUB       : ExpressionParseRule(              None, Parser._binary, Precedence.TERM         ),
+    TokenKind.MUL       : ExpressionParseRule(              None, Parser._binary, Precedence.FACTOR       ),
+    TokenKind.DIV       : ExpressionParseRule(              None, Parser._binary, Precedence.FACTOR       ),
+}
+
+Parser._statement_rule_table = {
+    TokenKind.LET       : StatementParseRule(Parser._let),
+    TokenKind.ID        : StatementParseRule(Parser._assign),
+}
+# pylint: enable=C0301
+
+# NOTE: Binding power of every token, for front ends that share the Parser's grammar
+PRECEDENCES: dict[TokenKind, Precedence] = {kind: rule.precedence for kind, rule in Parser._expression_rule_table.items()}
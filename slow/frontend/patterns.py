@@ -0,0 +1,37 @@
+import re
+
+from .lexeme import TokenKind
+
+
+# NOTE: Whitespace is skipped by the regex search itself. Comments match without a
+# group, so `lastindex` alone tells the token class apart without string compares.
+_TOKEN_GRAMMAR = r"""
+    (\n)
+  | //[^\n]*
+  | (\d+)
+  | ([A-Za-z_][A-Za-z0-9_]*)
+  | ([;=()+\-*/])
+  | ({utf8_sequence}[^ \t\r])
+"""
+TOKEN_PATTERN = re.compile(_TOKEN_GRAMMAR.format(utf8_sequence=""), re.VERBOSE)
+# NOTE: Same grammar over UTF-8 bytes (where \d is ASCII only), an unexpected character is its whole encoded sequence
+BYTES_TOKEN_PATTERN = re.compile(_TOKEN_GRAMMAR.format(utf8_sequence=r"[\xc0-\xff][\x80-\xbf]*|").encode(), re.VERBOSE)
+NEWLINE_GROUP = 1
+INTEGER_GROUP = 2
+IDENTIFIER_GROUP = 3
+SYMBOL_GROUP = 4
+
+# NOTE: Symbols and keywords share a single lookup table keyed by their text
+FIXED_KINDS: dict[str, TokenKind] = {
+    ";": TokenKind.SEMICOLON,
+    "=": TokenKind.ASSIGN,
+    "(": TokenKind.LPAREN,
+    ")": TokenKind.RPAREN,
+    "+": TokenKind.ADD,
+    "-": TokenKind.SUB,
+    "*": TokenKind.MUL,
+    "/": TokenKind.DIV,
+    "true": TokenKind.TRUE,
+    "false": TokenKind.FALSE,
+    "let": TokenKind.LET,
+}
@@ -0,0 +1,111 @@
+import os
+from dataclasses import dataclass, field
+from mmap import mmap, ACCESS_READ
+from typing import Iterator, Optional, Union
+
+from slow.symbols import NO_SYMBOL, SymbolTable
+from .lexeme import Token, TokenKind, TokenValue
+from .patterns import BYTES_TOKEN_PATTERN, FIXED_KINDS, NEWLINE_GROUP, INTEGER_GROUP, IDENTIFIER_GROUP, SYMBOL_GROUP
+
+
+Buffer = Union[bytes, bytearray, memoryview, mmap]
+
+# NOTE: Derived from FIXED_KINDS: symbols are keyed by their byte, keywords by their encoded text
+_SYMBOL_KINDS: dict[int, TokenKind] = {ord(text): kind for text, kind in FIXED_KINDS.items() if not text.isidentifier()}
+_KEYWORD_KINDS: dict[bytes, TokenKind] = {text.encode(): kind for text, kind in FIXED_KINDS.items() if text.isidentifier()}
+_KEYWORD_LENGTH = max(len(keyword) for keyword in _KEYWORD_KINDS)
+
+
+@dataclass(slots=True, frozen=True)
+class BufferToken:
+    """A token whose span points into the lexed buffer. Its text is only decoded when asked for."""
+    kind: TokenKind
+    line: int
+    start: int
+    end: int
+    buffer: Buffer = field(repr=False, compare=False)
+
+    @property
+    def text(self) -> str:
+        return bytes(self.buffer[self.start : self.end]).decode("utf-8", errors="replace")
+
+    @property
+    def value(self) -> TokenValue:
+        match self.kind:
+            case TokenKind.INTEGER:
+                return int(self.text)
+            case TokenKind.ID:
+                return self.text
+            case TokenKind.ERROR:
+                return f"Unexpected character: {self.text}"
+            case _:
+                return None
+
+    def to_token(self, symbols: Optional[SymbolTable] = None) -> Token:
+        """Materialises the token. Identifiers are interned in `symbols` when one is given."""
+        value = self.value
+        if symbols is not None and isinstance(value, str) and self.kind == TokenKind.ID:
+            return Token(self.kind, value, self.line, slice(self.start, self.end), symbols.intern(value))
+        return Token(self.kind, value, self.line, slice(self.start, self.end), NO_SYMBOL)
+
+
+def stream_tokens(buffer: Buffer) -> Iterator[BufferToken]:
+    """Lazily lexes a bytes-like buffer (or mmap) without decoding or copying it. Ends with an EOF token."""
+    line = 1
+
+    for match in BYTES_TOKEN_PATTERN.finditer(buffer):
+        group = match.lastindex
+        if group == SYMBOL_GROUP:
+            start, end = match.span()
+            yield BufferToken(_SYMBOL_KINDS[buffer[start]], line, start, end, buffer)
+        elif group == IDENTIFIER_GROUP:
+            start, end = match.span()
+            kind = _KEYWORD_KINDS.get(match.group(), TokenKind.ID) if end - start <= _KEYWORD_LENGTH else TokenKind.ID
+            yield BufferToken(kind, line, start, end, buffer)
+        elif group == INTEGER_GROUP:
+            start, end = match.span()
+            yield BufferToken(TokenKind.INTEGER, line, start, end, buffer)
+        elif group == NEWLINE_GROUP:
+            line += 1
+        elif group is not None:
+            start, end = match.span()
+            yield BufferToken(TokenKind.ERROR, line, start, end, buffer)
+
+    end = len(buffer)
+    yield BufferToken(TokenKind.EOF, line, end, end, buffer)
+
+
+class StreamSource:
+    """TokenSource over streamed tokens, for the parser to read a buffer without lexing it up front."""
+    def __init__(self, tokens: Iterator[BufferToken], symbols: SymbolTable) -> None:
+        self._tokens = tokens
+        self._symbols = symbols
+        self._buffer: Buffer = b""
+        self._eof: Optional[Token] = None
+
+    def next(self) -> Token:
+        # NOTE: Stay on the trailing EOF token once reached
+        if self._eof is not None:
+            return self._eof
+
+        token = next(self._tokens)
+        self._buffer = token.buffer
+        materialised = token.to_token(self._symbols)
+        if token.kind == TokenKind.EOF:
+            self._eof = materialised
+        return materialised
+
+    def lexeme_at_token(self, token: Token) -> str:
+        return bytes(self._buffer[token.span]).decode("utf-8", errors="replace")
+
+
+def stream_file(path: Union[str, os.PathLike[str]]) -> Iterator[BufferToken]:
+    """Lazily lexes a file through a read-only memory map, so it is never read into memory as a whole."""
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            buffer: Buffer = b""
+        else:
+            # NOTE: The map outlives the file object, tokens keep it alive for as long as they need it
+            buffer = mmap(file.fileno(), 0, access=ACCESS_READ)
+
+    return stream_tokens(buffer)
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+from slow.symbols import NO_SYMBOL, SymbolTable
+from .lexeme import Token, TokenKind, TokenValue
+from .patterns import TOKEN_PATTERN, FIXED_KINDS, NEWLINE_GROUP, INTEGER_GROUP, IDENTIFIER_GROUP, SYMBOL_GROUP
+
+
+_NO_VALUE = -1
+_KIND_BY_CODE: dict[int, TokenKind] = {kind.value: kind for kind in TokenKind}
+_FIXED_CODES: dict[str, int] = {text: kind.value for text, kind in FIXED_KINDS.items()}
+_ID_CODE = TokenKind.ID.value
+
+
+@dataclass(slots=True)
+class TokenBuffer:
+    """Struct of arrays holding every token of a source: one column per token field.
+
+    For identifiers the value column holds the symbol id (names live in `symbols`). Other
+    values (integers and error messages) are interned in `value_table` and referenced by
+    index, -1 meaning no value.
+    """
+    source: str
+    kinds: array[int] = field(default_factory=lambda: array("B"))
+    starts: array[int] = field(default_factory=lambda: array("I"))
+    ends: array[int] = field(default_factory=lambda: array("I"))
+    lines: array[int] = field(default_factory=lambda: array("I"))
+    values: array[int] = field(default_factory=lambda: array("i"))
+    value_table: list[TokenValue] = field(default_factory=list)
+    symbols: SymbolTable = field(default_factory=SymbolTable)
+    _value_index: dict[TokenValue, int] = field(init=False, default_factory=dict, repr=False)
+
+    @staticmethod
+    def from_source(source: str) -> TokenBuffer:
+        buffer = TokenBuffer(source)
+        append = buffer._append
+        intern = buffer._intern
+        intern_symbol = buffer.symbols.intern
+        id_code = TokenKind.ID.value
+        integer_code = TokenKind.INTEGER.value
+        error_code = TokenKind.ERROR.value
+        line = 1
+
+        # NOTE: Mirrors FastLexer, only writing columns instead of building Tokens
+        for match in TOKEN_PATTERN.finditer(source):
+            group = match.lastindex
+            if group == SYMBOL_GROUP:
+                start, end = match.span()
+                append(_FIXED_CODES[match.group()], start, end, line, _NO_VALUE)
+            elif group == IDENTIFIER_GROUP:
+                text = match.group()
+                start, end = match.span()
+                code = _FIXED_CODES.get(text)
+                if code is None:
+                    append(id_code, start, end, line, intern_symbol(text))
+                else:
+                    append(code, start, end, line, _NO_VALUE)
+            elif group == INTEGER_GROUP:
+                start, end = match.span()
+                append(integer_code, start, end, line, intern(int(match.group())))
+            elif group == NEWLINE_GROUP:
+                line += 1
+            elif group is not None:
+                start, end = match.span()
+                append(error_code, start, end, line, intern(f"Unexpected character: {match.group()}"))
+
+        append(TokenKind.EOF.value, len(source), len(source), line, _NO_VALUE)
+        return buffer
+
+    @staticmethod
+    def from_tokens(source: str, tokens: Iterable[Token]) -> TokenBuffer:
+        buffer = TokenBuffer(source)
+        for token in tokens:
+            if token.kind == TokenKind.ID:
+                assert isinstance(token.value, str)
+                value = buffer.symbols.intern(token.value)
+            else:
+                value = _NO_VALUE if token.value is None else buffer._intern(token.value)
+            buffer._append(token.kind.value, token.span.start, token.span.stop, token.line, value)
+            if token.kind == TokenKind.EOF:
+                break
+
+        return buffer
+
+    def _append(self, kind: int, start: int, end: int, line: int, value: int) -> None:
+        self.kinds.append(kind)
+        self.starts.append(start)
+        self.ends.append(end)
+        self.lines.append(line)
+        self.values.append(value)
+
+    def _intern(self, value: TokenValue) -> int:
+        index = self._value_index.get(value)
+        if index is None:
+            index = self._value_index[value] = len(self.value_table)
+            self.value_table.append(value)
+        return index
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def kind(self, index: int) -> TokenKind:
+        return _KIND_BY_CODE[self.kinds[index]]
+
+    def value(self, index: int) -> TokenValue:
+        value = self.values[index]
+        if self.kinds[index] == _ID_CODE:
+            return self.symbols.names[value]
+        return None if value == _NO_VALUE else self.value_table[value]
+
+    def symbol(self, index: int) -> int:
+        return self.values[index] if self.kinds[index] == _ID_CODE else NO_SYMBOL
+
+    def token(self, index: int) -> Token:
+        return Token(self.kind(index), self.value(index), self.lines[index], slice(self.starts[index], self.ends[index]), self.symbol(index))
+
+    def cursor(self, symbols: Optional[SymbolTable] = None) -> TokenCursor:
+        """Cursor over the tokens. Given a symbol table, identifiers get their ids from it instead."""
+        if symbols is None or symbols is self.symbols:
+            return TokenCursor(self, list(range(len(self.symbols))))
+
+        # NOTE: Remapping costs one lookup per distinct name, not one per identifier token
+        return TokenCursor(self, [symbols.intern(name) for name in self.symbols.names])
+
+
+@dataclass(slots=True)
+class TokenCursor:
+    """Reads a TokenBuffer front to back through the same interface as `Lexer`.
+
+    Every token read is materialised as a Token: a buffer saves lexing the source again, not the
+    parser's per-token allocations.
+    """
+    buffer: TokenBuffer
+    symbol_map: list[int]
+    index: int = 0
+
+    def next(self) -> Token:
+        buffer = self.buffer
+        index = self.index
+        # NOTE: Stay on the trailing EOF token once reached
+        if index < len(buffer.kinds) - 1:
+            self.index = index + 1
+
+        code = buffer.kinds[index]
+        value = buffer.values[index]
+        if code == _ID_CODE:
+            return Token(TokenKind.ID, buffer.symbols.names[value], buffer.lines[index], slice(buffer.starts[index], buffer.ends[index]), self.symbol_map[value])
+
+        return Token(
+            _KIND_BY_CODE[code],
+            None if value == _NO_VALUE else buffer.value_table[value],
+            buffer.lines[index],
+            slice(buffer.starts[index], buffer.ends[index]),
+        )
+
+    def lexeme_at_token(self, token: Token) -> str:
+        return self.buffer.source[token.span]
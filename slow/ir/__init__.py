@@ -0,0 +1,4 @@
+from .program import IROpcode, IRProgram, IRValueKind, NO_VALUE
+from .printer import format_instructions, format_program, format_value
+from .evaluate import evaluate
+from .optimizer import IROptimizer, IRPass, PassStats, ValueNumbering, CopyPropagation, DeadCodeElimination
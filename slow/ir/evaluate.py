@@ -0,0 +1,23 @@
+from slow.ast.binary import BinaryOperator
+from .program import IROpcode, IRProgram, IRValueKind
+
+
+_OPERATORS: dict[int, BinaryOperator] = {opcode: opcode.to_binary_operator() for opcode in IROpcode if opcode != IROpcode.COPY}
+
+
+def evaluate(program: IRProgram) -> dict[str, int]:
+    """Runs the program and returns the last value of every variable, like AstInterpreter.run."""
+    values: list[int] = [0] * program.value_count
+    for value in range(program.value_count):
+        if program.value_kinds[value] == IRValueKind.CONSTANT:
+            values[value] = program.constant_value(value)
+
+    opcodes, targets, lhs, rhs = program.opcodes, program.targets, program.lhs, program.rhs
+    for index in range(len(program)):
+        opcode = opcodes[index]
+        if opcode == IROpcode.COPY:
+            values[targets[index]] = values[lhs[index]]
+        else:
+            values[targets[index]] = _OPERATORS[opcode].apply(values[lhs[index]], values[rhs[index]])
+
+    return {program.names[program.value_operands[value]]: values[value] for value in program.live_out()}
@@ -0,0 +1,163 @@
+from dataclasses import dataclass, field
+from typing import Protocol
+
+from .program import IROpcode, IRProgram, IRValueKind, NO_VALUE
+
+
+_COPY = int(IROpcode.COPY)
+_DIV = int(IROpcode.DIV)
+_COMMUTATIVE = frozenset((int(IROpcode.ADD), int(IROpcode.MUL)))
+
+
+class IRPass(Protocol):
+    name: str
+
+    def run(self, program: IRProgram) -> IRProgram:
+        pass
+
+
+class ValueNumbering:
+    """Global value numbering: instructions computing an already numbered expression are dropped
+    and their uses rewritten. Operands of ADD and MUL are ordered, so `a + b` and `b + a` match."""
+    name = "value-numbering"
+
+    def __init__(self) -> None:
+        self.eliminated_count = 0
+
+    def run(self, program: IRProgram) -> IRProgram:
+        self.eliminated_count = 0
+        result = program.with_values()
+        canonical = list(range(program.value_count))
+        expressions: dict[tuple[int, int, int], int] = {}
+
+        opcodes, targets, lhs, rhs = program.opcodes, program.targets, program.lhs, program.rhs
+        for index in range(len(program)):
+            opcode, target = opcodes[index], targets[index]
+            operand = canonical[lhs[index]]
+            if opcode == _COPY:
+                result.emit(opcode, target, operand)
+                continue
+
+            other = canonical[rhs[index]]
+            key = (opcode, other, operand) if opcode in _COMMUTATIVE and other < operand else (opcode, operand, other)
+            if (existing := expressions.get(key)) is not None:
+                canonical[target] = existing
+                self.eliminated_count += 1
+                continue
+
+            expressions[key] = target
+            result.emit(opcode, target, operand, other)
+
+        return result
+
+    @property
+    def changed_count(self) -> int:
+        return self.eliminated_count
+
+
+class CopyPropagation:
+    """Rewrites every use of a copy's target to the copied value. The copies themselves are kept,
+    the ones left unused are removed by DeadCodeElimination."""
+    name = "copy-propagation"
+
+    def __init__(self) -> None:
+        self.propagated_count = 0
+
+    def run(self, program: IRProgram) -> IRProgram:
+        self.propagated_count = 0
+        result = program.with_values()
+        canonical = list(range(program.value_count))
+
+        opcodes, targets, lhs, rhs = program.opcodes, program.targets, program.lhs, program.rhs
+        for index in range(len(program)):
+            opcode, target = opcodes[index], targets[index]
+            operand = canonical[lhs[index]]
+            if opcode == _COPY:
+                canonical[target] = operand
+                result.emit(opcode, target, operand)
+                continue
+
+            other = canonical[rhs[index]]
+            self.propagated_count += (operand != lhs[index]) + (other != rhs[index])
+            result.emit(opcode, target, operand, other)
+
+        return result
+
+    @property
+    def changed_count(self) -> int:
+        return self.propagated_count
+
+
+class DeadCodeElimination:
+    """Drops instructions whose result never reaches the last definition of a variable.
+
+    Divisions are kept unless their divisor is a non-zero constant, dropping them would hide the
+    ZeroDivisionError the program raises.
+    """
+    name = "dead-code-elimination"
+
+    def __init__(self) -> None:
+        self.removed_count = 0
+
+    def run(self, program: IRProgram) -> IRProgram:
+        live = bytearray(program.value_count)
+        for value in program.live_out():
+            live[value] = 1
+
+        # NOTE: Straight line SSA code, a single backward sweep computes liveness
+        kept: list[int] = []
+        opcodes, targets, lhs, rhs = program.opcodes, program.targets, program.lhs, program.rhs
+        for index in range(len(program) - 1, -1, -1):
+            if not live[targets[index]] and not (opcodes[index] == _DIV and _may_trap(program, rhs[index])):
+                continue
+            kept.append(index)
+            live[lhs[index]] = 1
+            if rhs[index] != NO_VALUE:
+                live[rhs[index]] = 1
+
+        result = program.with_values()
+        for index in reversed(kept):
+            result.emit(opcodes[index], targets[index], lhs[index], rhs[index])
+
+        self.removed_count = len(program) - len(result)
+        return result
+
+    @property
+    def changed_count(self) -> int:
+        return self.removed_count
+
+
+def _may_trap(program: IRProgram, divisor: int) -> bool:
+    return program.value_kinds[divisor] != IRValueKind.CONSTANT or program.constant_value(divisor) == 0
+
+
+@dataclass(slots=True)
+class PassStats:
+    name: str
+    instructions_before: int
+    instructions_after: int
+
+    def __str__(self) -> str:
+        return f"{self.name:<24} {self.instructions_before:>8} -> {self.instructions_after:>8}"
+
+
+def default_passes() -> list[IRPass]:
+    # NOTE: Propagating copies first lets value numbering see through variables (`x1 = t0; x1 + 1` and `t0 + 1`)
+    return [CopyPropagation(), ValueNumbering(), DeadCodeElimination()]
+
+
+@dataclass
+class IROptimizer:
+    passes: list[IRPass] = field(default_factory=default_passes)
+    stats: list[PassStats] = field(default_factory=list)
+
+    def optimize(self, program: IRProgram) -> IRProgram:
+        for ir_pass in self.passes:
+            before = len(program)
+            program = ir_pass.run(program)
+            self.stats.append(PassStats(ir_pass.name, before, len(program)))
+
+        return program
+
+    def report(self) -> str:
+        return "\n".join(str(stat) for stat in self.stats)
@@ -0,0 +1,42 @@
+from typing import Iterator
+
+from .program import IROpcode, IRProgram, IRValueKind
+
+
+_OPERATORS: dict[int, str] = {opcode: f" {opcode.to_binary_operator()} " for opcode in IROpcode if opcode != IROpcode.COPY}
+
+
+def format_value(program: IRProgram, value: int) -> str:
+    operand = program.value_operands[value]
+    match program.value_kinds[value]:
+        case IRValueKind.CONSTANT:
+            return f"{program.constants[operand]}"
+        case IRValueKind.VARIABLE:
+            return f"{program.names[operand]}{program.value_versions[value]}"
+        case IRValueKind.TEMPORARY:
+            return f"t{operand}"
+        case kind:
+            raise ValueError(f"Unknown value kind {kind}")
+
+
+def format_instructions(program: IRProgram, start: int = 0) -> Iterator[str]:
+    """Text of every instruction from `start` on, one line each (`t3 = x1 + t2`, `x2 = t3`)."""
+    # NOTE: Values are usually referenced several times, each one is formatted once
+    texts: dict[int, str] = {}
+
+    def text(value: int) -> str:
+        if (formatted := texts.get(value)) is None:
+            formatted = texts[value] = format_value(program, value)
+        return formatted
+
+    opcodes, targets, lhs, rhs = program.opcodes, program.targets, program.lhs, program.rhs
+    for index in range(start, len(opcodes)):
+        opcode = opcodes[index]
+        if opcode == IROpcode.COPY:
+            yield f"{text(targets[index])} = {text(lhs[index])}"
+        else:
+            yield f"{text(targets[index])} = {text(lhs[index])}{_OPERATORS[opcode]}{text(rhs[index])}"
+
+
+def format_program(program: IRProgram) -> str:
+    return "\n".join(format_instructions(program))
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass, field
+from enum import IntEnum
+
+from slow.ast.binary import BinaryOperator
+
+
+class IROpcode(IntEnum):
+    COPY = 0 # target = lhs
+    ADD  = 1 # target = lhs + rhs
+    SUB  = 2
+    MUL  = 3
+    DIV  = 4
+
+    @staticmethod
+    def from_binary_operator(op: BinaryOperator) -> IROpcode:
+        match op:
+            case BinaryOperator.ADD:
+                return IROpcode.ADD
+            case BinaryOperator.SUB:
+                return IROpcode.SUB
+            case BinaryOperator.MUL:
+                return IROpcode.MUL
+            case BinaryOperator.DIV:
+                return IROpcode.DIV
+            case _:
+                raise ValueError(f"Binary operator {op} is not supported")
+
+    def to_binary_operator(self) -> BinaryOperator:
+        match self:
+            case IROpcode.ADD:
+                return BinaryOperator.ADD
+            case IROpcode.SUB:
+                return BinaryOperator.SUB
+            case IROpcode.MUL:
+                return BinaryOperator.MUL
+            case IROpcode.DIV:
+                return BinaryOperator.DIV
+            case _:
+                raise ValueError(f"Opcode {self.name} is not a binary operator")
+
+
+class IRValueKind(IntEnum):
+    CONSTANT  = 0 # operand: index in `constants`
+    VARIABLE  = 1 # operand: symbol id, plus an SSA version
+    TEMPORARY = 2 # operand: temporary number
+
+
+NO_VALUE = -1
+
+
+@dataclass(slots=True)
+class IRProgram:
+    """Three-address code over integer value numbers, one row per instruction.
+
+    Every value (constant, variable version or temporary) is numbered once and instructions
+    only reference those numbers. COPY instructions leave `rhs` as NO_VALUE.
+    """
+    opcodes: array[int] = field(default_factory=lambda: array("B"))
+    targets: array[int] = field(default_factory=lambda: array("i"))
+    lhs: array[int] = field(default_factory=lambda: array("i"))
+    rhs: array[int] = field(default_factory=lambda: array("i"))
+    value_kinds: array[int] = field(default_factory=lambda: array("B"))
+    value_operands: array[int] = field(default_factory=lambda: array("q"))
+    value_versions: array[int] = field(default_factory=lambda: array("I"))
+    constants: list[int] = field(default_factory=list)
+    # NOTE: Name of every symbol used by the program, indexed by symbol id
+    names: list[str] = field(default_factory=list)
+    temporary_count: int = 0
+    _constant_values: dict[int, int] = field(init=False, default_factory=dict, repr=False)
+    _variable_values: dict[tuple[int, int], int] = field(init=False, default_factory=dict, repr=False)
+
+    def __len__(self) -> int:
+        return len(self.opcodes)
+
+    @property
+    def value_count(self) -> int:
+        return len(self.value_kinds)
+
+    def _add_value(self, kind: IRValueKind, operand: int, version: int = 0) -> int:
+        self.value_kinds.append(kind)
+        self.value_operands.append(operand)
+        self.value_versions.append(version)
+        return len(self.value_kinds) - 1
+
+    def constant(self, value: int) -> int:
+        number = self._constant_values.get(value)
+        if number is None:
+            self.constants.append(value)
+            number = self._constant_values[value] = self._add_value(IRValueKind.CONSTANT, len(self.constants) - 1)
+        return number
+
+    def variable(self, symbol: int, version: int) -> int:
+        number = self._variable_values.get((symbol, version))
+        if number is None:
+            number = self._variable_values[(symbol, version)] = self._add_value(IRValueKind.VARIABLE, symbol, version)
+        return number
+
+    def temporary(self) -> int:
+        self.temporary_count += 1
+        return self._add_value(IRValueKind.TEMPORARY, self.temporary_count - 1)
+
+    def emit(self, opcode: int, target: int, lhs: int, rhs: int = NO_VALUE) -> int:
+        self.opcodes.append(opcode)
+        self.targets.append(target)
+        self.lhs.append(lhs)
+        self.rhs.append(rhs)
+        return len(self.opcodes) - 1
+
+    def clear_instructions(self) -> None:
+        """Drops every instruction and keeps the values, e.g. once the instructions have been printed."""
+        del self.opcodes[:], self.targets[:], self.lhs[:], self.rhs[:]
+
+    def with_values(self) -> IRProgram:
+        """An empty program sharing nothing but a copy of this program's values, for passes to emit into."""
+        program = IRProgram(
+            value_kinds=array("B", self.value_kinds),
+            value_operands=array("q", self.value_operands),
+            value_versions=array("I", self.value_versions),
+            constants=list(self.constants),
+            names=list(self.names),
+            temporary_count=self.temporary_count,
+        )
+        program._constant_values = dict(self._constant_values)
+        program._variable_values = dict(self._variable_values)
+        return program
+
+    def live_out(self) -> list[int]:
+        """Values of the last definition of every variable, the results of the program."""
+        last: dict[int, int] = {}
+        kinds, operands, versions = self.value_kinds, self.value_operands, self.value_versions
+        for target in self.targets:
+            if kinds[target] == IRValueKind.VARIABLE:
+                symbol = operands[target]
+                if symbol not in last or versions[last[symbol]] < versions[target]:
+                    last[symbol] = target
+        return list(last.values())
+
+    def constant_value(self, value: int) -> int:
+        assert self.value_kinds[value] == IRValueKind.CONSTANT
+        return self.constants[self.value_operands[value]]
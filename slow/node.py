@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Protocol, TYPE_CHECKING
+from typing import ClassVar, Protocol, TYPE_CHECKING
 
 
 if TYPE_CHECKING:
@@ -14,6 +14,14 @@ if TYPE_CHECKING:
 
 
 class Node(ABC):
+    __slots__ = ()
+    # NOTE: Suffix of the NodeVisitor method and of the TraversalVisitor callbacks for this node
+    visit_name: ClassVar[str]
+
+    def children(self) -> tuple[Node, ...]:
+        """Nodes evaluated before this one, in evaluation order. Assignment targets are not children."""
+        return ()
+
     @abstractmethod
     def accept(self, visitor: NodeVisitor) -> None:
         pass
@@ -23,10 +31,10 @@ class Node(ABC):
         pass
 
 class ExpressionNode(Node):
-    pass
+    __slots__ = ()
 
 class StatementNode(Node):
-    pass
+    __slots__ = ()
 
 class NodeVisitor(Protocol):
     def visit_literal_integer(self, node: LiteralIntegerNode) -> None:
@@ -0,0 +1,2 @@
+from .constant_folding import ConstantFolder
+from .manager import Pass, PassManager, PassRecord, unit_size
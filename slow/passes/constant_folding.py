@@ -0,0 +1,163 @@
+from typing import Optional
+
+from slow.node import Node, ExpressionNode, StatementNode
+from slow.symbols import SymbolTable
+from slow.traversal import TraversalVisitor
+from slow.ast.assign import AssignNode
+from slow.ast.binary import BinaryNode, BinaryOperator
+from slow.ast.literal import LiteralIntegerNode
+from slow.ast.identifier import IdentifierNode
+from slow.ast.let import LetAssignmentNode, LetDeclarationNode
+from slow.ast.program import ProgramNode
+
+
+class ConstantFolder(TraversalVisitor):
+    """Folds literals and constant identifiers and simplifies algebraic identities (x*1, x+0, x*0, x-x).
+
+    Identifiers declared without a value (`let x;`) are treated as unknown.
+    """
+    name = "constant-folding"
+    def __init__(self, symbols: Optional[SymbolTable] = None) -> None:
+        self.symbols = symbols if symbols is not None else SymbolTable(by_name=True)
+        # NOTE: Constant bound to every identifier (if any), indexed by symbol id
+        self.constants: list[Optional[LiteralIntegerNode]] = []
+        self.folded_count = 0
+        self._result_stack: list[Node] = []
+
+    def fold(self, node: Node) -> Node:
+        self.constants = []
+        self.folded_count = 0
+        self._result_stack = []
+
+        self.walk(node)
+        return self._result_stack.pop()
+
+    def run(self, node: Node) -> Node:
+        return self.fold(node)
+
+    @property
+    def changed_count(self) -> int:
+        return self.folded_count
+
+    def _pop_expression(self) -> ExpressionNode:
+        expression = self._result_stack.pop()
+        assert isinstance(expression, ExpressionNode)
+        return expression
+
+    def _symbol(self, identifier: IdentifierNode) -> int:
+        symbol = self.symbols.resolve(identifier)
+        if symbol >= len(self.constants):
+            self.constants.extend([None] * (symbol + 1 - len(self.constants)))
+        return symbol
+
+    def _bind(self, identifier: IdentifierNode, expression: ExpressionNode) -> None:
+        self.constants[self._symbol(identifier)] = expression if isinstance(expression, LiteralIntegerNode) else None
+
+    def leave_literal_integer(self, node: LiteralIntegerNode) -> None:
+        self._result_stack.append(node)
+
+    def leave_identifier(self, node: IdentifierNode) -> None:
+        constant = self.constants[self._symbol(node)]
+        if constant is None:
+            self._result_stack.append(node)
+            return
+
+        self.folded_count += 1
+        self._result_stack.append(constant)
+
+    def leave_binary(self, node: BinaryNode) -> None:
+        rhs = self._pop_expression()
+        lhs = self._pop_expression()
+
+        folded = _simplify(lhs, rhs, node.op)
+        if folded is None:
+            self._result_stack.append(node if lhs is node.lhs and rhs is node.rhs else BinaryNode(lhs, rhs, node.op))
+            return
+
+        self.folded_count += 1
+        self._result_stack.append(folded)
+
+    def leave_let_declaration(self, node: LetDeclarationNode) -> None:
+        self.constants[self._symbol(node.identifier)] = None
+        self._result_stack.append(node)
+
+    def leave_let_assignment(self, node: LetAssignmentNode) -> None:
+        expression = self._pop_expression()
+
+        self._bind(node.identifier, expression)
+        self._result_stack.append(LetAssignmentNode(node.identifier, expression))
+
+    def leave_assign(self, node: AssignNode) -> None:
+        expression = self._pop_expression()
+
+        self._bind(node.identifier, expression)
+        self._result_stack.append(AssignNode(node.identifier, expression))
+
+    def leave_program(self, node: ProgramNode) -> None:
+        # NOTE: The folded statements are the top of the stack, in order
+        start = len(self._result_stack) - len(node.statements)
+        statements: list[StatementNode] = []
+        for folded in self._result_stack[start:]:
+            assert isinstance(folded, StatementNode)
+            statements.append(folded)
+
+        del self._result_stack[start:]
+        self._result_stack.append(ProgramNode(statements))
+
+
+def _is_literal(node: Node, value: int) -> bool:
+    return isinstance(node, LiteralIntegerNode) and node.value == value
+
+def _line(node: Node) -> int:
+    pending = [node]
+    while pending:
+        current = pending.pop()
+        if isinstance(current, LiteralIntegerNode):
+            return current.line
+        if isinstance(current, BinaryNode):
+            pending += (current.rhs, current.lhs)
+    return 0
+
+def _may_trap(node: Node) -> bool:
+    """Whether evaluating `node` at runtime may raise (division by a non constant or by zero)."""
+    pending = [node]
+    while pending:
+        current = pending.pop()
+        if not isinstance(current, BinaryNode):
+            continue
+        if current.op == BinaryOperator.DIV and not (isinstance(current.rhs, LiteralIntegerNode) and current.rhs.value != 0):
+            return True
+        pending += (current.rhs, current.lhs)
+    return False
+
+def _simplify(lhs: ExpressionNode, rhs: ExpressionNode, op: BinaryOperator) -> Optional[ExpressionNode]:
+    if isinstance(lhs, LiteralIntegerNode) and isinstance(rhs, LiteralIntegerNode):
+        if op == BinaryOperator.DIV and rhs.value == 0:
+            return None # NOTE: Leave the error to runtime
+        return LiteralIntegerNode(op.apply(lhs.value, rhs.value), lhs.line)
+
+    match op:
+        case BinaryOperator.ADD:
+            if _is_literal(lhs, 0):
+                return rhs
+            if _is_literal(rhs, 0):
+                return lhs
+        case BinaryOperator.SUB:
+            if _is_literal(rhs, 0):
+                return lhs
+            if lhs == rhs and not _may_trap(lhs):
+                return LiteralIntegerNode(0, _line(lhs))
+        case BinaryOperator.MUL:
+            if _is_literal(lhs, 1):
+                return rhs
+            if _is_literal(rhs, 1):
+                return lhs
+            if _is_literal(lhs, 0) and not _may_trap(rhs):
+                return lhs
+            if _is_literal(rhs, 0) and not _may_trap(lhs):
+                return rhs
+        case BinaryOperator.DIV:
+            if _is_literal(rhs, 1):
+                return lhs
+
+    return None
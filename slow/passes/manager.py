@@ -0,0 +1,128 @@
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any, Protocol, Union
+
+from slow.node import Node
+from slow.ir.program import IRProgram
+from slow.traversal import count_nodes
+
+
+# NOTE: What flows between passes, trees until a pass lowers them to IR
+Unit = Union[Node, IRProgram]
+
+
+class Pass(Protocol):
+    """An AST or IR transform (or a lowering from one to the other)."""
+    name: str
+
+    def run(self, unit: Any) -> Any:
+        pass
+
+    @property
+    def changed_count(self) -> int:
+        """Nodes or instructions changed by the last run."""
+        pass
+
+
+def unit_size(unit: Unit) -> int:
+    return len(unit) if isinstance(unit, IRProgram) else count_nodes(unit)
+
+
+@dataclass(slots=True)
+class PassRecord:
+    name: str
+    enabled: bool = True
+    seconds: float = 0.0
+    allocated_bytes: int = 0 # NOTE: Peak traced memory during the pass, on top of what was allocated before
+    size_before: int = 0
+    size_after: int = 0
+    changed: int = 0
+
+
+@dataclass
+class PassManager:
+    """Runs an ordered list of passes, recording time, memory and changes of each one."""
+    passes: list[Pass] = field(default_factory=list)
+    trace_memory: bool = True
+    records: list[PassRecord] = field(default_factory=list)
+    _disabled: set[str] = field(default_factory=set, repr=False)
+
+    def add(self, new_pass: Pass, enabled: bool = True) -> "PassManager":
+        self.passes.append(new_pass)
+        if not enabled:
+            self._disabled.add(new_pass.name)
+        return self
+
+    def enable(self, name: str) -> None:
+        self._pass_named(name)
+        self._disabled.discard(name)
+
+    def disable(self, name: str) -> None:
+        self._pass_named(name)
+        self._disabled.add(name)
+
+    def is_enabled(self, name: str) -> bool:
+        return name not in self._disabled
+
+    def _pass_named(self, name: str) -> Pass:
+        for candidate in self.passes:
+            if candidate.name == name:
+                return candidate
+        raise KeyError(f"No pass named '{name}'")
+
+    def run(self, unit: Unit) -> Unit:
+        self.records = []
+        started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+
+        try:
+            for current in self.passes:
+                record = PassRecord(current.name, self.is_enabled(current.name))
+                self.records.append(record)
+                if not record.enabled:
+                    continue
+
+                record.size_before = unit_size(unit)
+                unit = self._run_pass(current, unit, record)
+                record.size_after = unit_size(unit)
+                record.changed = current.changed_count
+        finally:
+            if started_tracing:
+                tracemalloc.stop()
+
+        return unit
+
+    def _run_pass(self, current: Pass, unit: Unit, record: PassRecord) -> Unit:
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+
+        start = time.perf_counter()
+        result: Unit = current.run(unit)
+        record.seconds = time.perf_counter() - start
+
+        if self.trace_memory:
+            record.allocated_bytes = tracemalloc.get_traced_memory()[1] - before
+        return result
+
+    def report(self) -> str:
+        """Per pass table in the spirit of `-ftime-report`."""
+        records = self.records
+        total = sum(record.seconds for record in records) or 1.0
+
+        lines = [
+            "===== Pass execution report =====",
+            f"  {'Pass':<24} {'Wall (ms)':>10} {'%':>6} {'Alloc (KiB)':>12} {'Before':>9} {'After':>9} {'Changed':>8}",
+        ]
+        for record in records:
+            if not record.enabled:
+                lines.append(f"  {record.name:<24} {'(disabled)':>10}")
+                continue
+            lines.append(
+                f"  {record.name:<24} {record.seconds * 1e3:>10.2f} {record.seconds / total * 100:>5.1f}% "
+                f"{record.allocated_bytes / 1024:>12.1f} {record.size_before:>9} {record.size_after:>9} {record.changed:>8}"
+            )
+        lines.append(f"  {'Total':<24} {sum(record.seconds for record in records) * 1e3:>10.2f}")
+        return "\n".join(lines)
@@ -0,0 +1,41 @@
+import random
+
+
+def generate_expression(rng: random.Random, identifiers: list[str], depth: int) -> str:
+    if depth == 0 or rng.random() < 0.2:
+        if identifiers and rng.random() < 0.5:
+            return rng.choice(identifiers)
+        return str(rng.randint(1, 100))
+
+    lhs = generate_expression(rng, identifiers, depth - 1)
+    op = rng.choice("+-*/")
+    if op in "*/":
+        # NOTE: Scaling only by (non-zero) literals keeps values from growing into
+        # huge integers across statements and keeps every division well defined.
+        return f"({lhs} {op} {rng.randint(1, 9)})"
+
+    rhs = generate_expression(rng, identifiers, depth - 1)
+    if rng.random() < 0.3:
+        return f"({lhs} {op} {rhs})"
+    return f"{lhs} {op} {rhs}"
+
+
+def generate_program(statements: int, variables: int = 16, depth: int = 4, seed: int = 0, inputs: int = 0) -> str:
+    """Generates a random, well formed program that only ever reads declared identifiers.
+
+    `inputs` identifiers `x0, x1, ...` are declared first without a value (`let x0;`).
+    """
+    rng = random.Random(seed)
+    declared = [f"x{index}" for index in range(inputs)]
+    lines = [f"let {name};" for name in declared]
+
+    for _ in range(statements):
+        if len(declared) - inputs < variables and (len(declared) == inputs or rng.random() < 0.3):
+            name = f"v{len(declared) - inputs}"
+            lines.append(f"let {name} = {generate_expression(rng, declared, depth)};")
+            declared.append(name)
+        else:
+            name = rng.choice(declared)
+            lines.append(f"{name} = {generate_expression(rng, declared, depth)};")
+
+    return "\n".join(lines)
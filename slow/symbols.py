@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+
+if TYPE_CHECKING:
+    from slow.ast.identifier import IdentifierNode
+
+
+NO_SYMBOL = -1
+
+
+@dataclass(slots=True)
+class SymbolTable:
+    """Assigns every distinct identifier name a dense integer id, in order of first appearance.
+
+    With `by_name` the ids carried by nodes are ignored and every identifier is resolved by its
+    name: for tables that did not assign those ids, such as a visitor's own default table.
+    """
+    names: list[str] = field(default_factory=list)
+    by_name: bool = False
+    _ids: dict[str, int] = field(init=False, default_factory=dict, repr=False)
+
+    def __post_init__(self) -> None:
+        self._ids = {name: symbol for symbol, name in enumerate(self.names)}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def intern(self, name: str) -> int:
+        symbol = self._ids.get(name)
+        if symbol is None:
+            symbol = self._ids[name] = len(self.names)
+            self.names.append(name)
+        return symbol
+
+    def name(self, symbol: int) -> str:
+        return self.names[symbol]
+
+    def resolve(self, identifier: IdentifierNode) -> int:
+        """Symbol of an identifier, interning its name for nodes that were not built by the parser."""
+        if identifier.symbol != NO_SYMBOL and not self.by_name:
+            return identifier.symbol
+        return self.intern(identifier.name)
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from typing import Any, Callable, ClassVar, Optional
+
+from slow.node import Node, NodeVisitor
+from slow.ast.assign import AssignNode
+from slow.ast.binary import BinaryNode
+from slow.ast.literal import LiteralIntegerNode
+from slow.ast.identifier import IdentifierNode
+from slow.ast.let import LetAssignmentNode, LetDeclarationNode
+from slow.ast.program import ProgramNode
+
+
+Callback = Callable[[Any, Any], Optional[bool]]
+Dispatch = tuple[Optional[Callback], Optional[Callback]]
+
+
+class TraversalVisitor(NodeVisitor):
+    """Walks trees with an explicit work stack instead of `accept` recursion.
+
+    Subclasses define `enter_<name>(node)` (pre order) and/or `leave_<name>(node)` (post order)
+    for the nodes they care about, where `<name>` is the node class' `visit_name`. Nodes without
+    callbacks are still walked. Returning False from `enter_*` skips the node's children.
+    The `visit_*` methods are entry points that walk the given tree.
+    """
+    # NOTE: (enter, leave) functions of every node type seen so far, one table per visitor class
+    _dispatch_table: ClassVar[dict[type[Node], Dispatch]] = {}
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._dispatch_table = {}
+
+    @classmethod
+    def _dispatch(cls, node_type: type[Node]) -> Dispatch:
+        name = node_type.visit_name
+        entry = (getattr(cls, f"enter_{name}", None), getattr(cls, f"leave_{name}", None))
+        cls._dispatch_table[node_type] = entry
+        return entry
+
+    def walk(self, node: Node) -> None:
+        table = self._dispatch_table
+        dispatch = self._dispatch
+        # NOTE: A node is pushed a second time (as `leaving`) only when it has a leave callback
+        pending: list[tuple[Node, bool]] = [(node, False)]
+        push = pending.append
+        pop = pending.pop
+
+        while pending:
+            current, leaving = pop()
+            node_type = type(current)
+            entry = table.get(node_type) or dispatch(node_type)
+            enter, leave = entry
+
+            if leaving:
+                assert leave is not None
+                leave(self, current)
+                continue
+
+            if enter is not None and enter(self, current) is False:
+                children: tuple[Node, ...] = ()
+            else:
+                children = current.children()
+
+            if not children:
+                if leave is not None:
+                    leave(self, current)
+                continue
+
+            if leave is not None:
+                push((current, True))
+            for child in reversed(children):
+                push((child, False))
+
+    def visit_literal_integer(self, node: LiteralIntegerNode) -> None:
+        self.walk(node)
+
+    def visit_binary(self, node: BinaryNode) -> None:
+        self.walk(node)
+
+    def visit_identifier(self, node: IdentifierNode) -> None:
+        self.walk(node)
+
+    def visit_let_declaration(self, node: LetDeclarationNode) -> None:
+        self.walk(node)
+
+    def visit_let_assignment(self, node: LetAssignmentNode) -> None:
+        self.walk(node)
+
+    def visit_assign(self, node: AssignNode) -> None:
+        self.walk(node)
+
+    def visit_program(self, node: ProgramNode) -> None:
+        self.walk(node)
+
+
+def count_nodes(node: Node) -> int:
+    """Number of nodes reachable through `children()`, including `node`."""
+    count = 0
+    pending = [node]
+    while pending:
+        count += 1
+        pending.extend(pending.pop().children())
+    return count
@@ -0,0 +1,52 @@
+from slow.frontend.parser import Parser
+from slow.ast.binary import BinaryNode
+from slow.ast.literal import LiteralIntegerNode
+from slow.backend.interpreter import AstInterpreter
+from slow.ast.factory import HashConsingNodeFactory
+from slow.ast.let import LetAssignmentNode
+from slow.ast.program import ProgramNode
+
+
+SOURCE = "let x = 1; let y = (x + 2) * (x + 2); let z = (x + 2) * (x + 2) - y;"
+
+def test_equal_subtrees_are_shared() -> None:
+    factory = HashConsingNodeFactory()
+    program = Parser(True, node_factory=factory).parse(SOURCE)
+
+    assert isinstance(program, ProgramNode)
+    y, z = program.statements[1], program.statements[2]
+    assert isinstance(y, LetAssignmentNode) and isinstance(z, LetAssignmentNode)
+    assert isinstance(z.expression, BinaryNode)
+    assert z.expression.lhs is y.expression
+    assert len(factory) == 8
+
+
+def test_same_tree_as_plain_factory() -> None:
+    assert Parser(True, node_factory=HashConsingNodeFactory()).parse(SOURCE) == Parser(True).parse(SOURCE)
+
+
+def test_parser_builds_through_factory() -> None:
+    source = "let x = 1;\nlet y = (x + 1) * (x + 1);\nlet z = (x + 1) * 1;"
+    factory = HashConsingNodeFactory()
+    program = Parser(True, node_factory=factory).parse(source)
+    plain = Parser(True).parse(source)
+
+    assert isinstance(program, ProgramNode) and isinstance(plain, ProgramNode)
+    assert program == plain
+    assert AstInterpreter().run(program) == AstInterpreter().run(plain) == {"x": 1, "y": 4, "z": 2}
+    # NOTE: Literals are only shared within a line, each one keeps the line it was parsed on
+    assert sorted(factory.literals) == [(1, 1), (1, 2), (1, 3)]
+    y, z = program.statements[1], program.statements[2]
+    assert isinstance(y, LetAssignmentNode) and isinstance(y.expression, BinaryNode)
+    assert isinstance(z, LetAssignmentNode) and isinstance(z.expression, BinaryNode)
+    assert y.expression.lhs is y.expression.rhs
+    assert isinstance(z.expression.rhs, LiteralIntegerNode) and z.expression.rhs.line == 3
+
+
+def test_hash_is_cached() -> None:
+    factory = HashConsingNodeFactory()
+    node = Parser(True, True, node_factory=factory).parse("(1 + 2) * (1 + 2)")
+
+    assert isinstance(node, BinaryNode)
+    assert node._hash is not None # pylint: disable=protected-access
+    assert hash(node) == hash(Parser(True, True).parse("(1 + 2) * (1 + 2)"))
@@ -0,0 +1,78 @@
+import pytest
+
+from slow.frontend.parser import Parser
+from slow.node import Node
+from slow.ast.binary import BinaryNode, BinaryOperator
+from slow.ast.flat import FlatAst, FlatBinaryView, FlatIdentifierView, FlatNodeKind, FlatProgramView
+from slow.ast.identifier import IdentifierNode
+from slow.ast.program import ProgramNode
+from slow.backend.interpreter import AstInterpreter
+from slow.backend.ir_visitor import IRVisitor
+
+
+SOURCE = "let x = 1; let y = x * (2 + x); x = y / 3 - 99999999999999999999; let z;"
+
+def parse(source: str, expression_mode: bool = False) -> Node:
+    node = Parser(True, expression_mode).parse(source)
+    assert node is not None
+    return node
+
+
+def test_columns() -> None:
+    ast = FlatAst.from_node(parse("(1 + 2) * 3", True))
+
+    assert list(ast.kinds) == [FlatNodeKind.LITERAL_INTEGER, FlatNodeKind.LITERAL_INTEGER, FlatNodeKind.BINARY, FlatNodeKind.LITERAL_INTEGER, FlatNodeKind.BINARY]
+    assert list(ast.lhs) == [-1, -1, 0, -1, 2]
+    assert list(ast.rhs) == [-1, -1, 1, -1, 3]
+    assert ast.root == 4
+
+    root = ast.root_view()
+    assert isinstance(root, FlatBinaryView)
+    assert root.op == BinaryOperator.MUL
+    assert str(root) == "((1 + 2) * 3)"
+
+
+def test_program_round_trip() -> None:
+    program = parse(SOURCE)
+    view = FlatAst.from_node(program).program()
+
+    assert isinstance(view, FlatProgramView)
+    assert str(view) == str(program)
+
+
+def test_visitors(capsys: pytest.CaptureFixture[str]) -> None:
+    program = parse("let x = 1; let y = x * (2 + x); let z = y / 3 - (2 + x);")
+    view = FlatAst.from_node(program).program()
+
+    program.accept(IRVisitor())
+    expected = capsys.readouterr().out
+    view.accept(IRVisitor())
+    assert capsys.readouterr().out == expected
+
+    assert AstInterpreter().run(view) == AstInterpreter().run(program) # type: ignore[arg-type]
+
+
+def test_identifier_view_equality() -> None:
+    ast = FlatAst.from_node(parse("let x = 1; let y = x + x;"))
+    lhs, rhs = ast.view(4), ast.view(5)
+
+    assert isinstance(lhs, FlatIdentifierView)
+    assert lhs == rhs and hash(lhs) == hash(rhs)
+    assert lhs == IdentifierNode("x")
+
+
+def test_shared_subtrees_are_stored_once() -> None:
+    shared = parse("1 + 2", True)
+    ast = FlatAst.from_node(BinaryNode(shared, shared, BinaryOperator.MUL))
+
+    assert len(ast) == 4
+    assert str(ast.root_view()) == "((1 + 2) * (1 + 2))"
+
+
+def test_to_node_round_trip() -> None:
+    program = parse("let a = 99999999999999999999; let b; b = a / (2 - a) * 3;")
+    node = FlatAst.from_node(program).to_node()
+
+    assert node == program
+    assert isinstance(node, ProgramNode)
+    assert [identifier.symbol for identifier in (node.statements[0].identifier, node.statements[2].identifier)] == [0, 1] # type: ignore[attr-defined]
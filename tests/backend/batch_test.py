@@ -0,0 +1,74 @@
+import random
+
+import pytest
+
+from slow.frontend.parser import Parser
+from slow.ast.program import ProgramNode
+from slow.backend import batch
+from slow.backend.batch import BatchEvaluator
+from slow.backend.interpreter import AstInterpreter
+
+
+SOURCE = "let x; let y; let a = 7; let b = x * 3 - (a + 2) / 4; let c; a = b / (y + 100) + c; c = a * (b - (x + b) * 2) / (0 - 3);"
+
+use_numpy = pytest.mark.parametrize("use_numpy", [
+    False,
+    pytest.param(True, marks=pytest.mark.skipif(batch.numpy is None, reason="NumPy is not installed")),
+])
+
+
+def parse(source: str) -> ProgramNode:
+    program = Parser().parse(source)
+    assert isinstance(program, ProgramNode)
+    return program
+
+
+def literal(value: int) -> str:
+    return str(value) if value >= 0 else f"0 - {-value}"
+
+
+@use_numpy
+def test_matches_interpreter_per_row(use_numpy: bool) -> None:
+    generator = random.Random(0)
+    xs = [generator.randint(-1000, 1000) for _ in range(200)]
+    ys = [generator.randint(-50, 50) for _ in range(200)]
+    results = BatchEvaluator(use_numpy).run(parse(SOURCE), {"x": xs, "y": ys})
+
+    for row, (x, y) in enumerate(zip(xs, ys)):
+        source = SOURCE.replace("let x;", f"let x = {literal(x)};").replace("let y;", f"let y = {literal(y)};")
+        expected = AstInterpreter().run(parse(source))
+        assert {name: int(column[row]) for name, column in results.items()} == expected
+
+
+@use_numpy
+def test_constants_are_broadcast(use_numpy: bool) -> None:
+    results = BatchEvaluator(use_numpy).run(parse("let x; let a = 0 - 7 / 2; let b = a * x;"), {"x": [1, 2, 3]})
+    assert [list(column) for column in results.values()] == [[1, 2, 3], [-3, -3, -3], [-3, -6, -9]]
+
+
+@use_numpy
+def test_division_by_zero(use_numpy: bool) -> None:
+    with pytest.raises(ZeroDivisionError):
+        BatchEvaluator(use_numpy).run(parse("let x; let a = 10 / x;"), {"x": [1, 0, 3]})
+
+
+def test_constant_overflow_matches_columns() -> None:
+    source = "let x; let a = 9223372036854775807 + 1; let b = a + x;"
+    with pytest.raises(OverflowError):
+        BatchEvaluator(use_numpy=False).run(parse(source), {"x": [1]})
+    with pytest.raises(OverflowError):
+        BatchEvaluator(use_numpy=False).run(parse("let x; let b = x + 1;"), {"x": [9223372036854775807]})
+
+
+@pytest.mark.skipif(batch.numpy is None, reason="NumPy is not installed")
+def test_constant_overflow_wraps_with_numpy() -> None:
+    results = BatchEvaluator(use_numpy=True).run(parse("let x; let a = 9223372036854775807 + 1; let b = x + 1;"), {"x": [9223372036854775807]})
+    assert int(results["a"][0]) == int(results["b"][0]) == -9223372036854775808
+
+
+def test_invalid_inputs() -> None:
+    evaluator = BatchEvaluator(use_numpy=False)
+    with pytest.raises(ValueError, match="different lengths"):
+        evaluator.run(parse("let x; let y;"), {"x": [1, 2], "y": [1]})
+    with pytest.raises(ValueError, match="not declared"):
+        evaluator.run(parse("let x = 1;"), {"x": [1, 2]})
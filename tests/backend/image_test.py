@@ -0,0 +1,69 @@
+import struct
+from pathlib import Path
+
+import pytest
+
+from slow.frontend.parser import Parser
+from slow.ast.program import ProgramNode
+from slow._exceptions import ImageError
+from slow.backend.bytecode import Bytecode, BytecodeCompiler
+from slow.backend.image import CompiledImage, SectionKind, image_bytes, write_image
+from slow.backend.vm import VirtualMachine
+from slow.programs import generate_program
+
+
+def compile_source(source: str) -> Bytecode:
+    parser = Parser()
+    program = parser.parse(source)
+    assert isinstance(program, ProgramNode)
+    return BytecodeCompiler(parser.symbols).compile(program)
+
+
+@pytest.mark.parametrize("source", [
+    "let a = 7; let b = a * 3 - (a + 2) / 4; let c; a = b / 2 + c;",
+    "let x;",
+    generate_program(500),
+])
+def test_round_trip(tmp_path: Path, source: str) -> None:
+    bytecode = compile_source(source)
+    write_image(bytecode, tmp_path / "program.slwi")
+
+    with CompiledImage.open(tmp_path / "program.slwi") as image:
+        assert image.run() == VirtualMachine().run(bytecode)
+        assert str(image.bytecode()) == str(bytecode)
+        assert image.slots == bytecode.slots
+
+
+def test_sections_are_views_into_the_image() -> None:
+    data = image_bytes(compile_source("let a = 40; a = a + 2;"))
+    image = CompiledImage(data)
+
+    assert image.code.tolist() == [0, 0, 2, 0, 1, 0, 0, 1, 3, 2, 0]
+    assert image.constants.tolist() == [40, 2]
+    assert bytes(image.section(SectionKind.SYMBOLS)) == b"a"
+    assert image.code.obj is data
+
+
+def test_invalid_images(tmp_path: Path) -> None:
+    data = image_bytes(compile_source("let a = 1;"))
+
+    with pytest.raises(ImageError, match="magic"):
+        CompiledImage(b"ELF!" + data[4:])
+    with pytest.raises(ImageError, match="version"):
+        CompiledImage(data[:4] + struct.pack("<H", 99) + data[6:])
+    with pytest.raises(ImageError, match="past the end"):
+        CompiledImage(data[:-1])
+    kind, _, offset, length = struct.unpack_from("<IIQQ", data, 16)
+    assert kind == SectionKind.CODE
+    with pytest.raises(ImageError, match="aligned 64 bit words"):
+        CompiledImage(data[:16] + struct.pack("<IIQQ", kind, 0, offset, length - 1) + data[40:])
+    with pytest.raises(ImageError, match="aligned 64 bit words"):
+        CompiledImage(data[:16] + struct.pack("<IIQQ", kind, 0, offset + 1, length - 8) + data[40:])
+    with pytest.raises(ImageError, match="Duplicate CODE"):
+        CompiledImage(data[:40] + struct.pack("<I", SectionKind.CODE) + data[44:])
+    with pytest.raises(ImageError, match="64 bits"):
+        image_bytes(compile_source("let a = 99999999999999999999;"))
+
+    (tmp_path / "empty.slwi").write_bytes(b"")
+    with pytest.raises(ImageError):
+        CompiledImage.open(tmp_path / "empty.slwi")
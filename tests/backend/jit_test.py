@@ -0,0 +1,74 @@
+import ctypes
+from pathlib import Path
+
+import pytest
+
+from slow.frontend.parser import Parser
+from slow.ast.program import ProgramNode
+from slow.backend.interpreter import AstInterpreter
+from slow.backend.jit import JitCompiler
+from slow.programs import generate_program
+
+
+def compile_source(source: str) -> tuple[JitCompiler, ProgramNode]:
+    parser = Parser(iterative=True)
+    program = parser.parse(source)
+    assert isinstance(program, ProgramNode)
+    return JitCompiler(parser.symbols), program
+
+
+def wrap(value: int) -> int:
+    return (value + 2 ** 63) % 2 ** 64 - 2 ** 63
+
+
+@pytest.mark.parametrize("source", [
+    "let a = 7; let b = a * 3 - (a + 2) / 4; let c; a = b / 2 + c; c = a * (b - (a + b) * 2);",
+    "let a = 0 - 9 / 2; let b = 9 / (0 - 2); let c = a / b / (1 - (a - b));",
+    "let a = 5000000000; let b = a * 3 + 6000000000; let c = 1 - (a - (b - 7000000000));",
+    "let a = 0 - 9223372036854775807 - 1; let b = a / (0 - 1); let c = a * a;",
+    generate_program(1000, seed=0),
+])
+def test_matches_interpreter(source: str) -> None:
+    compiler, program = compile_source(source)
+    expected = {name: wrap(value) for name, value in AstInterpreter().run(program).items()}
+    assert compiler.compile(program).run() == expected
+
+
+def test_caller_buffer() -> None:
+    compiler, program = compile_source("let a = 2; let b = a * a; a = b - 1;")
+    function = compiler.compile(program)
+    results = function.buffer()
+    function.execute(results)
+    function.execute(results)
+
+    assert function.slots == ["a", "b"]
+    assert list(results) == [3, 4]
+    with pytest.raises(ValueError):
+        function.execute((ctypes.c_int64 * 1)())
+
+
+def test_division_by_zero() -> None:
+    compiler, program = compile_source("let a = 1; let b = a - 1; let c = (a + 2) / b;")
+    with pytest.raises(ZeroDivisionError):
+        compiler.compile(program).run()
+
+
+def test_deep_expression() -> None:
+    compiler, program = compile_source("let a = 1; let b = " + "a - (" * 5000 + "a" + ")" * 5000 + ";")
+    assert compiler.compile(program).run() == {"a": 1, "b": 1}
+
+
+@pytest.mark.skipif(not Path("/proc/self/maps").exists(), reason="needs /proc/self/maps")
+def test_code_is_never_writable_and_executable() -> None:
+    compiler, program = compile_source("let a = 2;")
+    function = compiler.compile(program)
+    address = ctypes.addressof(function._buffer) # pylint: disable=protected-access
+
+    for line in Path("/proc/self/maps").read_text().splitlines():
+        start, end = (int(bound, 16) for bound in line.split()[0].split("-"))
+        if start <= address < end:
+            assert line.split()[1].startswith("r-x")
+            break
+    else:
+        pytest.fail("The code is not mapped")
+    assert function.run() == {"a": 2}
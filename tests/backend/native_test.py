@@ -0,0 +1,59 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from slow.frontend.parser import Parser
+from slow.ast.program import ProgramNode
+from slow.backend.interpreter import AstInterpreter
+from slow.backend.native import NativeBuilder
+from slow._exceptions import NativeBuildError
+from slow.programs import generate_program
+
+
+requires_binutils = pytest.mark.skipif(shutil.which("as") is None or shutil.which("ld") is None, reason="GNU as and ld are required")
+
+
+def parse(source: str) -> tuple[Parser, ProgramNode]:
+    parser = Parser()
+    program = parser.parse(source)
+    assert isinstance(program, ProgramNode)
+    return parser, program
+
+
+@requires_binutils
+@pytest.mark.parametrize("source", [
+    "let a = 7; let b = a * 3 - (a + 2) / 4; let c; a = b / 2 + c; c = a * (b - (a + b) * 2);",
+    "let a = 0 - 9 / 2; let b = 0 - 9223372036854775807 - 1; let c = 0;",
+    generate_program(500, seed=2),
+])
+def test_executable_prints_final_values(tmp_path: Path, source: str) -> None:
+    parser, program = parse(source)
+    native = NativeBuilder(parser.symbols, repeat=3).build(program, tmp_path / "program")
+
+    assert (tmp_path / "program.s").exists()
+    assert native.run() == AstInterpreter().run(program)
+
+
+def test_assembly_has_an_entry_point() -> None:
+    parser, program = parse("let first = 1; let second = first + 1;")
+    builder = NativeBuilder(parser.symbols)
+    lines = builder.assembly(program)
+
+    assert builder.slots == ["first", "second"]
+    assert "_start:" in lines
+    assert 'slow_name_1: .ascii "second = "' in lines
+
+
+def test_missing_tool(tmp_path: Path) -> None:
+    parser, program = parse("let a = 1;")
+    with pytest.raises(NativeBuildError, match="not found"):
+        NativeBuilder(parser.symbols, assembler="slow-missing-as").build(program, tmp_path / "program")
+
+
+@requires_binutils
+def test_assembler_error(tmp_path: Path) -> None:
+    parser, program = parse("let a = 1;")
+    builder = NativeBuilder(parser.symbols, assembler="ld")
+    with pytest.raises(NativeBuildError, match="failed"):
+        builder.build(program, tmp_path / "program")
@@ -0,0 +1,62 @@
+import pytest
+
+from slow.frontend.parser import Parser
+from slow.backend.asm import Instruction, AsmLine
+from slow.backend.ast_asm_visitor import AstAsmVisitor
+from slow.backend.peephole import PeepholeOptimizer
+from slow.backend.sink import BufferSink
+
+
+def listing(*lines: str) -> list[AsmLine]:
+    return [Instruction.parse(line) for line in lines]
+
+
+def optimize(optimizer: PeepholeOptimizer, *lines: str) -> list[str]:
+    return [str(instruction) for instruction in optimizer.optimize(listing(*lines))]
+
+
+def test_parse_and_format() -> None:
+    instruction = Instruction.parse("mov QWORD PTR [rbp-8], -3")
+
+    assert instruction == Instruction("mov", ("QWORD PTR [rbp-8]", -3))
+    assert str(instruction) == "mov QWORD PTR [rbp-8], -3"
+
+
+@pytest.mark.parametrize("lines, expected", [
+    (["push rax", "pop rax"], []),
+    (["push 3", "pop rdi", "push rdi"], ["mov rdi, 3", "push rdi"]),
+    (["push 1", "mov rdi, 2", "pop rax", "push rdi"], ["mov rdi, 2", "mov rax, 1", "push rdi"]),
+    (["push rax", "mov rax, 2", "pop rdi"], ["push rax", "mov rax, 2", "pop rdi"]),
+    (["mov rdi, 3", "add rax, rdi"], ["add rax, 3"]),
+    (["mov rdi, 3", "imul rax, rdi"], ["imul rax, rax, 3"]),
+    (["mov rdi, 3", "div rax, rdi"], ["mov rdi, 3", "div rax, rdi"]),
+    (["mov rcx, rsi", "mov rcx, rsi", "add rax, rcx", "push rcx"], ["mov rcx, rsi", "add rax, rcx", "push rcx"]),
+    (["mov rcx, rsi", "mov rcx, 4", "push rcx"], ["mov rcx, 4", "push rcx"]),
+    (["mov rsi, rsi"], []),
+])
+def test_rules(lines: list[str], expected: list[str]) -> None:
+    assert optimize(PeepholeOptimizer(live_out=frozenset(("rsp", "rax"))), *lines) == expected
+
+
+def test_registers_live_at_return() -> None:
+    optimizer = PeepholeOptimizer()
+
+    assert optimize(optimizer, "mov rcx, 1", "mov rax, 2", "mov rbx, 3", "ret") == ["mov rax, 2", "mov rbx, 3", "ret"]
+    assert optimizer.removed["dead-move"] == 1
+
+    # NOTE: Statistics describe the last listing only
+    optimize(optimizer, "mov rcx, 1", "ret")
+    assert optimizer.removed["dead-move"] == 1 and optimizer.applied["dead-move"] == 1
+
+
+def test_stack_machine(capsys: pytest.CaptureFixture[str]) -> None:
+    optimizer = PeepholeOptimizer(live_out=frozenset(("rsp",)))
+    sink = BufferSink()
+    node = Parser(expression_mode=True).parse("(1 + 2) * 3")
+    assert node is not None
+    node.accept(AstAsmVisitor(sink, optimizer))
+
+    assert sink.getvalue() == "mov rax, 1\nadd rax, 2\nmul rax, 3\npush rax\n"
+    assert optimizer.removed["push-pop"] == 5 and optimizer.removed["fold-operand"] == 2
+    assert optimizer.passes == 3
+    assert optimizer.report().splitlines()[1].split() == ["push-pop", "4", "applied", "5", "removed"]
@@ -0,0 +1,83 @@
+import ast
+
+import pytest
+
+from slow.frontend.parser import Parser
+from slow.ast.program import ProgramNode
+from slow.backend.interpreter import AstInterpreter
+from slow._exceptions import ParserError
+from slow.backend.pycode import CodeCache, ExpressionEvaluator, PythonCompiler
+from slow.programs import generate_program
+
+
+def parse(source: str) -> tuple[Parser, ProgramNode]:
+    parser = Parser(iterative=True)
+    program = parser.parse(source)
+    assert isinstance(program, ProgramNode)
+    return parser, program
+
+
+@pytest.mark.parametrize("source", [
+    "let a = 7; let b = a * 3 - (a + 2) / 4; let c; a = b / 2 + c; c = a * (b - (a + b) * 2);",
+    "let a = 0 - 9 / 2; let b = 9 / (0 - 2); let c = a / b / (1 - (a - b));",
+    "let if = 1; let None = if + 1; let print = None * 2;",
+    generate_program(1000, seed=1),
+])
+def test_matches_interpreter(source: str) -> None:
+    parser, program = parse(source)
+    assert PythonCompiler(parser.symbols).compile(program).run() == AstInterpreter().run(program)
+
+
+def test_module() -> None:
+    parser, program = parse("let a = 7; let b = a * 3 - (a + 2) / 4; let c; a = c;")
+    assert ast.unparse(PythonCompiler(parser.symbols).module(program)).splitlines() == [
+        "def slow_program():",
+        "    v_a = 7",
+        "    v_b = v_a * 3 - truncating_div(v_a + 2, 4)",
+        "    v_c = 0",
+        "    v_a = v_c",
+        "    return {'a': v_a, 'b': v_b, 'c': v_c}",
+    ]
+
+
+def test_deep_expressions_are_split() -> None:
+    parser, program = parse("let a = 1; let b = " + "a - (" * 3000 + "a" + ")" * 3000 + ";")
+    compiler = PythonCompiler(parser.symbols)
+
+    assert compiler.compile(program).run() == {"a": 1, "b": 1}
+    assert compiler.temporary_count > 0
+
+
+def test_division_by_zero() -> None:
+    parser, program = parse("let a = 0; let b = 1 / a;")
+    with pytest.raises(ZeroDivisionError):
+        PythonCompiler(parser.symbols).compile(program).run()
+
+
+def test_cache() -> None:
+    cache = CodeCache(max_size=2)
+    first = cache.get("let a = 1;")
+    assert cache.get("let a = 1;") is first
+    assert cache.run("let b = 2;") == {"b": 2}
+
+    cache.get("let a = 1;")
+    cache.get("let c = 3;")
+    assert "let a = 1;" in cache and "let b = 2;" not in cache
+    assert (cache.hits, cache.misses, cache.evictions, len(cache)) == (2, 3, 1, 2)
+
+
+def test_expression_evaluator() -> None:
+    evaluator = ExpressionEvaluator(max_size=2)
+    assert evaluator.evaluate("1 + 2 * 3") == 7
+    assert evaluator.evaluate_many(["1 + 2 * 3", "0 - 7 / 2", "true + true", "1 + 2 * 3"]) == [7, -3, 2, 7]
+
+    assert "1 + 2 * 3" in evaluator and "0 - 7 / 2" not in evaluator
+    assert (evaluator.hits, evaluator.misses, evaluator.evictions, len(evaluator)) == (1, 4, 2, 2)
+
+
+def test_expression_evaluator_errors() -> None:
+    evaluator = ExpressionEvaluator()
+    with pytest.raises(ZeroDivisionError):
+        evaluator.evaluate("1 / (2 - 2)")
+    with pytest.raises(ParserError):
+        evaluator.evaluate("1 + x")
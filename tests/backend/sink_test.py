@@ -0,0 +1,65 @@
+from pathlib import Path
+
+import pytest
+
+from slow.frontend.parser import Parser
+from slow.node import Node
+from slow.backend.ast_asm_visitor import AstAsmVisitor
+from slow.backend.ir_visitor import IRVisitor
+from slow.backend.sink import BufferSink, CallbackSink, FileSink, StdoutSink
+
+
+SOURCE = "let a = 1; let b = a + 2 * a; a = b - (a + 2 * a);"
+EXPECTED_IR = "a1 = 1\nt0 = 2 * a1\nt1 = a1 + t0\nb1 = t1\nt2 = b1 - t1\na2 = t2\n"
+
+
+def parse(source: str, expression_mode: bool = False) -> Node:
+    node = Parser(expression_mode=expression_mode).parse(source)
+    assert node is not None
+    return node
+
+
+def test_buffer_sink() -> None:
+    sink = BufferSink()
+    parse(SOURCE).accept(IRVisitor(sink=sink))
+
+    assert sink.getvalue() == EXPECTED_IR
+
+
+def test_stdout_sink_writes_on_flush(capsys: pytest.CaptureFixture[str]) -> None:
+    sink = StdoutSink()
+    sink.write("push 1")
+    assert capsys.readouterr().out == ""
+
+    sink.flush()
+    assert capsys.readouterr().out == "push 1\n"
+
+
+def test_default_sink_is_stdout(capsys: pytest.CaptureFixture[str]) -> None:
+    parse(SOURCE).accept(IRVisitor())
+
+    assert capsys.readouterr().out == EXPECTED_IR
+
+
+def test_file_sink(tmp_path: Path) -> None:
+    path = tmp_path / "out.s"
+    with FileSink(path, chunk_lines=3) as sink:
+        parse("1 + 2", True).accept(AstAsmVisitor(sink))
+
+    assert path.read_text() == "push 1\npush 2\npop rdi\npop rax\nadd rax, rdi\npush rax\n"
+
+
+def test_callback_sink() -> None:
+    lines: list[str] = []
+    parse(SOURCE).accept(IRVisitor(sink=CallbackSink(lines.append)))
+
+    assert lines == EXPECTED_IR.splitlines()
+
+
+def test_stdout_sink_writes_chunks(capsys: pytest.CaptureFixture[str]) -> None:
+    sink = StdoutSink(chunk_lines=2)
+    for line in ("a", "b", "c"):
+        sink.write(line)
+
+    assert capsys.readouterr().out == "a\nb\n"
+    assert sink.lines == ["c"]
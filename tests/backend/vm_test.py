@@ -0,0 +1,66 @@
+import pytest
+
+from slow.frontend.parser import Parser
+from slow.ast.program import ProgramNode
+from slow.ast.identifier import IdentifierNode
+from slow.ast.let import LetAssignmentNode
+from slow.ast.literal import LiteralIntegerNode
+from slow.backend.bytecode import BytecodeCompiler, Opcode
+from slow.backend.interpreter import AstInterpreter
+from slow.backend.vm import VirtualMachine
+
+
+def compile_source(source: str) -> ProgramNode:
+    program = Parser(True).parse(source)
+    assert isinstance(program, ProgramNode)
+    return program
+
+
+@pytest.mark.parametrize("source, expected", [
+    ("let x = 1 + 2;", {"x": 3}),
+    ("let x;", {"x": 0}),
+    ("let x = 2 * (3 + 4); let y = x / 3;", {"x": 14, "y": 4}),
+    ("let x = 0 - 7; let y = x / 2;", {"x": -7, "y": -3}),
+    ("let x = 1; x = x + 41;", {"x": 42}),
+    ("let a = true; let b = false; let c = a + b;", {"a": 1, "b": 0, "c": 1}),
+])
+def test_run(source: str, expected: dict[str, int]) -> None:
+    program = compile_source(source)
+
+    assert VirtualMachine().run(BytecodeCompiler().compile(program)) == expected
+    assert AstInterpreter().run(program) == expected
+
+
+def test_constant_pool_and_slots() -> None:
+    bytecode = BytecodeCompiler().compile(compile_source("let x = 5; let y = x + 5;"))
+
+    assert bytecode.constants == [5]
+    assert bytecode.slots == ["x", "y"]
+    assert list(bytecode.code) == [
+        Opcode.CONST, 0, Opcode.STORE, 0,
+        Opcode.LOAD, 0, Opcode.CONST, 0, Opcode.ADD, Opcode.STORE, 1,
+    ]
+
+
+def test_parsed_and_hand_built_nodes() -> None:
+    program = compile_source("let x = 1; let y = x + 1;")
+    # NOTE: Without the parser's table, ids must not collide with the ones interned for hand-built nodes
+    program.statements.insert(0, LetAssignmentNode(IdentifierNode("z"), LiteralIntegerNode(7, 1)))
+
+    assert VirtualMachine().run(BytecodeCompiler().compile(program)) == {"z": 7, "x": 1, "y": 2}
+
+
+def test_division_by_zero() -> None:
+    bytecode = BytecodeCompiler().compile(compile_source("let x = 1 / 0;"))
+
+    with pytest.raises(ZeroDivisionError):
+        VirtualMachine().run(bytecode)
+
+
+def test_deep_tree() -> None:
+    depth = 5_000
+    program = Parser(True, iterative=True).parse("let x = " + "(" * depth + "1" + " + 1)" * depth + ";")
+    assert isinstance(program, ProgramNode)
+
+    assert VirtualMachine().run(BytecodeCompiler().compile(program)) == {"x": depth + 1}
+    assert AstInterpreter().run(program) == {"x": depth + 1}
@@ -0,0 +1,87 @@
+import ctypes
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from slow.frontend.parser import Parser
+from slow.ast.program import ProgramNode
+from slow.backend.interpreter import AstInterpreter
+from slow.backend.peephole import PeepholeOptimizer
+from slow.backend.register_allocation import LinearScanAllocator, LiveInterval
+from slow.backend.x86_64 import X86Codegen
+from slow.programs import generate_program
+
+
+SOURCE = "let a = 7; let b = a * 3 - (a + 2) / 4; let c; a = b / 2 + c; c = a * (b - (a + b) * 2); let d = 0 - 9 / 2;"
+
+requires_binutils = pytest.mark.skipif(shutil.which("as") is None or shutil.which("ld") is None, reason="GNU as and ld are required")
+
+
+def run_native(tmp_path: Path, source: str, registers: list[str] | None = None, optimizer: PeepholeOptimizer | None = None) -> tuple[dict[str, int], dict[str, int], list[str]]:
+    parser = Parser()
+    program = parser.parse(source)
+    assert isinstance(program, ProgramNode)
+
+    codegen = X86Codegen(parser.symbols, registers=registers, optimizer=optimizer)
+    lines = codegen.generate(program)
+    (tmp_path / "program.s").write_text("\n".join(lines) + "\n")
+    subprocess.run(["as", "-o", tmp_path / "program.o", tmp_path / "program.s"], check=True)
+    subprocess.run(["ld", "-shared", "-o", tmp_path / "program.so", tmp_path / "program.o"], check=True)
+
+    results = (ctypes.c_int64 * len(codegen.slots))()
+    ctypes.CDLL(str(tmp_path / "program.so")).slow_program(results)
+    return dict(zip(codegen.slots, results)), AstInterpreter().run(program), lines
+
+
+def test_linear_scan_spills_the_interval_ending_last() -> None:
+    intervals = [LiveInterval(0, 0, 9), LiveInterval(1, 1, 3), LiveInterval(2, 2, 4), LiveInterval(3, 3, -1), LiveInterval(4, 4, 5)]
+    allocator = LinearScanAllocator(["r1", "r2", "r3"], reserved=1)
+    allocator.allocate(intervals)
+
+    assert [interval.register for interval in intervals] == [None, "r2", "r1", None, "r1"]
+    assert intervals[0].slot == 0 and intervals[3].slot == -1
+    assert allocator.spill_count == 1
+
+
+def test_immediates_and_registers() -> None:
+    parser = Parser()
+    program = parser.parse("let a = 1; let b = a + 2; b = b * 3;")
+    assert isinstance(program, ProgramNode)
+
+    lines = X86Codegen(parser.symbols).generate(program)
+
+    assert "    add rsi, 2" in lines and "    imul rdi, rdi, 3" in lines
+    assert not any("push" in line and "rbp" not in line for line in lines)
+
+
+@requires_binutils
+@pytest.mark.parametrize("registers", [None, ["rcx", "rsi", "rdi"], ["rcx", "rbx"]])
+def test_matches_interpreter(tmp_path: Path, registers: list[str] | None) -> None:
+    native, expected, _ = run_native(tmp_path, SOURCE, registers)
+
+    assert native == expected
+
+
+@requires_binutils
+@pytest.mark.parametrize("optimize", [False, True])
+def test_generated_program(tmp_path: Path, optimize: bool) -> None:
+    optimizer = PeepholeOptimizer() if optimize else None
+    native, expected, lines = run_native(tmp_path, generate_program(500, seed=2), optimizer=optimizer)
+
+    assert native == expected
+    assert "    .globl slow_program" in lines
+    assert optimizer is None or sum(optimizer.removed.values()) > 0
+
+
+@requires_binutils
+def test_spills_under_pressure(tmp_path: Path) -> None:
+    names = [f"v{index}" for index in range(12)]
+    source = " ".join(f"let {name} = {index + 1};" for index, name in enumerate(names))
+    source += " let total = " + " + ".join(f"({name} * {name})" for name in names) + ";"
+
+    native, expected, lines = run_native(tmp_path, source, ["rcx", "rsi", "rdi", "r8"])
+
+    assert native == expected
+    assert any("QWORD PTR [rbp-16]" in line for line in lines)
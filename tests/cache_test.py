@@ -0,0 +1,81 @@
+import os
+from pathlib import Path
+
+from slow.cache import CacheStats, CompileCache, compiler_version
+from slow.backend.interpreter import AstInterpreter
+from slow.ir.evaluate import evaluate
+from slow.ir.printer import format_program
+from slow.programs import generate_program
+
+
+SOURCE = generate_program(50)
+
+
+def test_warm_cache_skips_the_front_end(tmp_path: Path) -> None:
+    cold = CompileCache(tmp_path)
+    program, symbols = cold.parse(SOURCE)
+    ir, asm = cold.ir(SOURCE), cold.asm(SOURCE)
+    assert (cold.stats.hits, cold.stats.misses, cold.stats.stores) == (2, 3, 3)
+
+    warm = CompileCache(tmp_path)
+    warm_program, warm_symbols = warm.parse(SOURCE)
+    assert warm_program == program and warm_symbols.names == symbols.names
+    assert format_program(warm.ir(SOURCE)) == format_program(ir)
+    assert warm.asm(SOURCE) == asm
+    assert (warm.stats.hits, warm.stats.misses, warm.stats.hit_rate) == (3, 0, 1.0)
+
+    assert AstInterpreter().run(warm_program) == evaluate(warm.ir(SOURCE))
+
+
+def test_version_and_artifact_are_part_of_the_key(tmp_path: Path) -> None:
+    cache = CompileCache(tmp_path, version="1")
+    cache.store(SOURCE, "asm", b"first")
+
+    assert CompileCache(tmp_path, version="2").load(SOURCE, "asm") is None
+    assert cache.load(SOURCE, "ir") is None
+    assert cache.load(SOURCE, "asm") == b"first"
+
+
+def test_default_version_is_a_digest_of_the_sources(tmp_path: Path) -> None:
+    version = CompileCache(tmp_path).version
+
+    assert version == compiler_version() and len(version) == 64
+
+
+def test_corrupt_entries_are_misses(tmp_path: Path) -> None:
+    cache = CompileCache(tmp_path)
+    cache.ir(SOURCE)
+    path = tmp_path / cache.key(SOURCE, "ir")[:2] / cache.key(SOURCE, "ir")
+    path.write_bytes(path.read_bytes()[:20])
+
+    cache.stats = CacheStats()
+    assert format_program(cache.ir(SOURCE)) == format_program(CompileCache(tmp_path / "other").ir(SOURCE))
+    # NOTE: The truncated IR is a miss, the parse below it still hits
+    assert (cache.stats.hits, cache.stats.misses, cache.stats.stores) == (1, 1, 1)
+    assert cache.load(SOURCE, "ir") is not None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path: Path) -> None:
+    cache = CompileCache(tmp_path, max_bytes=250)
+    for index in range(3):
+        cache.store(f"source {index}", "asm", bytes(100))
+        # NOTE: mtime resolution of some file systems is coarse, order the entries explicitly
+        path = tmp_path / cache.key(f"source {index}", "asm")[:2] / cache.key(f"source {index}", "asm")
+        os.utime(path, ns=(index * 10 ** 9, index * 10 ** 9))
+
+    assert cache.stats.evictions == 1
+    assert cache.load("source 0", "asm") is None
+    assert cache.load("source 2", "asm") is not None
+    assert cache.size() == 200
+
+
+def test_writes_leave_no_temporary_files(tmp_path: Path) -> None:
+    cache = CompileCache(tmp_path)
+    cache.store(SOURCE, "asm", b"listing")
+    cache.store(SOURCE, "asm", b"listing, again")
+
+    assert [path.name.startswith(".") for path in tmp_path.rglob("*") if path.is_file()] == [False]
+    assert cache.load(SOURCE, "asm") == b"listing, again"
+
+    cache.clear()
+    assert cache.size() == 0
@@ -0,0 +1,46 @@
+import pytest
+
+from slow.frontend.lexer import Lexer
+from slow.frontend.fast_lexer import FastLexer
+from slow.frontend.lexeme import Token, TokenKind
+from slow.programs import generate_program
+
+
+def lex_all(lexer: Lexer | FastLexer) -> list[Token]:
+    tokens = [lexer.next()]
+    while tokens[-1].kind != TokenKind.EOF:
+        tokens.append(lexer.next())
+    return tokens
+
+
+@pytest.mark.parametrize("source", [
+    "",
+    "     ",
+    "// This is a comment",
+    "+-*/()1true false _m12m12_12",
+    "let x = 12; // comment\nlet _y2 = (x + 30) * true - false;\n\nx = x / 2 ;\n",
+    "1 / 2 // 3\n/ 4",
+    "1 + º\n2\t\r\n3 $",
+    "letter lets let1 truex false_",
+    "123abc",
+    "/",
+    generate_program(200, seed=7),
+])
+def test_matches_lexer(source: str) -> None:
+    fast, expected = lex_all(FastLexer(source)), lex_all(Lexer(source))
+
+    assert fast == expected
+    # NOTE: Symbols take no part in token equality
+    assert [token.symbol for token in fast] == [token.symbol for token in expected]
+
+
+def test_eof_repeats() -> None:
+    lexer = FastLexer("1")
+
+    assert lexer.next().kind == TokenKind.INTEGER
+    for _ in range(10):
+        assert lexer.next() == Token(TokenKind.EOF, None, 1, slice(1, 1))
+
+
+def test_tokenize() -> None:
+    assert list(FastLexer("let x;").tokenize()) == lex_all(Lexer("let x;"))
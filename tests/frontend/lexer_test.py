@@ -66,3 +66,17 @@ def test_multiple(text: str, tokens: list[Token]) -> None:
 
     for token in tokens:
         assert lexer.next() == token
+
+def test_div_span_excludes_whitespace() -> None:
+    lexer = Lexer("1 / 2")
+
+    assert lexer.next() == Token(TokenKind.INTEGER, 1, 1, slice(0, 1))
+    assert lexer.next() == Token(TokenKind.DIV, None, 1, slice(2, 3))
+    assert lexer.next() == Token(TokenKind.INTEGER, 2, 1, slice(4, 5))
+
+
+def test_symbols() -> None:
+    lexer = Lexer("x y x _z y")
+
+    assert [lexer.next().symbol for _ in range(6)] == [0, 1, 0, 2, 1, -1]
+    assert lexer.symbols.names == ["x", "y", "_z"]
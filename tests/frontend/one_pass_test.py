@@ -0,0 +1,63 @@
+import pytest
+
+from slow._exceptions import LexerError, ParserError
+from slow.frontend.parser import Parser
+from slow.frontend.one_pass import OnePassCompiler
+from slow.backend.ir_visitor import IRVisitor
+from slow.ir.printer import format_program
+
+
+SOURCES = [
+    "let a = 1; let b = a + 2 * a; a = b - (a + 2 * a); let c = 2;",
+    "let a = true; let b; a = = a / (a - 4) * false - 4 - 4; let c = a * a; c = c + c;",
+    "let x = 1; x = x + 1; let y = x * x; x = x * x;",
+]
+
+
+@pytest.mark.parametrize("source", SOURCES)
+def test_matches_parser_and_ir_visitor(source: str) -> None:
+    parser = Parser(test_mode=True)
+    node = parser.parse(source)
+    assert node is not None
+    expected = IRVisitor(parser.symbols).build(node)
+
+    program = OnePassCompiler(test_mode=True).compile(source)
+
+    assert program == expected
+    assert format_program(program) == format_program(expected)
+
+
+@pytest.mark.parametrize("source, error", [
+    ("let a = 1; a = b;", ParserError("Undefined identifier 'b'")),
+    ("let a = 1; let a = 2;", ParserError("Identifier 'a' already declared")),
+    ("let a = (1 + 2;", ParserError("Expected ')' after expression. Got ';'")),
+    ("let a = 1 a = 2;", ParserError("Expected ';' after statement. Got 'a'")),
+    ("let = 1;", ParserError("Expected identifier. Got '='")),
+    ("let a = 1 + ;", ParserError("Expected expression. Got ';'")),
+    ("let a = 1 º;", LexerError("Unexpected character: º")),
+])
+def test_errors_match_parser(source: str, error: Exception) -> None:
+    with pytest.raises(type(error)) as expected:
+        Parser(test_mode=True).parse(source)
+    with pytest.raises(type(error)) as actual:
+        OnePassCompiler(test_mode=True).compile(source)
+
+    assert str(actual.value) == str(expected.value) == str(error)
+
+
+def test_error_returns_none(capsys: pytest.CaptureFixture[str]) -> None:
+    compiler = OnePassCompiler()
+
+    assert compiler.compile("let a = 1; a = b; a = c;") is None
+    assert capsys.readouterr().out == "Parser error: Undefined identifier 'b'\n"
+    assert compiler.compile("let a = 1;") is not None
+
+
+def test_deep_expression() -> None:
+    depth = 5_000
+    source = "let a = 1; let b = " + "(" * depth + "a" + " - 1)" * depth + " + " + "a * " * depth + "1;"
+    parser = Parser(test_mode=True, iterative=True)
+    node = parser.parse(source)
+    assert node is not None
+
+    assert OnePassCompiler(test_mode=True).compile(source) == IRVisitor(parser.symbols).build(node)
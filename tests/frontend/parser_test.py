@@ -1,10 +1,16 @@
 import pytest
 
+from slow.frontend.lexer import Lexer
 from slow.frontend.parser import Parser
+from slow.frontend.token_buffer import TokenBuffer
+from slow.symbols import SymbolTable
 
 from slow.node import Node
 from slow.ast.literal import LiteralIntegerNode
 from slow.ast.binary import BinaryNode, BinaryOperator
+from slow.ast.identifier import IdentifierNode
+from slow.ast.let import LetAssignmentNode
+from slow.ast.program import ProgramNode
 from slow._exceptions import ParserError, LexerError
 
 
@@ -103,4 +109,78 @@ class TestParserExpression:
     def test_binary_expression(self, expression: str, expected: Node) -> None:
         assert expected == Parser(True, True).parse(expression)
 
-# TODO: Add statement tests
\ No newline at end of file
+# TODO: Add statement tests
+
+class TestParserSymbols:
+    def test_identifiers_carry_symbols(self) -> None:
+        parser = Parser(True)
+        program = parser.parse("let y = 1; let x = y; x = x + y;")
+
+        assert isinstance(program, ProgramNode)
+        assert parser.symbols.names == ["y", "x"]
+        assert str(program) == "let y = 1;\nlet x = y;\nlet x = (x + y);"
+        statement = program.statements[2]
+        assert isinstance(statement, LetAssignmentNode) and isinstance(statement.expression, BinaryNode)
+        assert statement.identifier.symbol == 1
+        assert isinstance(statement.expression.rhs, IdentifierNode) and statement.expression.rhs.symbol == 0
+
+    def test_buffer_symbols_are_remapped(self) -> None:
+        symbols = SymbolTable(["unrelated"])
+        buffer = TokenBuffer.from_source("let a = 1;")
+
+        program = Parser(True, symbols=symbols).parse_buffer(buffer)
+
+        assert isinstance(program, ProgramNode)
+        statement = program.statements[0]
+        assert isinstance(statement, LetAssignmentNode)
+        assert statement.identifier.symbol == 1
+        assert buffer.symbols.names == ["a"]
+
+
+class TestParserStatements:
+    def test_statements_are_yielded_as_parsed(self) -> None:
+        parser = Parser(True)
+        lexer = Lexer("let a = 1; a = a + 2; a = )", symbols=parser.symbols)
+        statements = parser.parse_statements(lexer)
+
+        assert str(next(statements)) == "let a = 1;"
+        assert str(next(statements)) == "let a = (a + 2);"
+        with pytest.raises(ParserError):
+            next(statements)
+
+    def test_stops_at_error(self) -> None:
+        parser = Parser()
+
+        statements = list(parser.parse_statements(Lexer("let a = 1; a = b; let c = 2;", symbols=parser.symbols)))
+
+        assert [str(statement) for statement in statements] == ["let a = 1;"]
+
+
+class TestParserIterative:
+    @pytest.mark.parametrize("source", [
+        "let a = 1; let b = (a + 2) * 3 - a / (4 - 1); b = a - b - (a + (b * 2)); let c = = a + b;",
+        "let a = ((((1)))); a = a * (a + a) / 7 - 1 - 2;",
+    ])
+    def test_same_tree_as_recursive(self, source: str) -> None:
+        assert Parser(True).parse(source) == Parser(True, iterative=True).parse(source)
+
+    @pytest.mark.parametrize("expression, expected_error_message", [
+        ("1 +", "Expected expression. Got ''"),
+        ("1 + (2 + 3", "Expected ')' after expression. Got ''"),
+        ("x + 1", "Undefined identifier 'x'"),
+    ])
+    def test_errors(self, expression: str, expected_error_message: str) -> None:
+        with pytest.raises(ParserError) as excinfo:
+            Parser(True, True, iterative=True).parse(expression)
+
+        assert expected_error_message == str(excinfo.value)
+
+    def test_deep_expression(self) -> None:
+        depth = 50_000
+        expression = "(" * depth + "1" + " + 1)" * depth + " + " + "1 - " * depth + "1"
+
+        node = Parser(True, True, iterative=True).parse(expression)
+
+        assert isinstance(node, BinaryNode)
+        assert node == Parser(True, True, iterative=True).parse(expression)
+        assert str(node).count("(") == 2 * depth + 1
@@ -0,0 +1,21 @@
+import pytest
+
+from slow.frontend.fast_lexer import FastLexer
+from slow.frontend.stream import stream_tokens
+from slow.frontend.token_buffer import TokenBuffer
+from slow.programs import generate_program
+
+
+@pytest.mark.parametrize("source", [
+    generate_program(300, seed=3),
+    generate_program(50, inputs=2, seed=11) + "\nlet º = 1; $ // trailing\n",
+])
+def test_lexers_agree(source: str) -> None:
+    fast = [(token.kind, token.value, token.line, token.span.start, token.span.stop) for token in FastLexer(source).tokenize()]
+    buffer = TokenBuffer.from_source(source)
+    buffered = [(buffer.kind(index), buffer.value(index), buffer.lines[index], buffer.starts[index], buffer.ends[index]) for index in range(len(buffer))]
+    # NOTE: Streamed spans are byte offsets, equal to character offsets for ASCII sources only
+    streamed = [(token.kind, token.value, token.line) for token in stream_tokens(source.encode())]
+
+    assert fast == buffered
+    assert [token[:3] for token in fast] == streamed
@@ -0,0 +1,90 @@
+from mmap import mmap
+from pathlib import Path
+
+import pytest
+
+from slow._exceptions import ParserError
+from slow.ast.program import ProgramNode
+from slow.frontend.lexer import Lexer
+from slow.frontend.lexeme import Token, TokenKind
+from slow.frontend.parser import Parser
+from slow.frontend.stream import BufferToken, StreamSource, stream_tokens, stream_file
+
+
+SOURCE = """
+let x = 12; // The answer is coming
+let _y2 = (x + 30) * true - false;
+x = x/ 2 ;
+"""
+
+def lex_all(source: str) -> list[Token]:
+    lexer = Lexer(source)
+    tokens = [lexer.next()]
+    while tokens[-1].kind != TokenKind.EOF:
+        tokens.append(lexer.next())
+    return tokens
+
+
+@pytest.mark.parametrize("buffer", [
+    SOURCE.encode(),
+    bytearray(SOURCE.encode()),
+    memoryview(SOURCE.encode()),
+])
+def test_matches_lexer(buffer: bytes) -> None:
+    expected = [(token.kind, token.value, token.line) for token in lex_all(SOURCE)]
+
+    assert [(token.kind, token.value, token.line) for token in stream_tokens(buffer)] == expected
+
+
+def test_lazy() -> None:
+    tokens = stream_tokens(b"let x = 1;")
+
+    assert next(tokens) == BufferToken(TokenKind.LET, 1, 0, 3, b"")
+    assert next(tokens).to_token() == Token(TokenKind.ID, "x", 1, slice(4, 5))
+
+
+def test_error() -> None:
+    tokens = list(stream_tokens("1 º".encode()))
+
+    assert tokens[1].kind == TokenKind.ERROR
+    assert tokens[1].value == "Unexpected character: º"
+    assert tokens[2].kind == TokenKind.EOF
+
+
+def test_empty() -> None:
+    assert list(stream_tokens(b"")) == [BufferToken(TokenKind.EOF, 1, 0, 0, b"")]
+
+
+def test_file(tmp_path: Path) -> None:
+    path = tmp_path / "program.slow"
+    path.write_text(SOURCE)
+
+    tokens = list(stream_file(path))
+
+    assert isinstance(tokens[0].buffer, mmap)
+    assert [token.value for token in tokens if token.kind == TokenKind.ID] == ["x", "_y2", "x", "x", "x"]
+    assert tokens[-1].kind == TokenKind.EOF and tokens[-1].line == 5
+
+
+def test_empty_file(tmp_path: Path) -> None:
+    path = tmp_path / "empty.slow"
+    path.write_text("")
+
+    assert [token.kind for token in stream_file(path)] == [TokenKind.EOF]
+
+
+def test_parse_file(tmp_path: Path) -> None:
+    path = tmp_path / "program.slow"
+    path.write_text(SOURCE)
+    parser = Parser(test_mode=True)
+
+    statements = list(parser.parse_statements(StreamSource(stream_file(path), parser.symbols)))
+
+    assert ProgramNode(statements) == Parser(test_mode=True).parse(SOURCE)
+
+
+def test_parse_error_lexeme() -> None:
+    parser = Parser(test_mode=True)
+
+    with pytest.raises(ParserError, match="Expected ';' after statement. Got 'x'"):
+        list(parser.parse_statements(StreamSource(stream_tokens(b"let x = 1 x;"), parser.symbols)))
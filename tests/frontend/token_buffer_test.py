@@ -0,0 +1,52 @@
+import pytest
+
+from slow.frontend.lexer import Lexer
+from slow.frontend.lexeme import Token, TokenKind
+from slow.frontend.parser import Parser
+from slow.frontend.token_buffer import TokenBuffer
+
+
+SOURCE = "let x = 12; // comment\nlet y = (x + 30) * true - x;\nx = x / 2 º;\n"
+
+def lex_all(source: str) -> list[Token]:
+    lexer = Lexer(source)
+    tokens = [lexer.next()]
+    while tokens[-1].kind != TokenKind.EOF:
+        tokens.append(lexer.next())
+    return tokens
+
+
+def test_from_source_matches_lexer() -> None:
+    buffer = TokenBuffer.from_source(SOURCE)
+
+    assert [buffer.token(index) for index in range(len(buffer))] == lex_all(SOURCE)
+    assert buffer == TokenBuffer.from_tokens(SOURCE, lex_all(SOURCE))
+
+
+def test_values_are_interned() -> None:
+    buffer = TokenBuffer.from_source("let x = x + x * 12 + 12;")
+
+    assert buffer.value_table == [12]
+    assert buffer.symbols.names == ["x"]
+    assert list(buffer.values) == [-1, 0, -1, 0, -1, 0, -1, 0, -1, 0, -1, -1]
+
+
+def test_cursor_stays_on_eof() -> None:
+    cursor = TokenBuffer.from_source("1").cursor()
+
+    assert cursor.next().kind == TokenKind.INTEGER
+    for _ in range(10):
+        assert cursor.next() == Token(TokenKind.EOF, None, 1, slice(1, 1))
+
+
+@pytest.mark.parametrize("source, expression_mode", [
+    ("1 + 2 * (3 - 4)", True),
+    ("let x = 1; let y = x * (2 + x); x = y / 3;", False),
+])
+def test_parse_buffer(source: str, expression_mode: bool) -> None:
+    buffer = TokenBuffer.from_source(source)
+    expected = Parser(expression_mode=expression_mode).parse(source)
+
+    # NOTE: The same buffer can be parsed several times
+    for _ in range(3):
+        assert Parser(expression_mode=expression_mode).parse_buffer(buffer) == expected
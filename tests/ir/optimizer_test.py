@@ -0,0 +1,79 @@
+import pytest
+
+from slow.frontend.parser import Parser
+from slow.backend.interpreter import AstInterpreter
+from slow.backend.ir_visitor import IRVisitor
+from slow.ir.evaluate import evaluate
+from slow.ir.optimizer import CopyPropagation, DeadCodeElimination, IROptimizer, ValueNumbering
+from slow.ir.printer import format_program
+from slow.ir.program import IRProgram
+from slow.ast.program import ProgramNode
+from slow.programs import generate_program
+
+
+def build(source: str) -> IRProgram:
+    parser = Parser()
+    node = parser.parse(source)
+    assert node is not None
+    return IRVisitor(parser.symbols).build(node)
+
+
+def test_value_numbering_is_commutative() -> None:
+    ir = ValueNumbering().run(build("let a = 1; let b = a + 2; let c = 2 + a; let d = a - 2; let e = 2 - a;"))
+
+    assert format_program(ir) == "a1 = 1\nt0 = a1 + 2\nb1 = t0\nc1 = t0\nt2 = a1 - 2\nd1 = t2\nt3 = 2 - a1\ne1 = t3"
+
+
+def test_copy_propagation() -> None:
+    ir = CopyPropagation().run(build("let a = 1; let b = a + a; a = b; let c = a * b;"))
+
+    assert format_program(ir) == "a1 = 1\nt0 = 1 + 1\nb1 = t0\na2 = t0\nt1 = t0 * t0\nc1 = t1"
+
+
+def test_dead_code_elimination_keeps_last_definitions() -> None:
+    dce = DeadCodeElimination()
+    ir = dce.run(build("let a = 1; let b = a + 3; a = 2; b = a * 4;"))
+
+    assert format_program(ir) == "a2 = 2\nt1 = a2 * 4\nb2 = t1"
+    assert dce.removed_count == 3
+
+
+def test_dead_code_elimination_keeps_trapping_divisions() -> None:
+    source = "let a = 0; let b = 1 / a; let c = a / 2; b = 5; c = 6;"
+    program = Parser(True).parse(source)
+    assert isinstance(program, ProgramNode)
+    with pytest.raises(ZeroDivisionError):
+        AstInterpreter().run(program)
+
+    ir = DeadCodeElimination().run(build(source))
+
+    assert format_program(ir) == "a1 = 0\nt0 = 1 / a1\nb2 = 5\nc2 = 6"
+    with pytest.raises(ZeroDivisionError):
+        evaluate(IROptimizer().optimize(build(source)))
+
+
+def test_pipeline_stats() -> None:
+    optimizer = IROptimizer()
+    ir = optimizer.optimize(build("let a = 1; let b = a + 2; a = b; let c = 2 + a; let d = b + 2; d = c;"))
+
+    assert format_program(ir) == "t0 = 1 + 2\nb1 = t0\na2 = t0\nt1 = 2 + t0\nc1 = t1\nd2 = t1"
+    assert [(stat.name, stat.instructions_before, stat.instructions_after) for stat in optimizer.stats] == [
+        ("copy-propagation", 9, 9),
+        ("value-numbering", 9, 8),
+        ("dead-code-elimination", 8, 6),
+    ]
+    assert optimizer.report().splitlines()[0].split() == ["copy-propagation", "9", "->", "9"]
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_pipeline_preserves_results(seed: int) -> None:
+    parser = Parser()
+    program = parser.parse(generate_program(300, seed=seed))
+    assert isinstance(program, ProgramNode)
+
+    ir = IRVisitor(parser.symbols).build(program)
+    optimized = IROptimizer().optimize(ir)
+    expected = AstInterpreter().run(program)
+
+    assert len(optimized) < len(ir)
+    assert evaluate(ir) == evaluate(optimized) == {name: expected[name] for name in evaluate(ir)}
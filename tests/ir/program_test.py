@@ -0,0 +1,70 @@
+from slow.frontend.lexer import Lexer
+from slow.frontend.parser import Parser
+from slow.backend.ir_visitor import IRVisitor
+from slow.backend.sink import BufferSink
+from slow.ir.program import IROpcode, IRProgram, IRValueKind, NO_VALUE
+from slow.ir.printer import format_instructions, format_program
+
+
+SOURCE = "let a = 1; let b = a + 2 * a; a = b - (a + 2 * a); let c = 2;"
+
+
+def build(source: str) -> IRProgram:
+    parser = Parser()
+    node = parser.parse(source)
+    assert node is not None
+    return IRVisitor(parser.symbols).build(node)
+
+
+def test_instructions_reference_value_numbers() -> None:
+    ir = build(SOURCE)
+
+    assert list(ir.opcodes) == [IROpcode.COPY, IROpcode.MUL, IROpcode.ADD, IROpcode.COPY, IROpcode.SUB, IROpcode.COPY, IROpcode.COPY]
+    assert ir.constants == [1, 2]
+    assert ir.rhs[0] == NO_VALUE
+    # NOTE: `2` is numbered once, `a + 2 * a` is reused
+    assert ir.lhs[1] == ir.lhs[6] and ir.value_kinds[ir.lhs[1]] == IRValueKind.CONSTANT
+    assert ir.rhs[4] == ir.targets[2]
+    assert ir.temporary_count == 3
+
+
+def test_printer_reproduces_text() -> None:
+    assert format_program(build(SOURCE)) == "\n".join([
+        "a1 = 1",
+        "t0 = 2 * a1",
+        "t1 = a1 + t0",
+        "b1 = t1",
+        "t2 = b1 - t1",
+        "a2 = t2",
+        "c1 = 2",
+    ])
+
+
+def test_printer_from_instruction() -> None:
+    assert list(format_instructions(build("let a = 4 / 2;"), 1)) == ["a1 = t0"]
+
+
+def stream(source: str, max_values: int = 1 << 16) -> tuple[list[str], IRVisitor]:
+    parser = Parser(test_mode=True)
+    sink = BufferSink()
+    visitor = IRVisitor(parser.symbols, sink)
+    visitor.stream(parser.parse_statements(Lexer(source, symbols=parser.symbols)), max_values)
+    return sink.lines, visitor
+
+
+def test_stream_matches_build() -> None:
+    lines, visitor = stream(SOURCE)
+
+    assert lines == format_program(build(SOURCE)).split("\n")
+    assert len(visitor.ir) == 0
+
+
+def test_stream_compaction_bounds_values() -> None:
+    source = "let a = 1; let b = 2;" + "a = a + b * 2; b = b - a;" * 50
+
+    lines, visitor = stream(source, max_values=8)
+
+    # NOTE: No expression repeats across statements, so restarting CSE leaves the text unchanged
+    assert lines == format_program(build(source)).split("\n")
+    assert visitor.ir.value_count <= 8 + 6
+    assert lines[-1] == "b51 = t149"
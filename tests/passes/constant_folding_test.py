@@ -0,0 +1,62 @@
+import pytest
+
+from slow.frontend.parser import Parser
+from slow.node import Node
+from slow.ast.program import ProgramNode
+from slow.backend.ast_asm_visitor import AstAsmVisitor
+from slow.backend.interpreter import AstInterpreter
+from slow.backend.ir_visitor import IRVisitor
+from slow.passes.constant_folding import ConstantFolder
+
+
+def parse(source: str, expression_mode: bool = False) -> Node:
+    node = Parser(True, expression_mode).parse(source)
+    assert node is not None
+    return node
+
+
+@pytest.mark.parametrize("source, expected", [
+    ("let x = 1 + 2 * 3;", "let x = 7;"),
+    ("let x = 7; let y = x * 2; y = y - x;", "let x = 7;\nlet y = 14;\nlet y = 7;"),
+    ("let x = 0 - 7; let y = x / 2;", "let x = -7;\nlet y = -3;"),
+    ("let x = 1 / 0;", "let x = (1 / 0);"),
+    ("let x; let y = x * 1 + 0;", "let x;\nlet y = x;"),
+    ("let x; let y = (x + 1) - (x + 1);", "let x;\nlet y = 0;"),
+    ("let x; let y = x * 0;", "let x;\nlet y = 0;"),
+    ("let x; let y = (1 / x) * 0;", "let x;\nlet y = ((1 / x) * 0);"),
+    ("let x; let y = x + 2 * 3;", "let x;\nlet y = (x + 6);"),
+])
+def test_fold_program(source: str, expected: str) -> None:
+    assert str(ConstantFolder().fold(parse(source))) == expected
+
+
+def test_fold_preserves_semantics() -> None:
+    program = parse("let a = 3; let b = a * (a - 1); a = b / 4 - a; let c = a * b + 7;")
+    folded = ConstantFolder().fold(program)
+
+    assert isinstance(program, ProgramNode) and isinstance(folded, ProgramNode)
+    assert AstInterpreter().run(program) == AstInterpreter().run(folded)
+
+
+def test_fold_feeds_ir(capsys: pytest.CaptureFixture[str]) -> None:
+    ConstantFolder().fold(parse("let a = 2 + 3; let b = a * a;")).accept(IRVisitor())
+
+    assert capsys.readouterr().out == "a1 = 5\nb1 = 25\n"
+
+
+def test_fold_feeds_asm(capsys: pytest.CaptureFixture[str]) -> None:
+    ConstantFolder().fold(parse("(1 + 2) * 3", True)).accept(AstAsmVisitor())
+
+    assert capsys.readouterr().out == "push 9\n"
+
+
+def test_deep_tree() -> None:
+    depth = 5_000
+    expression = "(x / 2 - " * depth + "x" + ")" * depth
+    program = Parser(True, iterative=True).parse(f"let x; let y = {expression}; let z = {expression} * 0;")
+    assert program is not None
+
+    folded = ConstantFolder().fold(program)
+
+    assert str(folded).count("/") == depth
+    assert str(folded).endswith("let z = 0;")
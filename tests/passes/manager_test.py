@@ -0,0 +1,72 @@
+import pytest
+
+from slow.frontend.parser import Parser
+from slow.node import Node
+from slow.backend.ir_visitor import IRVisitor
+from slow.ir.optimizer import CopyPropagation, DeadCodeElimination, ValueNumbering
+from slow.ir.printer import format_program
+from slow.ir.program import IRProgram
+from slow.passes.constant_folding import ConstantFolder
+from slow.passes.manager import PassManager
+
+
+SOURCE = "let a = 2 + 3; let b = a * 2; a = b; let c = a + 1;"
+
+
+def parse(parser: Parser) -> Node:
+    node = parser.parse(SOURCE)
+    assert node is not None
+    return node
+
+
+def pipeline(parser: Parser) -> PassManager:
+    return (PassManager()
+        .add(ConstantFolder(parser.symbols))
+        .add(IRVisitor(parser.symbols))
+        .add(CopyPropagation())
+        .add(ValueNumbering())
+        .add(DeadCodeElimination()))
+
+
+def test_runs_ast_and_ir_passes() -> None:
+    parser = Parser()
+    manager = pipeline(parser)
+    result = manager.run(parse(parser))
+
+    assert isinstance(result, IRProgram)
+    assert format_program(result) == "b1 = 10\na2 = 10\nc1 = 11"
+    assert [record.name for record in manager.records] == ["constant-folding", "ir-lowering", "copy-propagation", "value-numbering", "dead-code-elimination"]
+    folding = manager.records[0]
+    assert (folding.size_before, folding.size_after, folding.changed) == (15, 9, 6)
+    assert manager.records[-1].size_before == 4 and manager.records[-1].size_after == 3
+    assert all(record.seconds > 0 and record.allocated_bytes >= 0 for record in manager.records)
+
+
+def test_disabled_passes_are_skipped() -> None:
+    parser = Parser()
+    manager = pipeline(parser)
+    manager.disable("constant-folding")
+    manager.disable("dead-code-elimination")
+
+    result = manager.run(parse(parser))
+
+    assert isinstance(result, IRProgram) and len(result) == 7
+    assert not manager.records[0].enabled and manager.records[0].seconds == 0
+    assert "(disabled)" in manager.report().splitlines()[2]
+
+    manager.enable("dead-code-elimination")
+    assert manager.is_enabled("dead-code-elimination")
+    with pytest.raises(KeyError):
+        manager.disable("inlining")
+
+
+def test_report() -> None:
+    parser = Parser()
+    manager = pipeline(parser)
+    manager.run(parse(parser))
+
+    lines = manager.report().splitlines()
+    assert lines[0] == "===== Pass execution report ====="
+    assert lines[2].split()[0] == "constant-folding"
+    assert lines[-1].split()[0] == "Total"
+    assert len(lines) == 3 + len(manager.passes)
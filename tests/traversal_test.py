@@ -0,0 +1,88 @@
+import pytest
+
+from slow.frontend.parser import Parser
+from slow.traversal import TraversalVisitor
+from slow.node import Node
+from slow.ast.flat import FlatAst
+from slow.ast.binary import BinaryNode
+from slow.ast.literal import LiteralIntegerNode
+from slow.ast.let import LetAssignmentNode
+from slow.backend.ir_visitor import IRVisitor
+from slow.backend.ast_asm_visitor import AstAsmVisitor
+
+
+class OrderRecorder(TraversalVisitor):
+    def __init__(self) -> None:
+        self.events: list[str] = []
+
+    def enter_binary(self, node: BinaryNode) -> None:
+        self.events.append(f"enter {node.op}")
+
+    def leave_binary(self, node: BinaryNode) -> None:
+        self.events.append(f"leave {node.op}")
+
+    def leave_literal_integer(self, node: LiteralIntegerNode) -> None:
+        self.events.append(f"{node.value}")
+
+
+class SkipAssignments(OrderRecorder):
+    def enter_let_assignment(self, node: LetAssignmentNode) -> bool:
+        return False
+
+
+def parse(source: str, expression_mode: bool = False) -> Node:
+    node = Parser(expression_mode=expression_mode, iterative=True).parse(source)
+    assert node is not None
+    return node
+
+
+def test_pre_and_post_order() -> None:
+    visitor = OrderRecorder()
+    visitor.walk(parse("(1 - 2) * 3", True))
+
+    assert visitor.events == ["enter *", "enter -", "1", "2", "leave -", "3", "leave *"]
+
+
+def test_enter_can_skip_children() -> None:
+    visitor = SkipAssignments()
+    visitor.walk(parse("let x = 1 + 2;"))
+
+    assert visitor.events == []
+
+
+def test_dispatch_tables_are_per_class() -> None:
+    OrderRecorder().walk(parse("let x = 1;"))
+    SkipAssignments().walk(parse("let x = 1;"))
+
+    assert OrderRecorder._dispatch_table is not SkipAssignments._dispatch_table
+    assert OrderRecorder._dispatch_table[LetAssignmentNode] == (None, None)
+    assert SkipAssignments._dispatch_table[LetAssignmentNode][0] is SkipAssignments.enter_let_assignment
+
+
+def test_deep_tree() -> None:
+    depth = 50_000
+    visitor = OrderRecorder()
+    visitor.walk(parse("1 + " * depth + "1", True))
+
+    assert len(visitor.events) == 3 * depth + 1
+
+
+def test_flat_views() -> None:
+    node = parse("(1 - 2) * 3", True)
+    tree, flat = OrderRecorder(), OrderRecorder()
+    tree.walk(node)
+    flat.walk(FlatAst.from_node(node).root_view())
+
+    assert tree.events == flat.events
+
+
+def test_ir_assignment_reads_previous_version(capsys: pytest.CaptureFixture[str]) -> None:
+    parse("let x = 1; x = x + 1; x = x * 2;").accept(IRVisitor())
+
+    assert capsys.readouterr().out == "x1 = 1\nt0 = x1 + 1\nx2 = t0\nt1 = x2 * 2\nx3 = t1\n"
+
+
+def test_asm(capsys: pytest.CaptureFixture[str]) -> None:
+    parse("1 - (2 + 3)", True).accept(AstAsmVisitor())
+
+    assert capsys.readouterr().out == "push 1\npush 2\npush 3\npop rdi\npop rax\nadd rax, rdi\npush rax\npop rdi\npop rax\nsub rax, rdi\npush rax\n"